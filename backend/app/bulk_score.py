@@ -0,0 +1,203 @@
+"""
+Offline Bulk Scoring
+Scores a JSONL or CSV archive of proposals without going through the HTTP API:
+rows are streamed through extract → simulate → risk analysis (→ optional summary)
+on a process pool, and results are appended to a JSONL file in input order.
+
+Progress is checkpointed next to the output (<output>.checkpoint); re-running the
+same command resumes after the last checkpointed row instead of starting over.
+A new run appends to an existing output file; the checkpoint records the offset
+where its rows start (start_bytes).
+
+Run from backend/:
+    python -m app.bulk_score proposals.csv scores.jsonl --workers 8 --regex-only --no-summary
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import signal
+import sys
+import time
+from multiprocessing import Pool
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Set by _init_worker in every pool process
+_worker_options: Dict[str, Any] = {}
+
+
+def read_rows(path: str, text_field: str, id_field: Optional[str]) -> Iterator[Tuple[int, Any, str, Optional[str]]]:
+    """
+    Stream (row_number, row_id, description, error) from a .jsonl or .csv file.
+    A row that cannot be read keeps its number and carries the reason in `error`,
+    so one malformed line is reported in the output instead of stopping the run.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            records = ((record, None) for record in csv.DictReader(f))
+        else:
+            records = (_parse_jsonl_line(line) for line in f)
+        for number, (record, error) in enumerate(records):
+            row_id = record.get(id_field) if id_field else number
+            description = record.get(text_field) or ""
+            if error is None and not isinstance(description, str):
+                error = f"'{text_field}' is not a string"
+            yield number, row_id, description if error is None else "", error
+
+
+def _parse_jsonl_line(line: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    if not line.strip():
+        return {}, None
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        return {}, f"invalid JSON: {e}"
+    if not isinstance(record, dict):
+        return {}, f"expected a JSON object, got {type(record).__name__}"
+    return record, None
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]):
+    # Write-then-rename, so a crash mid-write never leaves a corrupt checkpoint
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)
+
+
+def _init_worker(regex_only: bool, summary: bool, provider: Optional[str], summary_tier: str):
+    from app.config import get_settings
+    from app.services.result_cache import get_result_cache
+
+    # Ctrl+C is handled by the parent, which checkpoints and stops the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Archive rows are mostly unique; keep them out of the API's shared cache
+    get_settings().result_cache_enabled = False
+    get_result_cache.cache_clear()
+    _worker_options.update(regex_only=regex_only, summary=summary, provider=provider, summary_tier=summary_tier)
+
+
+def score_row(row: Tuple[int, Any, str, Optional[str]]) -> Dict[str, Any]:
+    """Score one row; failures are reported in the output instead of stopping the run"""
+    from app.services.ai_extractor import extract_variables, extract_variables_regex
+    from app.services.simulator_backends import run_quantum_simulation
+    from app.services.risk_engine import generate_risk_analysis
+    from app.services.pipeline import summarize_analysis
+
+    number, row_id, description, error = row
+    result: Dict[str, Any] = {"row": number, "id": row_id}
+    if error is not None:
+        result["error"] = error
+        return result
+    if not description.strip():
+        result["error"] = "empty description"
+        return result
+
+    try:
+        if _worker_options["regex_only"]:
+            variables = extract_variables_regex(description)
+        else:
+            variables = extract_variables(description, provider=_worker_options["provider"])
+        quantum_result = run_quantum_simulation(variables)
+        analysis = generate_risk_analysis(variables, quantum_result)
+
+        result.update(
+            success_probability=analysis["success_probability"],
+            confidence_interval=quantum_result["metadata"].get("confidence_interval"),
+            risk_categories=analysis["risk_categories"].model_dump(),
+            recommendations=analysis["recommendations"],
+            extracted_variables=variables.model_dump(),
+        )
+        if _worker_options["summary"]:
+            summary = summarize_analysis(
+                variables, quantum_result, analysis["risk_categories"],
+                _worker_options["provider"], _worker_options["summary_tier"],
+            )
+            result["quantum_summary"] = summary.model_dump() if summary else None
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def run(args: argparse.Namespace) -> int:
+    checkpoint_path = f"{args.output}.checkpoint"
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint is None:
+        # New run: append after whatever the output already holds, never overwrite it
+        existing = os.path.getsize(args.output) if os.path.exists(args.output) else 0
+        checkpoint = {"rows_done": 0, "start_bytes": existing, "output_bytes": existing}
+    if checkpoint.get("input") not in (None, os.path.abspath(args.input)):
+        print(f"[BULK] {checkpoint_path} belongs to {checkpoint['input']}; remove it to start over")
+        return 1
+    checkpoint["input"] = os.path.abspath(args.input)
+    done = checkpoint["rows_done"]
+
+    # Drop rows written after the last checkpoint; they are scored again
+    mode = "r+b" if os.path.exists(args.output) else "wb"
+    output = open(args.output, mode)
+    output.truncate(checkpoint["output_bytes"])
+    output.seek(checkpoint["output_bytes"])
+    if done:
+        print(f"[BULK] Resuming after row {done}")
+
+    rows = itertools.islice(read_rows(args.input, args.text_field, args.id_field), done, None)
+    start = time.perf_counter()
+    scored = errors = 0
+    pool = Pool(args.workers, initializer=_init_worker, initargs=(args.regex_only, not args.no_summary, args.provider, args.summary_tier))
+    try:
+        # imap keeps results in input order, so "rows_done" fully describes progress
+        for result in pool.imap(score_row, rows, chunksize=args.chunksize):
+            output.write((json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8"))
+            scored += 1
+            errors += "error" in result
+            if scored % args.checkpoint_every == 0:
+                output.flush()
+                os.fsync(output.fileno())
+                checkpoint.update(rows_done=done + scored, output_bytes=output.tell())
+                save_checkpoint(checkpoint_path, checkpoint)
+                rate = scored / (time.perf_counter() - start)
+                print(f"[BULK] {done + scored} rows ({rate:.1f} rows/s, {errors} errors)")
+    except KeyboardInterrupt:
+        print("[BULK] Interrupted")
+    finally:
+        pool.terminate()
+        pool.join()
+        output.flush()
+        os.fsync(output.fileno())
+        checkpoint.update(rows_done=done + scored, output_bytes=output.tell())
+        save_checkpoint(checkpoint_path, checkpoint)
+        output.close()
+
+    print(f"[BULK] {scored} rows scored ({errors} errors), {done + scored} total in {args.output}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Score a JSONL/CSV proposal archive offline")
+    parser.add_argument("input", help="Input .jsonl or .csv file")
+    parser.add_argument("output", help="Output .jsonl file (appended; resumable)")
+    parser.add_argument("--text-field", default="description", help="Field/column holding the description")
+    parser.add_argument("--id-field", default=None, help="Field/column copied to the output as 'id'")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=16, help="Rows handed to a worker at a time")
+    parser.add_argument("--checkpoint-every", type=int, default=500, help="Rows between checkpoints")
+    parser.add_argument("--regex-only", action="store_true", help="Skip the LLM extractor")
+    parser.add_argument("--no-summary", action="store_true", help="Skip the LLM summary")
+    parser.add_argument("--provider", default=None, help="LLM provider override (groq | gemini)")
+    parser.add_argument("--summary-tier", default="brief", choices=["brief", "standard", "deep"],
+                        help="LLM summary depth (brief keeps archive runs cheap)")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
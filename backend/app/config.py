@@ -23,12 +23,81 @@ class Settings(BaseSettings):
     cors_origins: str = "http://localhost:3000,http://localhost:5173"
     
     # Quantum
-    quantum_shots: int = 1024
-    use_mock_simulator: bool = False
+    quantum_shots: int = 1024  # Shots per simulation in "fixed" mode
+    use_mock_simulator: bool = False  # Forces the mock backend for every request
+    simulator_backend: str = "aer_shots"  # "aer_shots" | "aer_statevector" | "aer_iae" | "mock" | "auto"
+    statevector_max_qubits: int = 20  # Widest circuit the statevector backend accepts
+    shot_mode: str = "fixed"  # "fixed" | "adaptive"
+    adaptive_shot_batch: int = 256  # Shots per adaptive increment
+    adaptive_max_shots: int = 8192
+    adaptive_ci_width: float = 0.06  # Stop once the Wilson interval is this narrow (hi - lo)
+    confidence_level: float = 0.95
+    estimation_mode: str = "shots"  # "shots" | "iae" (iterative amplitude estimation)
+    iae_epsilon: float = 0.01  # Target half-width of the IAE interval
+    iae_shots_per_round: int = 100
+    mps_qubit_threshold: int = 24  # Wider circuits (extra_factors) use Aer's matrix_product_state method
+    
+    # Uncertainty Ensemble (AnalyzeRequest.ensemble)
+    ensemble_samples: int = 512
+    ensemble_chunk_size: int = 128
+    ensemble_latency_budget_ms: int = 200  # Stop sampling after this budget, keep what is done
+    
+    # Performance
+    coalesce_requests: bool = True  # Share one pipeline run across identical in-flight requests
+    stage_workers: int = 8  # Threads running independent pipeline stages concurrently
+    warmup_on_startup: bool = False  # Compile circuit + open LLM connections before /health is ready
+    analyze_cache_max_age: int = 3600  # Cache-Control max-age of /api/analyze responses (seconds)
+    live_debounce_ms: int = 400  # /api/analyze/live waits this long after the last edit
+    profiling_admin_token: str | None = None  # Enables X-Profile on /api/analyze when set
+    profile_dir: str = "profiles"  # cProfile output (<profile_id>.prof)
+    memory_tracing: bool = False  # tracemalloc from startup for /api/debug/memory (slows allocations)
+    memory_trace_frames: int = 10  # Stack depth recorded per allocation
+    request_deadline_ms: int = 0  # Time budget per /api/analyze request (0 = none); X-Deadline-Ms can lower it
+    llm_timeout_seconds: float = 30.0  # Hard timeout on every provider call
+    llm_batch_window_ms: int = 0  # Batch LLM extractions arriving within this window into one call (0 = off)
+    llm_batch_max_size: int = 8  # Descriptions per batched extraction call
+    
+    # Logging (structured, written by a background thread)
+    log_level: str = "INFO"
+    log_format: str = "json"  # "json" | "text"
+    log_sample_rate: float = 1.0  # Fraction of request ids whose INFO/DEBUG lines are kept
+    log_payload_max_chars: int = 200  # Longer string fields (LLM responses, descriptions) are truncated
+    log_queue_size: int = 10_000  # Records beyond this backlog are dropped, never waited on
+    
+    # Admission Control (per-stage concurrency; overflow → 503 + Retry-After)
+    admission_control: bool = True
+    llm_concurrency_per_provider: int = 8  # Concurrent LLM calls per provider
+    simulation_concurrency: int = 0  # Concurrent simulations (0 = CPU count)
+    admission_max_queue: int = 32  # Callers allowed to wait for a busy stage
+    admission_max_wait_ms: int = 2000  # Longest wait for a slot before rejecting
+    stage_max_queue: int = 64  # Pipeline stages allowed to wait for a STAGE_WORKERS thread
+    
+    # Shared Result Cache (one SQLite file per node, shared by all workers)
+    result_cache_enabled: bool = True
+    result_cache_path: str = "result_cache.db"
+    result_cache_max_entries: int = 10_000
+    result_cache_max_bytes: int = 256 * 1024 * 1024
+    
+    # Summary Cache (LLM summaries keyed on quantized simulation outputs)
+    summary_cache_enabled: bool = True
+    summary_cache_path: str = "summary_cache.db"
+    summary_cache_max_entries: int = 50_000
+    summary_cache_max_bytes: int = 128 * 1024 * 1024
+    summary_probability_step: float = 0.02  # Success probability is rounded to this step for the key
+    
+    # Async Jobs (/api/jobs)
+    job_workers: int = 2
+    job_queue_max_depth: int = 100
+    job_result_ttl_seconds: int = 3600
+    job_store: str = "memory"  # "memory" | "sqlite"
+    job_store_path: str = "jobs.db"
+    job_lease_seconds: int = 60  # A running SQLite job is requeued once its worker stops renewing this lease
     
     # LLM Provider Selection
     llm_provider: str = "groq"  # "groq" | "gemini"
     use_llm_extraction: bool = True  # Set to False to use regex fallback
+    extraction_log_path: str = ""  # Append (description, LLM extraction) pairs here to train the local extractor
+    local_extractor_path: str = "local_extractor.json"  # Model used by model_provider "local"
     
     # Groq LLM
     groq_api_key: str | None = None
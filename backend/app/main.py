@@ -1,6 +1,11 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import analyze
+from app.routers import analyze, debug, jobs, live, metrics
+from app.services.job_queue import get_job_queue
+from app.services.memory_debug import start_tracing
+from app.services.structured_log import configure_logging, new_request_id, request_id_var, shutdown_logging
+from app.services.warmup import run_warmup, warmup_state
 from app.config import get_settings
 
 settings = get_settings()
@@ -23,8 +28,55 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def assign_request_id(request: Request, call_next):
+    # Every log record written while serving this request carries its id
+    request_id = (request.headers.get("x-request-id") or new_request_id())[:64]
+    request_id_var.set(request_id)
+    response = await call_next(request)
+    response.headers["X-Request-Id"] = request_id
+    return response
+
+
 # Include routers
 app.include_router(analyze.router, prefix="/api", tags=["Analysis"])
+app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
+app.include_router(live.router, prefix="/api", tags=["Live"])
+app.include_router(metrics.router, prefix="/api", tags=["Metrics"])
+app.include_router(debug.router, prefix="/api", tags=["Debug"])
+
+
+@app.on_event("startup")
+async def start_logging():
+    configure_logging()
+
+
+@app.on_event("startup")
+async def start_memory_tracing():
+    if settings.memory_tracing:
+        start_tracing()
+
+
+@app.on_event("startup")
+async def start_job_workers():
+    get_job_queue().start()
+
+
+@app.on_event("startup")
+async def start_warmup():
+    # Runs in the background; /health answers 503 until it finishes
+    if settings.warmup_on_startup:
+        app.state.warmup_task = asyncio.get_running_loop().run_in_executor(None, run_warmup)
+
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    get_job_queue().stop()
+
+
+@app.on_event("shutdown")
+async def stop_logging():
+    shutdown_logging()
 
 
 @app.get("/")
@@ -37,5 +89,9 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(response: Response):
+    warmup = warmup_state()
+    if settings.warmup_on_startup and warmup["state"] != "ready":
+        response.status_code = 503
+        return {"status": "warming", "quantum_simulator": warmup["state"]}
     return {"status": "healthy", "quantum_simulator": "ready"}
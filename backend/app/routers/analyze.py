@@ -1,116 +1,99 @@
-from fastapi import APIRouter, HTTPException
-from app.schemas import AnalyzeRequest, AnalyzeResponse, QuantumSummary
-from app.services.ai_extractor import extract_variables
-from app.services.quantum_simulator import run_quantum_simulation
-from app.services.risk_engine import generate_risk_analysis
-from app.services.llm_client import summarize_quantum_results
+from fastapi import APIRouter, HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
+from app.schemas import AnalyzeRequest, AnalyzeResponse
+from app.services.admission import OverloadedError, check_admission
+from app.services.coalescer import analysis_flight, coalesce_key
+from app.services.deadline import Deadline, request_budget_ms
+from app.services.http_cache import cache_headers, etag_matches, render_analysis, response_etag
+from app.services.pipeline import response_exclude, run_analysis
+from app.services.profiling import profiling_authorized, run_profiled
+from app.services.structured_log import get_logger
 from app.config import get_settings
 
+log = get_logger("analyze")
+
 router = APIRouter()
 
 
 @router.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_risk(request: AnalyzeRequest):
+async def analyze_risk(request: AnalyzeRequest, http_request: Request):
     """
     Analisis risiko bisnis menggunakan Quantum-AI hybrid approach.
-    
-    NEW FLOW (Sequential):
-    1. LLM ekstraksi variabel dari teks (extended fields)
-    2. Qiskit quantum simulation → probability, heatmap
-    3. LLM summarize hasil quantum (explain WHY)
-    4. Return complete response
+
+    Pipeline berjalan di threadpool; request identik yang datang bersamaan
+    (deskripsi ternormalisasi + model_provider) berbagi satu eksekusi.
+    Response membawa ETag; If-None-Match yang cocok dijawab 304 tanpa menjalankan pipeline.
+    `fields` membatasi response ke field tertentu; tahap yang tidak dibutuhkan (heatmap,
+    summary LLM, ...) tidak dijalankan sama sekali.
+    Header `X-Deadline-Ms` (dibatasi REQUEST_DEADLINE_MS) memberi batas waktu: tahap yang
+    tidak selesai memakai hasil termurah dan tercantum di `degraded_stages`.
+    Saat LLM/simulator sudah penuh, request baru ditolak `503` + `Retry-After`.
+    Header `X-Profile: <admin token>` (atau `?profile=<token>`) menjalankan request ini
+    di bawah cProfile, tanpa coalescing/cache response tetapi tetap lewat admission control;
+    id profil ada di `X-Profile-Id`.
     """
+    profile_token = http_request.headers.get("x-profile") or http_request.query_params.get("profile")
+    if profile_token is not None:
+        if not profiling_authorized(profile_token):
+            raise HTTPException(status_code=403, detail="Profiling not permitted")
+        return await _analyze_profiled(request)
+
     try:
+        budget_ms = request_budget_ms(http_request.headers.get("x-deadline-ms"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="X-Deadline-Ms must be a positive integer")
+
+    etag = response_etag(request)
+    headers = cache_headers(etag)
+    if etag_matches(http_request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        check_admission(request)
+        deadline = Deadline(budget_ms) if budget_ms else None
         settings = get_settings()
-        print(f"\n{'='*50}")
-        print(f"[ANALYZE] Starting analysis...")
-        print(f"[ANALYZE] Input: {request.description[:80]}...")
-        
-        # ===== STEP 1: Extract variables from description (LLM) =====
-        variables = extract_variables(request.description, provider=request.model_provider)
-        print(f"[ANALYZE] Step 1 DONE: sektor={variables.sektor}, modal={variables.modal:,.0f}")
-        
-        # ===== STEP 2: Run quantum simulation (Qiskit) =====
-        quantum_result = run_quantum_simulation(variables)
-        success_prob = quantum_result['success_probability']
-        print(f"[ANALYZE] Step 2 DONE: Quantum probability={success_prob:.1%}")
-        
-        # ===== STEP 3: Generate risk analysis (heatmap, categories) =====
-        analysis = generate_risk_analysis(variables, quantum_result)
-        print(f"[ANALYZE] Step 3 DONE: Heatmap generated, risks categorized")
-        
-        # ===== STEP 4: LLM Summarize quantum results (NEW!) =====
-        quantum_summary = None
-        if settings.use_llm_extraction and (settings.groq_api_key or settings.gemini_api_key):
-            # Convert variables to dict for LLM
-            var_dict = {
-                "modal": variables.modal,
-                "sektor": variables.sektor,
-                "lokasi": variables.lokasi,
-                "tahun": variables.tahun,
-                "target_market": variables.target_market,
-                "competitors": variables.competitors,
-                "unique_value": variables.unique_value,
-            }
-            
-            # Convert risk categories to dict
-            risk_dict = {
-                "High": analysis["risk_categories"].High,
-                "Medium": analysis["risk_categories"].Medium,
-                "Low": analysis["risk_categories"].Low
-            }
-            
-            summary_data = summarize_quantum_results(var_dict, quantum_result, risk_dict, provider=request.model_provider)
-            
-            if summary_data:
-                # Helper to safely convert any value to string
-                def safe_str(val, default=""):
-                    if val is None:
-                        return default
-                    if isinstance(val, dict):
-                        # Convert dict to readable string
-                        return '; '.join(f"{k}: {v}" for k, v in val.items())
-                    if isinstance(val, list):
-                        return ', '.join(str(v) for v in val)
-                    return str(val)
-                
-                # Ensure action_items is a list
-                action_items = summary_data.get("action_items", [])
-                if isinstance(action_items, str):
-                    action_items = [action_items]
-                elif not isinstance(action_items, list):
-                    action_items = []
-                
-                quantum_summary = QuantumSummary(
-                    executive_summary=safe_str(summary_data.get("executive_summary")),
-                    probability_explanation=safe_str(summary_data.get("probability_explanation")),
-                    risk_breakdown=safe_str(summary_data.get("risk_breakdown")),
-                    key_insight=safe_str(summary_data.get("key_insight")),
-                    action_items=action_items
-                )
-                print(f"[ANALYZE] Step 4 DONE: Quantum summary generated!")
-        
-        # Use LLM action items as recommendations if available
-        recommendations = (
-            quantum_summary.action_items 
-            if quantum_summary and quantum_summary.action_items 
-            else analysis["recommendations"]
-        )
-        
-        print(f"[ANALYZE] COMPLETE! Probability: {success_prob:.1%}")
-        print(f"{'='*50}\n")
-        
-        return AnalyzeResponse(
-            success_probability=analysis["success_probability"],
-            risk_heatmap=analysis["risk_heatmap"],
-            risk_categories=analysis["risk_categories"],
-            recommendations=recommendations,
-            extracted_variables=variables,
-            quantum_summary=quantum_summary,
-            ai_insights=None,  # Replaced by quantum_summary
-            quantum_metadata=quantum_result["metadata"]
+        if settings.coalesce_requests:
+            # Only requests with the same budget share a run, so nobody waits past their own deadline
+            body, degraded = await analysis_flight.do(
+                (coalesce_key(request), budget_ms),
+                lambda: run_in_threadpool(render_analysis, request, deadline)
+            )
+        else:
+            body, degraded = await run_in_threadpool(render_analysis, request, deadline)
+
+    except OverloadedError as e:
+        raise _shed(e)
+    except Exception as e:
+        log.error("analyze.failed", exc_info=True, error=str(e))
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+    if degraded:
+        # A partial answer must not be revalidated or cached as the full one
+        headers = {"Cache-Control": "no-store"}
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _shed(e: OverloadedError) -> HTTPException:
+    log.warning("analyze.shed", stage=e.stage, retry_after=e.retry_after)
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+async def _analyze_profiled(request: AnalyzeRequest) -> Response:
+    # Profiling is the most expensive path; it gets no exemption from the stage limits
+    try:
+        check_admission(request)
+        # cProfile only sees its own thread, so the stages run inline instead of on the stage pool
+        response, profile_id = await run_in_threadpool(
+            run_profiled, lambda: run_analysis(request, sequential=True)
         )
-        
+    except OverloadedError as e:
+        raise _shed(e)
     except Exception as e:
-        print(f"[ANALYZE] ERROR: {str(e)}")
+        log.error("analyze.failed", exc_info=True, error=str(e))
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+    return Response(
+        content=response.model_dump_json(exclude=response_exclude(request)),
+        media_type="application/json",
+        headers={"X-Profile-Id": profile_id, "Cache-Control": "no-store"}
+    )
@@ -0,0 +1,34 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
+from app.services.memory_debug import memory_report, start_tracing
+from app.services.profiling import profiling_authorized
+
+router = APIRouter()
+
+
+def _require_admin(token: Optional[str]):
+    if not profiling_authorized(token):
+        raise HTTPException(status_code=403, detail="Debug endpoints not permitted")
+
+
+@router.get("/debug/memory")
+async def get_memory(
+    limit: int = Query(20, ge=1, le=200),
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+    x_admin_token: Optional[str] = Header(None),
+):
+    """
+    RSS worker ini dan (jika tracemalloc aktif) lokasi alokasi terbesar, diurutkan
+    berdasarkan pertumbuhan sejak baseline. Butuh header `X-Admin-Token`.
+    """
+    _require_admin(x_admin_token)
+    return await run_in_threadpool(memory_report, limit, group_by)
+
+
+@router.post("/debug/memory/baseline")
+async def reset_memory_baseline(x_admin_token: Optional[str] = Header(None)):
+    """Aktifkan tracemalloc (jika belum) dan jadikan kondisi sekarang baseline"""
+    _require_admin(x_admin_token)
+    await run_in_threadpool(start_tracing)
+    return await run_in_threadpool(memory_report, 0)
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException
+from starlette.concurrency import run_in_threadpool
+from app.schemas import JobRequest, JobStatus
+from app.services.job_queue import get_job_queue, job_to_status, QueueFullError
+
+router = APIRouter()
+
+
+@router.post("/jobs", response_model=JobStatus, status_code=202)
+async def create_job(request: JobRequest):
+    """
+    Enqueue analisis dan langsung kembalikan job id.
+    Poll GET /api/jobs/{job_id} sampai status "done" atau "failed".
+    """
+    try:
+        # The store may be SQLite: keep its I/O off the event loop
+        job = await run_in_threadpool(get_job_queue().submit, request)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return job_to_status(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """Status job; field result berisi AnalyzeResponse setelah selesai"""
+    job = await run_in_threadpool(get_job_queue().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job_to_status(job)
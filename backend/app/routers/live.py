@@ -0,0 +1,83 @@
+import asyncio
+import json
+from fastapi import APIRouter, WebSocket
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from app.schemas import AnalyzeRequest
+from app.services.live_session import LiveAnalysisSession
+from app.services.structured_log import get_logger, new_request_id, request_id_var
+from app.config import get_settings
+
+log = get_logger("live")
+
+router = APIRouter()
+
+
+@router.websocket("/analyze/live")
+async def analyze_live(websocket: WebSocket):
+    """
+    Sesi analisis untuk live editing.
+
+    Client mengirim AnalyzeRequest (JSON) setiap kali teks berubah. Update di-debounce
+    (LIVE_DEBOUNCE_MS); hanya update terakhir yang dianalisis, dan hanya tahap yang
+    input-nya berubah yang dijalankan ulang. Setiap hasil berisi `stages`
+    (computed / reused / skipped per tahap).
+    """
+    await websocket.accept()
+    session_id = new_request_id()
+    session = LiveAnalysisSession()
+    debounce = get_settings().live_debounce_ms / 1000
+    # One long-lived receive feeds the queue: cancelling a receive on every debounce
+    # timeout could drop a frame that was already being read
+    messages: asyncio.Queue = asyncio.Queue()
+    reader = asyncio.create_task(_receive_frames(websocket, messages))
+    pending = None
+    revision = 0
+
+    try:
+        while True:
+            try:
+                if pending is None:
+                    frame = await messages.get()
+                else:
+                    frame = await asyncio.wait_for(messages.get(), timeout=debounce)
+            except asyncio.TimeoutError:
+                # Quiet for a full debounce window: analyze the latest text
+                request, pending = pending, None
+                # Each analyzed revision logs as <session>.<revision>
+                request_id_var.set(f"{session_id}.{revision}")
+                try:
+                    reply = await run_in_threadpool(session.analyze_timed, request)
+                    reply["revision"] = revision
+                except Exception as e:
+                    log.error("live.failed", exc_info=True, error=str(e))
+                    reply = {"type": "error", "revision": revision, "detail": f"Analysis failed: {str(e)}"}
+                await websocket.send_json(reply)
+                continue
+
+            if frame is None:
+                return
+            try:
+                # Malformed JSON is a validation error too; the session stays open
+                pending = AnalyzeRequest.model_validate_json(frame)
+                revision += 1
+            except ValidationError as e:
+                # e.json() also serializes the error context (e.g. a model validator's ValueError)
+                await websocket.send_json({"type": "error", "detail": json.loads(e.json(include_url=False))})
+    finally:
+        reader.cancel()
+
+
+async def _receive_frames(websocket: WebSocket, messages: asyncio.Queue):
+    """Queue every text/binary frame; None marks the end of the connection"""
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            text = message.get("text")
+            if text is None:
+                text = (message.get("bytes") or b"").decode("utf-8", errors="replace")
+            await messages.put(text)
+    finally:
+        messages.put_nowait(None)
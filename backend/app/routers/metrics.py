@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+from app.services.admission import admission_stats
+from app.services.coalescer import analysis_flight
+from app.services.extraction_batcher import extraction_batcher
+from app.services.job_queue import get_job_queue
+from app.services.llm_client import json_recovery_stats, summary_latency
+from app.services.result_cache import get_result_cache, get_summary_cache
+from app.services.stage_graph import stage_stats
+from app.services.structured_log import logging_stats
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """Runtime counters for this worker process"""
+    return {
+        "coalescing": analysis_flight.stats(),
+        "admission": admission_stats(),
+        "extraction_batching": extraction_batcher.stats(),
+        "jobs": get_job_queue().stats(),
+        "result_cache": get_result_cache().stats() if get_result_cache() else None,
+        "summary_cache": get_summary_cache().stats() if get_summary_cache() else None,
+        "pipeline_stages": stage_stats.stats(),
+        "summary_latency": summary_latency.stats(),
+        "json_recovery": json_recovery_stats(),
+        "logging": logging_stats(),
+    }
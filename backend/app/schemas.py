@@ -1,5 +1,28 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Literal
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Any, List, Dict, Optional, Literal, get_args
+
+# Qubit order of the built-in risk factors (see quantum_simulator)
+CORE_FACTOR_NAMES = [
+    "modal", "sektor", "lokasi", "tahun",
+    "target_market", "competitors", "team_size", "business_model",
+]
+
+
+class RiskFactorSpec(BaseModel):
+    """Additional (enterprise) risk factor, simulated as one extra qubit"""
+    name: str = Field(..., min_length=1, max_length=64, description="Nama faktor, mis. 'regulator', 'supply_chain', 'fx'")
+    risk: float = Field(..., ge=0.0, le=1.0, description="Tingkat risiko 0.0 (rendah) - 1.0 (tinggi)")
+    correlates_with: List[str] = Field(
+        default=[],
+        description="Faktor (core atau tambahan) yang dipengaruhi faktor ini"
+    )
+
+
+# AnalyzeResponse fields a caller can select with AnalyzeRequest.fields
+ResponseField = Literal[
+    "success_probability", "extracted_variables", "quantum_metadata", "risk_categories", "risk_heatmap",
+    "recommendations", "quantum_summary", "success_distribution", "pipeline_trace", "degraded_stages",
+]
 
 
 class AnalyzeRequest(BaseModel):
@@ -10,10 +33,61 @@ class AnalyzeRequest(BaseModel):
         description="Deskripsi skenario bisnis minimal 50 karakter",
         examples=["Investasi 500 juta di F&B Jakarta Selatan tahun 2026"]
     )
-    model_provider: Literal["groq", "gemini"] = Field(
+    model_provider: Literal["groq", "gemini", "local"] = Field(
         default="groq",
-        description="LLM provider to use: 'groq' (Llama) or 'gemini' (Google)"
+        description="LLM provider to use: 'groq' (Llama), 'gemini' (Google) or 'local' (distilled CPU extractor)"
+    )
+    summary_tier: Literal["brief", "standard", "deep"] = Field(
+        default="deep",
+        description="Kedalaman ringkasan LLM: 'brief' (paling cepat), 'standard' atau 'deep' (5 field lengkap)"
+    )
+    ensemble: bool = Field(
+        default=False,
+        description="Simulasikan rentang nilai yang tidak pasti dan kembalikan distribusi probabilitas"
+    )
+    extra_factors: List[RiskFactorSpec] = Field(
+        default=[],
+        max_length=60,
+        description="Faktor risiko tambahan + graf korelasinya (regulator, supply chain, FX, ...)"
     )
+    simulator_backend: Optional[Literal["auto", "aer_shots", "aer_statevector", "aer_iae", "mock"]] = Field(
+        default=None,
+        description="Backend simulasi; 'auto' memilih yang termurah untuk lebar circuit, presisi dan beban saat ini (default: SIMULATOR_BACKEND)"
+    )
+    precision: Optional[float] = Field(
+        default=None,
+        gt=0.0,
+        le=0.5,
+        description="Lebar confidence interval success_probability yang diinginkan (mis. 0.06)"
+    )
+    fields: Optional[List[ResponseField]] = Field(
+        default=None,
+        min_length=1,
+        description="Field response yang dibutuhkan; tahap pipeline yang tidak diperlukan tidak dijalankan (default: semua)"
+    )
+
+    @field_validator("fields")
+    @classmethod
+    def canonical_fields(cls, fields: Optional[List[str]]) -> Optional[List[str]]:
+        # Same selection in any order / with repeats → same cache and coalescing key
+        if fields is None:
+            return None
+        return [name for name in get_args(ResponseField) if name in fields]
+
+    @model_validator(mode="after")
+    def check_factor_graph(self):
+        names = list(CORE_FACTOR_NAMES)
+        for factor in self.extra_factors:
+            if factor.name in names:
+                raise ValueError(f"Duplicate risk factor name: {factor.name}")
+            names.append(factor.name)
+        for factor in self.extra_factors:
+            for target in factor.correlates_with:
+                if target not in names:
+                    raise ValueError(f"Unknown correlated factor '{target}' in '{factor.name}'")
+                if target == factor.name:
+                    raise ValueError(f"Risk factor '{factor.name}' cannot correlate with itself")
+        return self
 
 
 class ExtractedVariables(BaseModel):
@@ -31,6 +105,12 @@ class ExtractedVariables(BaseModel):
     timeline: Optional[str] = Field(default=None, description="Timeline/fase bisnis")
     team_size: Optional[int] = Field(default=None, description="Estimasi ukuran tim")
     business_model: Optional[str] = Field(default=None, description="Model bisnis")
+    
+    # Uncertainty ranges (for ensemble simulation)
+    modal_min: Optional[float] = Field(default=None, description="Estimasi modal terendah yang masuk akal")
+    modal_max: Optional[float] = Field(default=None, description="Estimasi modal tertinggi yang masuk akal")
+    team_size_min: Optional[int] = Field(default=None, description="Estimasi ukuran tim terkecil")
+    team_size_max: Optional[int] = Field(default=None, description="Estimasi ukuran tim terbesar")
 
 
 class RiskCategories(BaseModel):
@@ -58,6 +138,30 @@ class QuantumSummary(BaseModel):
     action_items: List[str] = Field(default=[], description="Action items berdasarkan hasil quantum")
 
 
+class SuccessDistribution(BaseModel):
+    """Distribution of success probability over sampled plausible inputs"""
+    mean: float
+    std: float
+    percentiles: Dict[str, float] = Field(..., description="p5, p25, p50, p75, p95")
+    histogram: List[int] = Field(..., description="Jumlah sampel per bin 0.05 pada rentang 0.0 - 1.0")
+    samples: int
+    uncertain_fields: List[str] = Field(default=[], description="Field yang di-sampling")
+    elapsed_ms: float
+
+
+class StageTiming(BaseModel):
+    """Offsets (ms) from the start of the pipeline run"""
+    start_ms: float
+    end_ms: float
+
+
+class PipelineTrace(BaseModel):
+    """Stage timings of the run that produced this response"""
+    total_ms: float
+    critical_path: List[str] = Field(..., description="Rantai tahap yang menentukan latency total")
+    stages: Dict[str, StageTiming]
+
+
 class AnalyzeResponse(BaseModel):
     """Response schema for risk analysis - Enhanced with Quantum Summary"""
     success_probability: float = Field(
@@ -67,13 +171,13 @@ class AnalyzeResponse(BaseModel):
         description="Probabilitas keberhasilan 0.0 - 1.0"
     )
     risk_heatmap: List[List[float]] = Field(
-        ...,
-        description="Matrix heatmap risiko"
+        default=[],
+        description="Matrix heatmap risiko (kosong jika tidak diminta lewat fields)"
     )
-    risk_categories: RiskCategories
+    risk_categories: RiskCategories = Field(default_factory=RiskCategories)
     recommendations: List[str] = Field(
-        ...,
-        description="Daftar rekomendasi mitigasi risiko"
+        default=[],
+        description="Daftar rekomendasi mitigasi risiko (kosong jika tidak diminta lewat fields)"
     )
     extracted_variables: ExtractedVariables
     quantum_summary: Optional[QuantumSummary] = Field(
@@ -88,4 +192,40 @@ class AnalyzeResponse(BaseModel):
         default={},
         description="Metadata dari quantum simulation"
     )
+    success_distribution: Optional[SuccessDistribution] = Field(
+        default=None,
+        description="Distribusi probabilitas (hanya jika ensemble=true)"
+    )
+    pipeline_trace: Optional[PipelineTrace] = Field(
+        default=None,
+        description="Timing per tahap + critical path"
+    )
+    degraded_stages: List[str] = Field(
+        default=[],
+        description="Tahap yang memakai hasil termurah (deadline request habis, LLM penuh), summary LLM yang gagal, atau simulasi fallback / presisi longgar"
+    )
+
+
+class JobRequest(AnalyzeRequest):
+    """Request schema for an asynchronous analysis job"""
+    priority: int = Field(
+        default=0,
+        ge=0,
+        le=9,
+        description="Prioritas antrian, 9 = diproses paling dulu"
+    )
+
+
+class JobStatus(BaseModel):
+    """Status and (when finished) result of an analysis job"""
+    job_id: str
+    status: Literal["queued", "running", "done", "failed"]
+    priority: int = 0
+    created_at: float = Field(..., description="Unix timestamp saat job dibuat")
+    finished_at: Optional[float] = Field(default=None, description="Unix timestamp saat job selesai")
+    result: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="AnalyzeResponse, dibatasi ke `fields` seperti response /api/analyze"
+    )
+    error: Optional[str] = None
 
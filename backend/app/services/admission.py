@@ -0,0 +1,163 @@
+"""
+Admission Control
+Bounded concurrency per pipeline stage (LLM calls per provider, simulations per
+CPU), each with a bounded wait queue, plus a bound on the stages waiting for a
+stage thread. Work that would wait too long is rejected
+up front with OverloadedError (503 + Retry-After), so admitted requests keep
+their latency instead of every request slowing down together.
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, Optional
+from app.schemas import AnalyzeRequest
+from app.services.stage_graph import get_stage_executor
+from app.config import get_settings
+
+
+class OverloadedError(Exception):
+    """A stage is at its concurrency limit and its wait queue is full (or the wait timed out)"""
+
+    def __init__(self, stage: str, retry_after: int):
+        super().__init__(f"Server busy ({stage}), retry in {retry_after}s")
+        self.stage = stage
+        self.retry_after = retry_after
+
+
+class StageLimiter:
+    """Counting semaphore with a bounded, time-limited wait queue"""
+
+    def __init__(self, name: str, limit: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._rejected = 0
+        self._mean_hold = 1.0  # Seconds; EWMA of how long a slot is held
+
+    def _reject(self) -> OverloadedError:
+        # Retry-After: time for the current backlog to drain through the slots
+        self._rejected += 1
+        return OverloadedError(self.name, max(1, math.ceil(self._mean_hold * (self._waiting + 1) / self.limit)))
+
+    def check(self):
+        """Raise OverloadedError if a new caller would be rejected right now"""
+        with self._cond:
+            if self._active >= self.limit and self._waiting >= self.max_queue:
+                raise self._reject()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        with self._cond:
+            if self._active >= self.limit:
+                if self._waiting >= self.max_queue:
+                    raise self._reject()
+                self._waiting += 1
+                try:
+                    admitted = self._cond.wait_for(lambda: self._active < self.limit, timeout=self.max_wait)
+                finally:
+                    self._waiting -= 1
+                if not admitted:
+                    raise self._reject()
+            self._active += 1
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._mean_hold = 0.8 * self._mean_hold + 0.2 * (time.perf_counter() - start)
+                self._cond.notify()
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "active": self._active,
+                "waiting": self._waiting,
+                "rejected": self._rejected,
+                "mean_hold_ms": round(self._mean_hold * 1000, 1),
+            }
+
+
+_limiters: Dict[str, StageLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str) -> StageLimiter:
+    """Limiter for "simulate" or "llm:<provider>", created on first use"""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            settings = get_settings()
+            if name == "simulate":
+                limit = settings.simulation_concurrency or os.cpu_count() or 1
+            else:
+                limit = settings.llm_concurrency_per_provider
+            limiter = StageLimiter(
+                name, limit, settings.admission_max_queue, settings.admission_max_wait_ms / 1000
+            )
+            _limiters[name] = limiter
+        return limiter
+
+
+def llm_limiter_name(provider: Optional[str]) -> str:
+    # "local" extraction still gets its summary from the configured LLM provider
+    if provider in (None, "local"):
+        provider = get_settings().llm_provider
+    return f"llm:{provider.lower()}"
+
+
+def llm_slot(provider: Optional[str]):
+    """Hold one LLM call slot for the provider (no-op with ADMISSION_CONTROL=false)"""
+    if not get_settings().admission_control:
+        return nullcontext()
+    return get_limiter(llm_limiter_name(provider)).slot()
+
+
+def simulation_slot():
+    """Hold one simulation slot (no-op with ADMISSION_CONTROL=false)"""
+    if not get_settings().admission_control:
+        return nullcontext()
+    return get_limiter("simulate").slot()
+
+
+_stage_rejections = 0
+
+
+def check_stage_backlog():
+    """Reject when pipeline stages already wait for a stage thread, where no limiter sees them"""
+    global _stage_rejections
+    queued, drain_seconds = get_stage_executor().backlog()
+    if queued >= get_settings().stage_max_queue:
+        with _limiters_lock:
+            _stage_rejections += 1
+        raise OverloadedError("stages", max(1, math.ceil(drain_seconds)))
+
+
+def check_admission(request: AnalyzeRequest):
+    """Reject a new request up front when a stage it needs is already saturated"""
+    settings = get_settings()
+    if not settings.admission_control:
+        return
+    check_stage_backlog()
+    get_limiter("simulate").check()
+    if settings.use_llm_extraction and (settings.groq_api_key or settings.gemini_api_key):
+        get_limiter(llm_limiter_name(request.model_provider)).check()
+
+
+def admission_stats() -> Dict[str, Dict[str, float]]:
+    with _limiters_lock:
+        limiters = dict(_limiters)
+        stage_rejections = _stage_rejections
+    stats = {name: limiter.stats() for name, limiter in sorted(limiters.items())}
+    executor = get_stage_executor()
+    stats["stages"] = {"limit": executor.workers, "waiting": executor.backlog()[0], "rejected": stage_rejections}
+    return stats
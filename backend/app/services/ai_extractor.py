@@ -8,20 +8,36 @@ from typing import Optional, Dict, Any
 from app.schemas import ExtractedVariables
 from app.config import get_settings
 from app.services.llm_client import extract_with_llm
+from app.services.extraction_batcher import extraction_batcher, llm_batching_enabled
+from app.services.local_extractor import get_local_extractor, log_extraction
+from app.services.structured_log import get_logger
 
+log = get_logger("extractor")
 
-def extract_variables(description: str, provider: str = None) -> ExtractedVariables:
+
+def extract_variables(description: str, provider: str = None, fallback: bool = True) -> Optional[ExtractedVariables]:
     """
     Extract business variables using LLM with regex fallback.
     Args:
         description: Business scenario text
-        provider: Override provider ("groq" or "gemini"). If None, uses config.
+        provider: Override provider ("groq", "gemini" or "local"). If None, uses config.
+        fallback: Return the regex extraction when no model produced one; False returns None instead
     """
     settings = get_settings()
     
+    # Distilled local model: no network call; regex fallback until one is trained
+    if (provider or settings.llm_provider) == "local":
+        local = get_local_extractor()
+        if local:
+            return local.extract(description)
+        return extract_variables_regex(description) if fallback else None
+    
     # Try LLM extraction first if enabled
     if settings.use_llm_extraction and (settings.groq_api_key or settings.gemini_api_key):
-        llm_result = extract_with_llm(description, provider=provider)
+        if llm_batching_enabled():
+            llm_result = extraction_batcher.extract(description, (provider or settings.llm_provider).lower())
+        else:
+            llm_result = extract_with_llm(description, provider=provider)
         
         if llm_result:
             # Helper to safely convert list to string (LLM sometimes returns lists)
@@ -32,7 +48,14 @@ def extract_variables(description: str, provider: str = None) -> ExtractedVariab
                     return ', '.join(str(v) for v in val)
                 return str(val)
             
-            return ExtractedVariables(
+            # Helper for optional numeric fields (LLM sometimes returns strings or garbage)
+            def safe_num(val, cast):
+                try:
+                    return cast(float(val)) if val is not None else None
+                except (TypeError, ValueError):
+                    return None
+            
+            variables = ExtractedVariables(
                 # Core fields
                 modal=float(llm_result.get("modal", 100_000_000)),
                 sektor=llm_result.get("sektor", "Lainnya"),
@@ -44,13 +67,20 @@ def extract_variables(description: str, provider: str = None) -> ExtractedVariab
                 unique_value=safe_str(llm_result.get("unique_value")),
                 timeline=safe_str(llm_result.get("timeline")),
                 team_size=llm_result.get("team_size"),
-                business_model=safe_str(llm_result.get("business_model"))
+                business_model=safe_str(llm_result.get("business_model")),
+                # Uncertainty ranges
+                modal_min=safe_num(llm_result.get("modal_min"), float),
+                modal_max=safe_num(llm_result.get("modal_max"), float),
+                team_size_min=safe_num(llm_result.get("team_size_min"), int),
+                team_size_max=safe_num(llm_result.get("team_size_max"), int)
             )
+            log_extraction(description, variables, provider or settings.llm_provider)
+            return variables
         else:
-            print("[Extractor] LLM failed, using regex fallback")
+            log.warning("extract.fallback", provider=provider or settings.llm_provider, method="regex")
     
     # Fallback to regex extraction
-    return extract_variables_regex(description)
+    return extract_variables_regex(description) if fallback else None
 
 
 def extract_variables_regex(description: str) -> ExtractedVariables:
@@ -0,0 +1,61 @@
+"""
+Request Coalescing (singleflight)
+Concurrent identical analyses share one in-flight pipeline execution.
+"""
+
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from app.schemas import AnalyzeRequest
+
+
+def normalize_description(description: str) -> str:
+    """Collapse whitespace and case so trivially different copies coalesce"""
+    return re.sub(r'\s+', ' ', description).strip().casefold()
+
+
+def coalesce_key(request: AnalyzeRequest) -> Tuple:
+    """Key identifying requests that must produce the same response"""
+    # Every other request field participates verbatim, so new options can never be merged away
+    return (normalize_description(request.description), request.model_dump_json(exclude={"description"}))
+
+
+class Singleflight:
+    """
+    Deduplicate concurrent calls by key.
+
+    The first caller (leader) starts the work as a task; callers arriving
+    while it is still running await the same task instead of starting their own.
+    The task is shielded, so one caller going away never cancels it for the rest.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.executed = 0  # Pipeline executions actually started
+        self.merged = 0    # Requests served by someone else's execution
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+            self.executed += 1
+        else:
+            self.merged += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "executed": self.executed,
+            "merged": self.merged,
+            "in_flight": len(self._inflight),
+        }
+
+
+# Shared by all /api/analyze requests in this process
+analysis_flight = Singleflight()
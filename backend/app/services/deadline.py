@@ -0,0 +1,132 @@
+"""
+Request Deadlines
+One time budget per /api/analyze request, shared by every pipeline stage. A stage
+that cannot finish inside the remaining budget returns its cheapest result instead
+(regex extraction, mock simulator, template summary) and is reported as degraded.
+The stage's own work sees the same deadline (time_left / check_deadline), so LLM
+timeouts and simulator batches stop with it instead of outliving the request.
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from functools import lru_cache
+from typing import Any, Callable, List, Optional
+from app.services.structured_log import get_logger
+from app.config import get_settings
+
+log = get_logger("deadline")
+
+
+class Deadline:
+    """Absolute deadline on the monotonic clock + the stages that had to degrade"""
+
+    def __init__(self, budget_ms: float):
+        self.budget_ms = budget_ms
+        self._expires_at = time.monotonic() + budget_ms / 1000
+        self._lock = threading.Lock()
+        self._degraded: List[str] = []
+
+    def remaining(self) -> float:
+        """Seconds left (never negative)"""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+    def mark_degraded(self, stage: str):
+        with self._lock:
+            if stage not in self._degraded:
+                self._degraded.append(stage)
+
+    @property
+    def degraded(self) -> List[str]:
+        with self._lock:
+            return list(self._degraded)
+
+
+class DeadlineExceeded(Exception):
+    """The request deadline of the stage running in this thread has passed"""
+
+
+# Deadline of the stage whose work is running in this context (set by run_within)
+_stage_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("stage_deadline", default=None)
+
+
+def time_left(default: float) -> float:
+    """
+    `default` seconds, capped by the deadline of the stage running in this thread.
+    Raises DeadlineExceeded once that deadline has passed.
+    """
+    deadline = _stage_deadline.get()
+    if deadline is None:
+        return default
+    remaining = deadline.remaining()
+    if remaining == 0.0:
+        raise DeadlineExceeded()
+    return min(default, remaining)
+
+
+def check_deadline():
+    """Raise DeadlineExceeded if the running stage is past its deadline"""
+    time_left(0.0)
+
+
+def deadline_active() -> bool:
+    return _stage_deadline.get() is not None
+
+
+def request_budget_ms(header_value: Optional[str]) -> Optional[int]:
+    """
+    Budget for one request: the client's X-Deadline-Ms header, capped by
+    REQUEST_DEADLINE_MS (0 = no server-side limit). None means no deadline.
+    Raises ValueError on a malformed header.
+    """
+    configured = get_settings().request_deadline_ms
+    if header_value is None:
+        return configured or None
+
+    budget = int(header_value)
+    if budget <= 0:
+        raise ValueError("X-Deadline-Ms must be a positive integer")
+    return min(budget, configured) if configured else budget
+
+
+@lru_cache()
+def get_deadline_executor() -> ThreadPoolExecutor:
+    # Stage work the request stopped waiting for keeps its thread until it notices the
+    # deadline (LLM timeouts, simulator batches), so keep it off the stage pool
+    return ThreadPoolExecutor(max_workers=get_settings().stage_workers * 2, thread_name_prefix="deadline")
+
+
+def run_within(
+    deadline: Optional[Deadline],
+    stage: str,
+    compute: Callable[[], Any],
+    fallback: Callable[[], Any],
+) -> Any:
+    """
+    compute() if it finishes inside the remaining budget, otherwise fallback().
+    compute() runs under the deadline: provider calls get at most the remaining
+    budget as their timeout and simulations stop between shot batches, so work
+    the request abandoned releases its LLM / simulation slot and thread promptly.
+    """
+    if deadline is None:
+        return compute()
+    if deadline.expired():
+        log.warning("stage.degraded", stage=stage, reason="budget exhausted", budget_ms=deadline.budget_ms)
+        deadline.mark_degraded(stage)
+        return fallback()
+
+    def bounded() -> Any:
+        _stage_deadline.set(deadline)
+        return compute()
+
+    future = get_deadline_executor().submit(contextvars.copy_context().run, bounded)
+    try:
+        return future.result(timeout=deadline.remaining())
+    except (FutureTimeout, DeadlineExceeded):
+        log.warning("stage.degraded", stage=stage, reason="timed out", budget_ms=deadline.budget_ms)
+        deadline.mark_degraded(stage)
+        return fallback()
@@ -0,0 +1,181 @@
+"""
+Uncertainty Ensemble Simulation
+Samples plausible values for uncertain ExtractedVariables fields and evaluates
+every sample in one batched NumPy statevector simulation of the risk circuit.
+"""
+
+import hashlib
+import time
+import numpy as np
+from typing import Any, Dict, List, Optional
+from app.schemas import ExtractedVariables
+from app.services.features import (
+    BUSINESS_MODEL_CLASSES, COMPETITION_CLASSES, MARKET_CLASSES, TEAM_CLASSES, encode_features, team_class,
+)
+from app.services.quantum_simulator import (
+    BUSINESS_MODEL_ANGLES,
+    COMPETITION_ANGLES,
+    ENTANGLEMENT_PAIRS,
+    LOCATION_ANGLES,
+    MARKET_ANGLES,
+    PHASE_CORRECTIONS,
+    SECTOR_ANGLES,
+    TEAM_ANGLES,
+    _is_success_state,
+    calculate_modal_angle,
+    calculate_tahun_angle,
+)
+from app.config import get_settings
+
+N_QUBITS = 8
+
+# Classes sampled for optional fields the extractor left empty;
+# angles come from the same per-class tables as the circuit.
+MARKET_CATEGORIES = [MARKET_CLASSES.index(name) for name in ("unknown", "enterprise", "mass", "niche")]
+COMPETITION_CATEGORIES = [COMPETITION_CLASSES.index(name) for name in ("unknown", "high", "low")]
+TEAM_CATEGORIES = [TEAM_CLASSES.index(name) for name in ("unknown", "small", "optimal", "large")]
+BUSINESS_MODEL_CATEGORIES = [
+    BUSINESS_MODEL_CLASSES.index(name) for name in ("unknown", "platform", "transactional", "asset_heavy", "ad_based")
+]
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def _success_mask() -> np.ndarray:
+    return np.array([_is_success_state(format(i, f'0{N_QUBITS}b')) for i in range(2 ** N_QUBITS)])
+
+
+def _cx_permutation(control: int, target: int) -> np.ndarray:
+    indices = np.arange(2 ** N_QUBITS)
+    return np.where((indices >> control) & 1, indices ^ (1 << target), indices)
+
+
+SUCCESS_MASK = _success_mask()
+CX_PERMUTATIONS = [_cx_permutation(c, t) for c, t in ENTANGLEMENT_PAIRS]
+
+
+def _apply_single_qubit(state: np.ndarray, gates: np.ndarray, qubit: int) -> np.ndarray:
+    """Apply a per-sample 2x2 gate (gates: n x 2 x 2) to `qubit` of every state in the batch"""
+    n = state.shape[0]
+    view = state.reshape(n, 2 ** (N_QUBITS - qubit - 1), 2, 2 ** qubit)
+    return np.einsum('nxy,nayb->naxb', gates, view).reshape(n, -1)
+
+
+def batched_success_probabilities(angles: np.ndarray) -> np.ndarray:
+    """
+    Exact success probability of the risk circuit for each row of RY angles
+    (shape n x 8), computed on a batched statevector with Qiskit's qubit ordering.
+    """
+    n = angles.shape[0]
+    state = np.zeros((n, 2 ** N_QUBITS), dtype=complex)
+    state[:, 0] = 1.0
+
+    hadamard = np.broadcast_to(np.array([[1, 1], [1, -1]]) / np.sqrt(2), (n, 2, 2))
+    for qubit in range(N_QUBITS):
+        state = _apply_single_qubit(state, hadamard, qubit)
+
+    for qubit in range(N_QUBITS):
+        cos, sin = np.cos(angles[:, qubit] / 2), np.sin(angles[:, qubit] / 2)
+        ry = np.stack([np.stack([cos, -sin], axis=-1), np.stack([sin, cos], axis=-1)], axis=-2)
+        state = _apply_single_qubit(state, ry, qubit)
+
+    for permutation in CX_PERMUTATIONS:
+        state = state[:, permutation]
+
+    for qubit, phase in PHASE_CORRECTIONS.items():
+        rz = np.broadcast_to(np.diag([np.exp(-0.5j * phase), np.exp(0.5j * phase)]), (n, 2, 2))
+        state = _apply_single_qubit(state, rz, qubit)
+
+    probabilities = np.abs(state) ** 2
+    return probabilities[:, SUCCESS_MASK].sum(axis=1)
+
+
+def _sample_angles(variables: ExtractedVariables, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Draw n angle vectors; fields without uncertainty keep their point value"""
+    def pick(options):
+        return np.asarray(options)[rng.integers(len(options), size=n)]
+
+    features = encode_features(variables)
+    angles = np.empty((n, N_QUBITS))
+
+    if variables.modal_min and variables.modal_max and variables.modal_max > variables.modal_min:
+        # Log-uniform: a 100 juta - 1 miliar range is uncertain in order of magnitude, not rupiah
+        modals = 10 ** rng.uniform(np.log10(variables.modal_min), np.log10(variables.modal_max), size=n)
+        angles[:, 0] = [calculate_modal_angle(m) for m in modals]
+    else:
+        angles[:, 0] = calculate_modal_angle(features.modal)
+
+    angles[:, 1] = SECTOR_ANGLES[features.sector]
+    angles[:, 2] = LOCATION_ANGLES[features.location_tier]
+    angles[:, 3] = calculate_tahun_angle(features.year_offset)
+
+    markets = features.market if variables.target_market else pick(MARKET_CATEGORIES)
+    angles[:, 4] = MARKET_ANGLES[markets]
+
+    competitors = features.competition if variables.competitors else pick(COMPETITION_CATEGORIES)
+    angles[:, 5] = COMPETITION_ANGLES[competitors]
+
+    if variables.team_size_min and variables.team_size_max and variables.team_size_max > variables.team_size_min:
+        sizes = rng.integers(variables.team_size_min, variables.team_size_max + 1, size=n)
+        teams = [team_class(int(size)) for size in sizes]
+    elif variables.team_size:
+        teams = features.team
+    else:
+        teams = pick(TEAM_CATEGORIES)
+    angles[:, 6] = TEAM_ANGLES[teams]
+
+    models = features.business_model if variables.business_model else pick(BUSINESS_MODEL_CATEGORIES)
+    angles[:, 7] = BUSINESS_MODEL_ANGLES[models]
+
+    return angles
+
+
+def uncertain_fields(variables: ExtractedVariables) -> List[str]:
+    fields = []
+    if variables.modal_min and variables.modal_max and variables.modal_max > variables.modal_min:
+        fields.append("modal")
+    for name in ("target_market", "competitors", "business_model"):
+        if not getattr(variables, name):
+            fields.append(name)
+    if not variables.team_size or (
+        variables.team_size_min and variables.team_size_max and variables.team_size_max > variables.team_size_min
+    ):
+        fields.append("team_size")
+    return fields
+
+
+def run_ensemble_simulation(variables: ExtractedVariables, seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Sample up to `ensemble_samples` input sets in chunks until the sample target or
+    `ensemble_latency_budget_ms` is reached, and summarise the probability distribution.
+    """
+    settings = get_settings()
+    if seed is None:
+        # Stable across processes, so cached and recomputed ensembles agree
+        seed = int(hashlib.sha256(variables.model_dump_json().encode("utf-8")).hexdigest()[:8], 16)
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    deadline = start + settings.ensemble_latency_budget_ms / 1000
+
+    results = []
+    sampled = 0
+    while sampled < settings.ensemble_samples:
+        chunk = min(settings.ensemble_chunk_size, settings.ensemble_samples - sampled)
+        results.append(batched_success_probabilities(_sample_angles(variables, chunk, rng)))
+        sampled += chunk
+        if time.perf_counter() >= deadline:
+            break
+
+    probabilities = np.concatenate(results)
+    histogram, _ = np.histogram(probabilities, bins=20, range=(0.0, 1.0))
+    return {
+        "mean": round(float(probabilities.mean()), 4),
+        "std": round(float(probabilities.std()), 4),
+        "percentiles": {
+            f"p{q}": round(float(v), 4) for q, v in zip(PERCENTILES, np.percentile(probabilities, PERCENTILES))
+        },
+        "histogram": histogram.tolist(),
+        "samples": int(probabilities.size),
+        "uncertain_fields": uncertain_fields(variables),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
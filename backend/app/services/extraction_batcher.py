@@ -0,0 +1,114 @@
+"""
+Micro-batched LLM Extraction
+Descriptions arriving within LLM_BATCH_WINDOW_MS of each other (per provider, up
+to LLM_BATCH_MAX_SIZE) share one provider call, so the long extraction prompt
+is sent once per batch instead of once per request. The first caller of a
+batch collects and sends it; the others wait for their slice of the result.
+Items the batch call could not produce, and waiters whose own deadline
+arrives before the batch call returns, are extracted individually.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+from app.config import get_settings
+from app.services.admission import llm_slot
+from app.services.deadline import time_left
+from app.services.llm_client import extract_batch_with_llm, extract_with_llm
+
+
+def llm_batching_enabled() -> bool:
+    return get_settings().llm_batch_window_ms > 0
+
+
+class _Pending:
+    __slots__ = ("description", "done", "result", "error")
+
+    def __init__(self, description: str):
+        self.description = description
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class _Batch:
+    def __init__(self):
+        self.entries: List[_Pending] = []
+        self.full = threading.Event()
+
+
+class ExtractionBatcher:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open: Dict[str, _Batch] = {}  # Provider → batch still accepting descriptions
+        self.batches = 0    # Batch calls made
+        self.batched = 0    # Descriptions extracted by a batch call
+        self.fallbacks = 0  # Descriptions extracted individually after joining a batch
+
+    def extract(self, description: str, provider: str) -> Optional[Dict[str, Any]]:
+        """Same contract as extract_with_llm(description, provider); may raise OverloadedError"""
+        settings = get_settings()
+        entry = _Pending(description)
+        with self._lock:
+            batch = self._open.get(provider)
+            leader = batch is None
+            if leader:
+                batch = self._open[provider] = _Batch()
+            batch.entries.append(entry)
+            if len(batch.entries) >= settings.llm_batch_max_size:
+                # Close it now so later arrivals start the next batch
+                del self._open[provider]
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(settings.llm_batch_window_ms / 1000)
+            with self._lock:
+                if self._open.get(provider) is batch:
+                    del self._open[provider]
+            self._send(batch.entries, provider)
+        elif not entry.done.wait(time_left(settings.llm_batch_window_ms / 1000 + settings.llm_timeout_seconds)):
+            # The batch call is stuck past our own budget: extract individually instead
+            with self._lock:
+                self.fallbacks += 1
+            with llm_slot(provider):
+                return extract_with_llm(description, provider=provider)
+
+        if entry.error is not None:
+            raise entry.error
+        if entry.result is None:
+            with llm_slot(provider):
+                return extract_with_llm(description, provider=provider)
+        return entry.result
+
+    def _send(self, entries: List[_Pending], provider: str):
+        """One provider call for the whole batch; every entry is released afterwards"""
+        try:
+            if len(entries) > 1:
+                with llm_slot(provider):
+                    results = extract_batch_with_llm([entry.description for entry in entries], provider)
+                results = results or [None] * len(entries)
+                with self._lock:
+                    self.batches += 1
+                    self.batched += sum(result is not None for result in results)
+                    self.fallbacks += sum(result is None for result in results)
+                for entry, result in zip(entries, results):
+                    entry.result = result
+        except Exception as e:
+            # Rejected by admission control: every member fails the way a single call would
+            for entry in entries:
+                entry.error = e
+        finally:
+            for entry in entries:
+                entry.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "batched": self.batched,
+                "fallbacks": self.fallbacks,
+                "open": sum(len(batch.entries) for batch in self._open.values()),
+            }
+
+
+# Shared by every extraction in this process
+extraction_batcher = ExtractionBatcher()
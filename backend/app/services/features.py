@@ -0,0 +1,157 @@
+"""
+Factor Encoding
+ExtractedVariables → FeatureVector: every string check (sector lists, city tiers,
+market / competition / business-model keywords) runs once per distinct input, and
+the simulator and risk engine only compare small integer codes. A FeatureVector
+is a plain tuple of numbers, so np.array(list_of_vectors) is a batch matrix.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from app.schemas import ExtractedVariables
+
+BASE_YEAR = 2025  # year_offset = tahun - BASE_YEAR
+
+SECTORS = (
+    "Teknologi", "F&B", "Retail", "Properti", "Kesehatan", "Pendidikan",
+    "Manufaktur", "Jasa", "Pertanian", "Finansial", "Lainnya",
+)
+SECTOR_CODES = {name: code for code, name in enumerate(SECTORS)}
+
+# Location tiers; Jakarta is split out because the risk engine treats it separately
+LOCATION_TIERS = ("jakarta", "tier1", "tier2", "other")
+TIER1_CITIES = ("surabaya", "bandung")
+TIER2_CITIES = ("medan", "semarang", "makassar", "bali")
+JAKARTA = LOCATION_TIERS.index("jakarta")
+
+MARKET_CLASSES = ("unknown", "enterprise", "mass", "niche", "other")
+COMPETITION_CLASSES = ("unknown", "high", "low", "moderate")
+TEAM_CLASSES = ("unknown", "optimal", "small", "large")
+BUSINESS_MODEL_CLASSES = ("unknown", "platform", "transactional", "asset_heavy", "ad_based", "other")
+
+HIGH_COMPETITION_KEYWORDS = ("gojek", "grab", "tokopedia", "shopee", "bukalapak", "unicorn",
+                             "banyak", "ramai", "ketat", "saturated", "crowded")
+LOW_COMPETITION_KEYWORDS = ("belum ada", "sedikit", "pioneer", "first mover", "blue ocean", "monopoli")
+
+
+class FeatureVector(NamedTuple):
+    """Encoded ExtractedVariables; class fields index the *_CLASSES / SECTORS tuples"""
+    modal: float
+    sector: int
+    location_tier: int
+    year_offset: int
+    market: int
+    competition: int
+    team_size: int  # Head count, 0 when unknown
+    team: int
+    business_model: int
+
+
+def sector_codes(*names: str) -> frozenset:
+    return frozenset(SECTOR_CODES[name] for name in names)
+
+
+def _stated(value: Optional[str]) -> Optional[str]:
+    """Lowercased text, or None for missing / "Tidak disebutkan" values"""
+    if not value or value == "Tidak disebutkan":
+        return None
+    return str(value).lower()
+
+
+def location_tier(lokasi: str) -> int:
+    lokasi_lower = lokasi.lower()
+    if "jakarta" in lokasi_lower:
+        return JAKARTA
+    if any(city in lokasi_lower for city in TIER1_CITIES):
+        return LOCATION_TIERS.index("tier1")
+    if any(city in lokasi_lower for city in TIER2_CITIES):
+        return LOCATION_TIERS.index("tier2")
+    return LOCATION_TIERS.index("other")
+
+
+def market_class(target_market: Optional[str]) -> int:
+    text = _stated(target_market)
+    if text is None:
+        name = "unknown"
+    elif any(kw in text for kw in ["enterprise", "b2b", "korporat", "bumn"]):
+        name = "enterprise"
+    elif any(kw in text for kw in ["b2c", "konsumen", "umkm", "retail"]):
+        name = "mass"
+    elif any(kw in text for kw in ["niche", "spesialis", "premium"]):
+        name = "niche"
+    else:
+        name = "other"
+    return MARKET_CLASSES.index(name)
+
+
+def competition_class(competitors: Optional[str]) -> int:
+    text = _stated(competitors)
+    if text is None:
+        return COMPETITION_CLASSES.index("unknown")
+    high_count = sum(1 for kw in HIGH_COMPETITION_KEYWORDS if kw in text)
+    low_count = sum(1 for kw in LOW_COMPETITION_KEYWORDS if kw in text)
+    if high_count > low_count:
+        return COMPETITION_CLASSES.index("high")
+    if low_count > high_count:
+        return COMPETITION_CLASSES.index("low")
+    return COMPETITION_CLASSES.index("moderate")
+
+
+def team_class(team_size: Optional[int]) -> int:
+    # Optimal team: 20-100 people; smaller = execution risk, larger = coordination risk
+    if not team_size:
+        name = "unknown"
+    elif 20 <= abs(team_size) <= 100:
+        name = "optimal"
+    elif abs(team_size) < 20:
+        name = "small"
+    else:
+        name = "large"
+    return TEAM_CLASSES.index(name)
+
+
+def business_model_class(business_model: Optional[str]) -> int:
+    text = _stated(business_model)
+    if text is None:
+        name = "unknown"
+    elif any(kw in text for kw in ["saas", "platform", "marketplace", "subscription"]):
+        name = "platform"
+    elif any(kw in text for kw in ["commission", "komisi", "transaction fee", "take rate"]):
+        name = "transactional"
+    elif any(kw in text for kw in ["asset", "inventory", "offline", "traditional"]):
+        name = "asset_heavy"
+    elif any(kw in text for kw in ["freemium", "iklan", "ads", "advertising"]):
+        name = "ad_based"
+    else:
+        name = "other"
+    return BUSINESS_MODEL_CLASSES.index(name)
+
+
+@lru_cache(maxsize=4096)
+def _encode(
+    modal: float, sektor: str, lokasi: str, tahun: int, target_market: Optional[str],
+    competitors: Optional[str], team_size: Optional[int], business_model: Optional[str],
+) -> FeatureVector:
+    return FeatureVector(
+        modal=modal,
+        # Unknown sector names score exactly like "Lainnya" everywhere
+        sector=SECTOR_CODES.get(sektor, SECTOR_CODES["Lainnya"]),
+        location_tier=location_tier(lokasi),
+        year_offset=tahun - BASE_YEAR,
+        market=market_class(target_market),
+        competition=competition_class(competitors),
+        team_size=abs(team_size or 0),
+        team=team_class(team_size),
+        business_model=business_model_class(business_model),
+    )
+
+
+def encode_features(variables: ExtractedVariables) -> FeatureVector:
+    """
+    Memoized on the scoring fields, so the simulation and every risk-engine stage
+    of one request share a single encoding.
+    """
+    return _encode(
+        variables.modal, variables.sektor, variables.lokasi, variables.tahun, variables.target_market,
+        variables.competitors, variables.team_size, variables.business_model,
+    )
@@ -0,0 +1,100 @@
+"""
+Conditional HTTP Caching for /api/analyze
+Responses are content-addressed: the ETag is a hash of the normalized request,
+the model versions and the simulator configuration, so it is known before the
+pipeline runs and a matching If-None-Match is answered without any work.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from app.schemas import AnalyzeRequest, AnalyzeResponse
+from app.services.pipeline import response_exclude, run_analysis
+from app.services.coalescer import coalesce_key
+from app.services.deadline import Deadline
+from app.services.llm_client import GEMINI_MODEL_NAME
+from app.services.local_extractor import local_extractor_id
+from app.services.simulator_backends import simulator_config
+from app.services.result_cache import cached_call, make_key
+from app.config import get_settings
+
+# Bump when the AnalyzeResponse shape or pipeline semantics change,
+# so clients and proxies stop revalidating against old representations
+RESPONSE_VERSION = 6
+
+# quantum_metadata.backend entries describing one run rather than the result
+PER_RUN_BACKEND_FIELDS = {"elapsed_ms", "load"}
+
+
+def response_key_parts(request: AnalyzeRequest) -> Dict[str, Any]:
+    """Everything that determines an /api/analyze response"""
+    settings = get_settings()
+    return {
+        "version": RESPONSE_VERSION,
+        "request": list(coalesce_key(request)),
+        "models": {
+            "llm": settings.use_llm_extraction,
+            "groq": settings.groq_model if settings.groq_api_key else None,
+            "gemini": GEMINI_MODEL_NAME if settings.gemini_api_key else None,
+            "local": local_extractor_id() if request.model_provider == "local" else None,
+        },
+        "simulator": simulator_config(),
+        "ensemble": {
+            "samples": settings.ensemble_samples,
+            "chunk_size": settings.ensemble_chunk_size,
+            "latency_budget_ms": settings.ensemble_latency_budget_ms,
+        },
+    }
+
+
+def response_etag(request: AnalyzeRequest) -> str:
+    return f'"{make_key(response_key_parts(request))}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak, per RFC 9110 §13.1.2)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={get_settings().analyze_cache_max_age}",
+    }
+
+
+def stored_response(response: AnalyzeResponse) -> AnalyzeResponse:
+    """
+    The response as later requests are served it from the cache: without the
+    pipeline_trace and simulator timings of the run that computed it.
+    """
+    metadata = dict(response.quantum_metadata)
+    if "backend" in metadata:
+        metadata["backend"] = {
+            key: value for key, value in metadata["backend"].items() if key not in PER_RUN_BACKEND_FIELDS
+        }
+    return response.model_copy(update={"pipeline_trace": None, "quantum_metadata": metadata})
+
+
+def render_analysis(request: AnalyzeRequest, deadline: Optional[Deadline] = None) -> Tuple[str, bool]:
+    """
+    Serialized response for the request, served from the shared cache when stored.
+    Returns (body, degraded); degraded responses (including a failed LLM summary)
+    are never stored or given the ETag. The request that ran the pipeline gets its
+    own pipeline_trace; the stored copy has none.
+    """
+    fresh = []
+    degraded = []
+
+    def compute() -> Optional[str]:
+        response = run_analysis(request, deadline)
+        exclude = response_exclude(request)
+        fresh.append(response.model_dump_json(exclude=exclude))
+        if response.degraded_stages:
+            degraded.append(True)
+            return None
+        return stored_response(response).model_dump_json(exclude=exclude)
+
+    body = cached_call("response", response_key_parts(request), compute)
+    return (fresh[0], bool(degraded)) if fresh else (body, False)
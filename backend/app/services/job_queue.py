@@ -0,0 +1,380 @@
+"""
+Asynchronous Analysis Jobs
+Bounded priority queue + in-process worker pool for long-running analyses.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set
+from app.schemas import AnalyzeRequest, JobRequest
+from app.services.admission import OverloadedError
+from app.services.pipeline import response_exclude, run_analysis
+from app.services.structured_log import get_logger, request_id_var
+from app.config import get_settings
+
+log = get_logger("jobs")
+
+
+class QueueFullError(Exception):
+    """Raised when the queue already holds the configured maximum of pending jobs"""
+
+
+class JobStore:
+    """
+    Storage interface for jobs.
+
+    A job is a plain dict: job_id, status, priority, request (JSON string),
+    result (JSON string), error, created_at, finished_at.
+    Implementations must make claim_next() atomic.
+    """
+
+    def add(self, job: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """Mark the highest-priority, oldest queued job as running and return it"""
+        raise NotImplementedError
+
+    def update(self, job_id: str, **fields) -> None:
+        raise NotImplementedError
+
+    def renew_leases(self, job_ids: List[str]) -> None:
+        """Extend the lease on running jobs this process still owns (shared stores only)"""
+
+    def pending_count(self) -> int:
+        raise NotImplementedError
+
+    def purge_finished_before(self, cutoff: float) -> int:
+        raise NotImplementedError
+
+
+class InMemoryJobStore(JobStore):
+    """Default store, lives and dies with the worker process"""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, job):
+        with self._lock:
+            self._jobs[job["job_id"]] = dict(job)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def claim_next(self):
+        with self._lock:
+            queued = [j for j in self._jobs.values() if j["status"] == "queued"]
+            if not queued:
+                return None
+            job = min(queued, key=lambda j: (-j["priority"], j["created_at"]))
+            job["status"] = "running"
+            return dict(job)
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def pending_count(self):
+        with self._lock:
+            return sum(1 for j in self._jobs.values() if j["status"] == "queued")
+
+    def purge_finished_before(self, cutoff):
+        with self._lock:
+            expired = [
+                job_id for job_id, j in self._jobs.items()
+                if j.get("finished_at") is not None and j["finished_at"] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+            return len(expired)
+
+
+class SqliteJobStore(JobStore):
+    """
+    Local SQLite-backed store, shareable by several worker processes.
+    Survives restarts: a running job is leased to the process that claimed it, and
+    once that process stops renewing the lease (crash, restart) the job is claimed
+    again. Jobs another live process is still running are left alone.
+    """
+
+    COLUMNS = ["job_id", "status", "priority", "request", "result", "error", "created_at", "finished_at"]
+
+    def __init__(self, path: str, lease_seconds: float):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self.lease_seconds = lease_seconds
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT UNIQUE NOT NULL,
+                    status TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    request TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    finished_at REAL,
+                    owner TEXT,
+                    lease_until REAL
+                )"""
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "lease_until" not in columns:
+                # Store created before leases: running rows get one lease to finish in
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN lease_until REAL")
+                self._conn.execute(
+                    "UPDATE jobs SET lease_until = ? WHERE status = 'running'", (time.time() + lease_seconds,)
+                )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, seq)"
+            )
+
+    def _row_to_job(self, row) -> Dict[str, Any]:
+        return dict(zip(self.COLUMNS, row))
+
+    def add(self, job):
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO jobs ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                [job.get(col) for col in self.COLUMNS]
+            )
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim_next(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                # Running jobs whose owner stopped renewing the lease are up for grabs again
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', owner = NULL "
+                    "WHERE status = 'running' AND (lease_until IS NULL OR lease_until < ?)", (now,)
+                )
+                row = self._conn.execute(
+                    f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE status = 'queued' "
+                    "ORDER BY priority DESC, seq ASC LIMIT 1"
+                ).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', owner = ?, lease_until = ? WHERE job_id = ?",
+                        (self.owner, now + self.lease_seconds, row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if not row:
+            return None
+        job = self._row_to_job(row)
+        job["status"] = "running"
+        return job
+
+    def update(self, job_id, **fields):
+        assignments = ', '.join(f"{col} = ?" for col in fields if col in self.COLUMNS)
+        values = [v for col, v in fields.items() if col in self.COLUMNS]
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", [*values, job_id])
+
+    def renew_leases(self, job_ids):
+        if not job_ids:
+            return
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET lease_until = ? WHERE status = 'running' AND owner = ? "
+                f"AND job_id IN ({', '.join('?' * len(job_ids))})",
+                [time.time() + self.lease_seconds, self.owner, *job_ids]
+            )
+
+    def pending_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+
+    def purge_finished_before(self, cutoff):
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (cutoff,)
+            )
+            return cursor.rowcount
+
+
+class JobQueue:
+    """Bounded priority queue drained by a pool of daemon worker threads"""
+
+    def __init__(self, store: JobStore, workers: int, max_depth: int, result_ttl: float):
+        self.store = store
+        self.workers = workers
+        self.max_depth = max_depth
+        self.result_ttl = result_ttl
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        self._running: Set[str] = set()  # Job ids this process is executing (their leases are renewed)
+        self._running_lock = threading.Lock()
+
+    def submit(self, request: JobRequest) -> Dict[str, Any]:
+        """Enqueue a job or raise QueueFullError"""
+        with self._cond:
+            self._purge_expired()
+            if self.store.pending_count() >= self.max_depth:
+                raise QueueFullError(f"Job queue is full ({self.max_depth} pending)")
+
+            job = {
+                "job_id": uuid.uuid4().hex,
+                "status": "queued",
+                "priority": request.priority,
+                "request": AnalyzeRequest(**request.model_dump(exclude={"priority"})).model_dump_json(),
+                "result": None,
+                "error": None,
+                "created_at": time.time(),
+                "finished_at": None,
+            }
+            self.store.add(job)
+            self._cond.notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job, or None if unknown or its result TTL has passed"""
+        job = self.store.get(job_id)
+        if job and job["finished_at"] is not None and job["finished_at"] < time.time() - self.result_ttl:
+            return None
+        return job
+
+    def start(self):
+        self._stopping = False
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+        log.info("jobs.started", workers=self.workers, max_depth=self.max_depth)
+
+    def stop(self, timeout: float = 5.0):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.store.pending_count(),
+            "max_depth": self.max_depth,
+            "workers": self.workers if self._threads else 0,
+        }
+
+    def _purge_expired(self):
+        self.store.purge_finished_before(time.time() - self.result_ttl)
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                job = self.store.claim_next()
+                if job is None:
+                    # Timed wait also picks up jobs added by other processes sharing a SQLite store
+                    self._cond.wait(timeout=1.0)
+                    continue
+            self._execute(job)
+
+    def _heartbeat_loop(self):
+        interval = getattr(self.store, "lease_seconds", 30.0) / 3
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                self._cond.wait(timeout=interval)
+            with self._running_lock:
+                job_ids = list(self._running)
+            try:
+                self.store.renew_leases(job_ids)
+            except Exception as e:
+                log.error("jobs.heartbeat_failed", error=str(e))
+
+    def _execute(self, job: Dict[str, Any]):
+        # The job id doubles as the request id of everything logged while it runs
+        token = request_id_var.set(job["job_id"])
+        log.info("job.running", priority=job["priority"])
+        with self._running_lock:
+            self._running.add(job["job_id"])
+        try:
+            request = AnalyzeRequest.model_validate_json(job["request"])
+            while True:
+                try:
+                    # A full summary is worth the wait here; no template fallback
+                    response = run_analysis(request, shed_summary=False)
+                    break
+                except OverloadedError as e:
+                    # Interactive traffic was shed first; a queued job just waits its turn
+                    log.info("job.waiting", retry_after=e.retry_after, stage=e.stage)
+                    time.sleep(e.retry_after)
+            self.store.update(
+                job["job_id"],
+                status="done",
+                # Same field selection as the synchronous /api/analyze response
+                result=response.model_dump_json(exclude=response_exclude(request)),
+                finished_at=time.time()
+            )
+        except Exception as e:
+            log.error("job.failed", error=str(e))
+            self.store.update(job["job_id"], status="failed", error=str(e), finished_at=time.time())
+        finally:
+            with self._running_lock:
+                self._running.discard(job["job_id"])
+            request_id_var.reset(token)
+
+
+def create_job_store(kind: str, path: str, lease_seconds: float = 60.0) -> JobStore:
+    if kind == "sqlite":
+        return SqliteJobStore(path, lease_seconds)
+    return InMemoryJobStore()
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    """Process-wide job queue built from settings"""
+    settings = get_settings()
+    return JobQueue(
+        store=create_job_store(settings.job_store, settings.job_store_path, settings.job_lease_seconds),
+        workers=settings.job_workers,
+        max_depth=settings.job_queue_max_depth,
+        result_ttl=settings.job_result_ttl_seconds,
+    )
+
+
+def job_to_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a stored job into JobStatus fields"""
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "priority": job["priority"],
+        "created_at": job["created_at"],
+        "finished_at": job["finished_at"],
+        "result": json.loads(job["result"]) if job["result"] else None,
+        "error": job["error"],
+    }
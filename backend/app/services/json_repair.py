@@ -0,0 +1,98 @@
+"""
+Truncated JSON Recovery
+LLM output cut off at the token limit (or by a flaky provider) is still mostly
+usable: cut it back to the last complete value, close the open arrays/objects,
+and keep what parses. Fields that did not survive are reported as missing so
+the caller can ask for just those instead of repeating the whole generation.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Type
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _strip_fences(text: str) -> str:
+    """Drop a ```json ... ``` wrapper and anything before the first object"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    start = text.find("{")
+    return text[start:] if start >= 0 else text
+
+
+def _cut_points(text: str) -> List[tuple]:
+    """
+    (end index, open containers) for every prefix that ends on a complete value:
+    just after an opening bracket and just before each separating comma. Partial
+    strings / numbers / literals are never kept.
+    """
+    points = []
+    stack: List[str] = []
+    in_string = escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(char)
+            points.append((i + 1, tuple(stack)))
+        elif char in "]}":
+            if stack:
+                stack.pop()
+        elif char == "," and stack:
+            points.append((i, tuple(stack)))
+
+    # The text may end right after a complete value ("..."], }, true/false/null)
+    tail = text.rstrip()
+    if stack and not in_string and tail and tail[-1] in '"]}el':
+        points.append((len(tail), tuple(stack)))
+    return points
+
+
+def repair_json(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse LLM output as a JSON object, recovering as many complete fields as
+    possible from truncated output. None when not even an object prefix survives.
+    """
+    text = _strip_fences(text or "")
+    try:
+        data = json.loads(text)
+        return data if isinstance(data, dict) else None
+    except json.JSONDecodeError:
+        pass
+
+    # Longest prefix first: the first one that parses keeps the most fields
+    for end, stack in reversed(_cut_points(text)):
+        candidate = text[:end] + "".join(_CLOSERS[opener] for opener in reversed(stack))
+        try:
+            data = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def invalid_fields(data: Dict[str, Any], model: Type[BaseModel], required: Iterable[str]) -> List[str]:
+    """Required fields of `model` that are absent, empty, or fail the field's type"""
+    missing = []
+    for name in required:
+        value = data.get(name)
+        if value in (None, "", []):
+            missing.append(name)
+            continue
+        try:
+            TypeAdapter(model.model_fields[name].annotation).validate_python(value)
+        except ValidationError:
+            missing.append(name)
+    return missing
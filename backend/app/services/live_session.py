@@ -0,0 +1,120 @@
+"""
+Incremental Re-analysis for Live Editing
+A session remembers the inputs and outputs of every pipeline stage, so an edit
+only reruns the stages whose inputs actually changed.
+"""
+
+import time
+from typing import Any, Callable, Dict, Tuple
+from app.schemas import AnalyzeRequest, AnalyzeResponse
+from app.services.pipeline import (
+    SUMMARY_FIELDS,
+    build_response,
+    ensemble_stage,
+    extract_stage,
+    required_stages,
+    response_exclude,
+    simulate_stage,
+    summarize_analysis,
+    summary_enabled,
+)
+from app.services.coalescer import normalize_description
+from app.services.features import encode_features
+from app.services.simulator_backends import simulation_cache_key
+from app.services.risk_engine import generate_risk_analysis
+
+
+class LiveAnalysisSession:
+    """
+    Per-connection stage memo.
+
+    Each stage is keyed by its own inputs: simulation and the risk engine only by
+    the encoded factors, the summary only by the fields the LLM sees, etc. Downstream
+    inputs include the revision of upstream outputs, so a recomputed simulation
+    invalidates the risk analysis and summary built on it.
+    """
+
+    def __init__(self):
+        self._inputs: Dict[str, Any] = {}
+        self._outputs: Dict[str, Any] = {}
+        self._revisions: Dict[str, int] = {}
+
+    def _stage(self, name: str, inputs: Any, compute: Callable[[], Any], stages: Dict[str, str]) -> Any:
+        if name in self._outputs and self._inputs[name] == inputs:
+            stages[name] = "reused"
+            return self._outputs[name]
+
+        output = compute()
+        stages[name] = "computed"
+        # None (e.g. a failed LLM summary) is not remembered, so the next edit retries
+        if output is not None:
+            self._inputs[name] = inputs
+            self._outputs[name] = output
+            self._revisions[name] = self._revisions.get(name, 0) + 1
+        return output
+
+    def analyze(self, request: AnalyzeRequest) -> Tuple[AnalyzeResponse, Dict[str, str]]:
+        """Run the pipeline for the latest text; returns (response, stage -> computed | reused | skipped)"""
+        stages: Dict[str, str] = {}
+        needed = required_stages(request)
+
+        variables = self._stage(
+            "extract",
+            (normalize_description(request.description), request.model_provider),
+            lambda: extract_stage(request),
+            stages,
+        )
+
+        quantum_result = self._stage(
+            "simulate",
+            simulation_cache_key(variables, request.extra_factors, request.simulator_backend, request.precision),
+            lambda: simulate_stage(variables, request.extra_factors, request.simulator_backend, request.precision),
+            stages,
+        )
+
+        success_distribution = None
+        if request.ensemble and "ensemble" in needed:
+            success_distribution = self._stage(
+                "ensemble", variables.model_dump(), lambda: ensemble_stage(variables), stages
+            )
+        else:
+            stages["ensemble"] = "skipped"
+
+        analysis = self._stage(
+            "risk",
+            (encode_features(variables), self._revisions["simulate"]),
+            lambda: generate_risk_analysis(variables, quantum_result),
+            stages,
+        )
+
+        quantum_summary = None
+        if summary_enabled() and "summary" in needed:
+            quantum_summary = self._stage(
+                "summary",
+                (
+                    variables.model_dump(include=SUMMARY_FIELDS),
+                    self._revisions["simulate"],
+                    analysis["risk_categories"].model_dump(),
+                    request.model_provider,
+                    request.summary_tier,
+                ),
+                lambda: summarize_analysis(
+                    variables, quantum_result, analysis["risk_categories"], request.model_provider, request.summary_tier
+                ),
+                stages,
+            )
+        else:
+            stages["summary"] = "skipped"
+
+        return build_response(variables, quantum_result, analysis, quantum_summary, success_distribution), stages
+
+    def analyze_timed(self, request: AnalyzeRequest) -> Dict[str, Any]:
+        """analyze() packaged as a WebSocket message"""
+        start = time.perf_counter()
+        response, stages = self.analyze(request)
+        return {
+            "type": "result",
+            "stages": stages,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+            "result": response.model_dump(mode="json", exclude=response_exclude(request)),
+        }
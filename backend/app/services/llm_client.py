@@ -5,23 +5,85 @@ Enhanced version with sequential flow: Extract → Qiskit → Summarize
 """
 
 import json
-from typing import Optional, Dict, Any, List
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
 from app.config import get_settings
+from app.schemas import ExtractedVariables, QuantumSummary
+from app.services.deadline import time_left
+from app.services.json_repair import invalid_fields, repair_json
+from app.services.structured_log import get_logger
+
+# Force use gemini-2.5-flash-lite (2.5-flash thinking model truncates JSON)
+GEMINI_MODEL_NAME = "gemini-2.5-flash-lite"
+
+log = get_logger("llm")
+
+
+# Provider SDKs are imported on first use: they are slow to import and
+# a worker usually only ever talks to one of them.
+@lru_cache(maxsize=1)
+def _load_groq():
+    """Return the Groq client class, or None if the SDK is not installed"""
+    try:
+        from groq import Groq
+    except ImportError:
+        return None
+    return Groq
+
+
+@lru_cache(maxsize=1)
+def _load_genai():
+    """Return the google.generativeai module, or None if the SDK is not installed"""
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        return None
+    return genai
+
+
+@lru_cache(maxsize=4)
+def _get_groq_client(api_key: str):
+    """One Groq client per API key, so its HTTP connection pool is reused across calls"""
+    return _load_groq()(api_key=api_key)
+
+
+@lru_cache(maxsize=4)
+def _get_genai(api_key: str):
+    """google.generativeai configured with the given API key"""
+    genai = _load_genai()
+    genai.configure(api_key=api_key)
+    return genai
+
+
+def warmup_providers() -> Dict[str, bool]:
+    """
+    Import the configured provider SDKs and open their connections ahead of the
+    first request. Returns which providers are ready; never raises.
+    """
+    settings = get_settings()
+    ready = {}
+
+    if settings.groq_api_key and _load_groq() is not None:
+        try:
+            _get_groq_client(settings.groq_api_key).models.list()
+            ready["groq"] = True
+        except Exception as e:
+            log.warning("warmup.failed", provider="groq", error=str(e))
+            ready["groq"] = False
+
+    if settings.gemini_api_key and _load_genai() is not None:
+        try:
+            _get_genai(settings.gemini_api_key).get_model(f"models/{GEMINI_MODEL_NAME}")
+            ready["gemini"] = True
+        except Exception as e:
+            log.warning("warmup.failed", provider="gemini", error=str(e))
+            ready["gemini"] = False
+
+    return ready
 
-# Provider imports - lazy loaded to avoid errors if not installed
-try:
-    from groq import Groq
-    GROQ_AVAILABLE = True
-except ImportError:
-    GROQ_AVAILABLE = False
-    Groq = None
-
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
-    genai = None
 
 # ============== EXTRACTION PROMPT ==============
 EXTRACTION_PROMPT = """Kamu adalah asisten AI senior yang ahli dalam menganalisis proposal dan deskripsi bisnis Indonesia.
@@ -42,17 +104,36 @@ FIELD OPSIONAL (isi jika disebutkan atau bisa disimpulkan):
 9. "team_size": estimasi ukuran tim yang dibutuhkan
 10. "business_model": model bisnis (B2B, B2C, SaaS, marketplace, dll)
 
+RENTANG KETIDAKPASTIAN (isi jika "modal" atau "team_size" hanya perkiraan, selain itu null):
+11. "modal_min", "modal_max": rentang modal yang masuk akal dalam Rupiah (angka)
+12. "team_size_min", "team_size_max": rentang ukuran tim yang masuk akal (angka)
+
 PENTING: Jawab HANYA dengan JSON valid. Untuk field opsional yang tidak ada info, gunakan null.
 
 Teks untuk dianalisis:
 """
 
-# ============== QUANTUM SUMMARY PROMPT ==============
-QUANTUM_SUMMARY_PROMPT = """Kamu adalah Dr. Amelia Chen, seorang Quantum Risk Analyst dengan PhD di Quantum Computing dari MIT dan 15 tahun pengalaman sebagai Partner di McKinsey untuk evaluasi investasi high-tech di Asia Tenggara.
+EXTRACTION_SYSTEM_INSTRUCTION = "Kamu adalah asisten ekstraksi data bisnis profesional. Selalu jawab dalam format JSON valid."
 
-MISI: Berikan analisis risiko bisnis ULTRA-MENDALAM berdasarkan simulasi quantum computing, dengan fokus pada konteks pasar Indonesia dan regional SEA.
+# Core fields the simulator needs; truncated output missing one of these gets a continuation call
+EXTRACTION_REQUIRED_FIELDS = ["modal", "sektor", "lokasi", "tahun"]
 
-═══════════════════════════════════════════════════════════════
+# Appended to the original prompt when output was truncated or left required fields empty:
+# regenerate only the lost fields
+CONTINUATION_INSTRUCTION = """
+
+PENTING: Jawaban JSON sebelumnya terpotong atau tidak lengkap. Jawab HANYA dengan objek JSON berisi field berikut (field lain jangan diulang): {fields}"""
+
+# Several descriptions in one call: same instructions, one result object per text
+EXTRACTION_BATCH_PROMPT = EXTRACTION_PROMPT.rsplit("Teks untuk dianalisis:", 1)[0] + """MODE BATCH: ada {count} teks di bawah, masing-masing diawali nomor [n]. Ekstrak SETIAP teks secara terpisah.
+Jawab dengan objek JSON {{"results": [...]}} berisi tepat {count} objek, urut sesuai nomor, masing-masing dengan field "id" (nomor teks) ditambah semua field di atas.
+
+Teks-teks untuk dianalisis:
+"""
+
+# ============== QUANTUM SUMMARY PROMPT ==============
+# Shared by every summary tier
+QUANTUM_SUMMARY_DATA = """═══════════════════════════════════════════════════════════════
 📊 DATA BISNIS YANG DIANALISIS:
 ═══════════════════════════════════════════════════════════════
 - Sektor: {sektor}
@@ -66,7 +147,7 @@ MISI: Berikan analisis risiko bisnis ULTRA-MENDALAM berdasarkan simulasi quantum
 ═══════════════════════════════════════════════════════════════
 ⚛️ HASIL SIMULASI QUANTUM COMPUTING:
 ═══════════════════════════════════════════════════════════════
-- **Success Probability**: {success_probability:.1%} (dari 1024-shot Monte Carlo pada Qiskit Aer)
+- **Success Probability**: {success_probability:.1%} (dari {shots}-shot Monte Carlo pada Qiskit Aer)
 - **Quantum State Fidelity**: {shots} iterasi
 - **Circuit Topology**: {circuit_depth} layers, {n_qubits}-qubit entangled state
 - **Parameter Encoding** (Rotation Angles pada Pauli-Y Gates):
@@ -86,7 +167,13 @@ MISI: Berikan analisis risiko bisnis ULTRA-MENDALAM berdasarkan simulasi quantum
 - **MEDIUM RISK** (0.4 < P ≤ 0.7): {medium_risks}
 - **LOW RISK** (P ≤ 0.4): {low_risks}
 
-═══════════════════════════════════════════════════════════════
+"""
+
+QUANTUM_SUMMARY_PROMPT = """Kamu adalah Dr. Amelia Chen, seorang Quantum Risk Analyst dengan PhD di Quantum Computing dari MIT dan 15 tahun pengalaman sebagai Partner di McKinsey untuk evaluasi investasi high-tech di Asia Tenggara.
+
+MISI: Berikan analisis risiko bisnis ULTRA-MENDALAM berdasarkan simulasi quantum computing, dengan fokus pada konteks pasar Indonesia dan regional SEA.
+
+""" + QUANTUM_SUMMARY_DATA + """═══════════════════════════════════════════════════════════════
 🎯 INSTRUKSI ANALISIS (STEP-BY-STEP):
 ═══════════════════════════════════════════════════════════════
 
@@ -149,6 +236,51 @@ MISI: Berikan analisis risiko bisnis ULTRA-MENDALAM berdasarkan simulasi quantum
 - Tone: Authoritative namun accessible (seperti Harvard Business Review)
 """
 
+QUANTUM_SUMMARY_BRIEF_PROMPT = """Kamu adalah Quantum Risk Analyst untuk pasar Indonesia. Berikan ringkasan SINGKAT berdasarkan simulasi quantum berikut.
+
+""" + QUANTUM_SUMMARY_DATA + """OUTPUT FORMAT (JSON):
+{{
+  "executive_summary": "2-3 kalimat: verdict GO/NO-GO/CONDITIONAL, alasan utama, dan probabilitas {success_probability:.1%}",
+  "action_items": ["[HIGH] Action 1", "[MEDIUM] Action 2", "[LOW] Action 3"]
+}}
+
+- HANYA output JSON valid, tanpa markdown wrapper
+- Maksimal 3 action items, masing-masing 1 kalimat spesifik untuk bisnis ini
+"""
+
+QUANTUM_SUMMARY_STANDARD_PROMPT = """Kamu adalah Quantum Risk Analyst untuk pasar Indonesia dan SEA. Berikan analisis risiko yang padat berdasarkan simulasi quantum berikut.
+
+""" + QUANTUM_SUMMARY_DATA + """OUTPUT FORMAT (JSON):
+{{
+  "executive_summary": "3 kalimat: verdict GO/NO-GO/CONDITIONAL, peluang terbesar, ancaman terbesar",
+  "probability_explanation": "2-3 kalimat: kenapa probabilitas {success_probability:.1%}, qubit/rotation angle mana yang paling dominan",
+  "risk_breakdown": "**HIGH**: ... | **MEDIUM**: ... | **LOW**: ... (1-2 kalimat per kategori, dengan mitigasi)",
+  "action_items": ["[HIGH] Action 1 - Impact: X%", "[MEDIUM] Action 2 - Impact: X%", "[MEDIUM] Action 3 - Impact: X%", "[LOW] Action 4 - Impact: X%"]
+}}
+
+- HANYA output JSON valid, tanpa markdown wrapper
+- Spesifik untuk bisnis ini, sebut regulasi/kondisi Indonesia jika relevan
+"""
+
+# Prompt, output-token budget per provider and required QuantumSummary fields per tier
+SUMMARY_TIERS = {
+    "brief": {
+        "prompt": QUANTUM_SUMMARY_BRIEF_PROMPT,
+        "max_tokens": {"groq": 400, "gemini": 512},
+        "fields": ["executive_summary", "action_items"],
+    },
+    "standard": {
+        "prompt": QUANTUM_SUMMARY_STANDARD_PROMPT,
+        "max_tokens": {"groq": 900, "gemini": 1536},
+        "fields": ["executive_summary", "probability_explanation", "risk_breakdown", "action_items"],
+    },
+    "deep": {
+        "prompt": QUANTUM_SUMMARY_PROMPT,
+        "max_tokens": {"groq": 1500, "gemini": 4096},
+        "fields": ["executive_summary", "probability_explanation", "risk_breakdown", "key_insight", "action_items"],
+    },
+}
+
 
 def extract_with_llm(description: str, provider: str = None) -> Optional[Dict[str, Any]]:
     """
@@ -163,8 +295,6 @@ def extract_with_llm(description: str, provider: str = None) -> Optional[Dict[st
     # Use provided provider or fall back to config
     selected_provider = (provider or settings.llm_provider).lower()
     
-    print(f"[LLM-EXTRACT] Provider: {selected_provider.upper()}")
-    
     if selected_provider == "gemini":
         return _extract_with_gemini(description)
     else:  # Default to Groq
@@ -175,44 +305,31 @@ def _extract_with_groq(description: str) -> Optional[Dict[str, Any]]:
     """Extract using Groq API"""
     settings = get_settings()
     
-    if not GROQ_AVAILABLE:
-        print("[LLM-EXTRACT] ERROR: Groq SDK not installed")
+    if _load_groq() is None:
+        log.error("extract.unavailable", provider="groq", reason="Groq SDK not installed")
         return None
     
     if not settings.groq_api_key:
-        print("[LLM-EXTRACT] WARNING: GROQ_API_KEY not set")
+        log.warning("extract.unavailable", provider="groq", reason="GROQ_API_KEY not set")
         return None
     
     try:
-        print(f"[LLM-EXTRACT] Calling Groq ({settings.groq_model}): {description[:50]}...")
-        client = Groq(api_key=settings.groq_api_key)
+        log.info("extract.call", provider="groq", model=settings.groq_model, description=description)
+        prompt = EXTRACTION_PROMPT + description
+        content = _groq_complete(EXTRACTION_SYSTEM_INSTRUCTION, prompt, 0.1, 500)
+        log.debug("extract.response", provider="groq", content=content)
         
-        completion = client.chat.completions.create(
-            model=settings.groq_model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Kamu adalah asisten ekstraksi data bisnis profesional. Selalu jawab dalam format JSON valid."
-                },
-                {
-                    "role": "user",
-                    "content": EXTRACTION_PROMPT + description
-                }
-            ],
-            temperature=0.1,
-            max_completion_tokens=500,
-            response_format={"type": "json_object"}
+        extracted = _parse_json_response(
+            content, "groq", ExtractedVariables, EXTRACTION_REQUIRED_FIELDS,
+            lambda missing: _groq_complete(EXTRACTION_SYSTEM_INSTRUCTION, _continuation_prompt(prompt, missing), 0.1, 500)
         )
-        
-        content = completion.choices[0].message.content
-        print(f"[LLM-EXTRACT] Raw response: {content[:150]}...")
-        
-        extracted = json.loads(content)
-        print(f"[LLM-EXTRACT] SUCCESS: sektor={extracted.get('sektor')}, modal={extracted.get('modal')}")
+        if extracted is None:
+            return None
+        log.info("extract.done", provider="groq", sektor=extracted.get('sektor'), modal=extracted.get('modal'))
         return extracted
         
     except Exception as e:
-        print(f"[LLM-EXTRACT] ERROR: {e}")
+        log.error("extract.failed", provider="groq", error=str(e))
         return None
 
 
@@ -220,68 +337,112 @@ def _extract_with_gemini(description: str) -> Optional[Dict[str, Any]]:
     """Extract using Google Gemini API"""
     settings = get_settings()
     
-    if not GEMINI_AVAILABLE:
-        print("[LLM-EXTRACT] ERROR: Google Generative AI SDK not installed. Run: pip install google-generativeai")
+    if _load_genai() is None:
+        log.error("extract.unavailable", provider="gemini",
+                  reason="Google Generative AI SDK not installed. Run: pip install google-generativeai")
         return None
     
     if not settings.gemini_api_key:
-        print("[LLM-EXTRACT] WARNING: GEMINI_API_KEY not set")
+        log.warning("extract.unavailable", provider="gemini", reason="GEMINI_API_KEY not set")
         return None
     
     try:
-        # Force use gemini-2.0-flash (2.5-flash thinking model truncates JSON)
-        model_name = "gemini-2.5-flash-lite"
-        print(f"[LLM-EXTRACT] Calling Gemini ({model_name}): {description[:50]}...")
-        
-        genai.configure(api_key=settings.gemini_api_key)
-        model = genai.GenerativeModel(
-            model_name=model_name,
-            generation_config={
-                "temperature": 0.1,
-                "max_output_tokens": 1024,
-                "response_mime_type": "application/json"
-            }
-        )
-        
-        prompt = f"""Kamu adalah asisten ekstraksi data bisnis profesional. Selalu jawab dalam format JSON valid.
+        log.info("extract.call", provider="gemini", model=GEMINI_MODEL_NAME, description=description)
+        prompt = f"""{EXTRACTION_SYSTEM_INSTRUCTION}
 
 {EXTRACTION_PROMPT}{description}"""
+        content = _gemini_complete(None, prompt, 0.1, 1024)
+        log.debug("extract.response", provider="gemini", content=content)
         
-        response = model.generate_content(prompt)
-        content = response.text
-        print(f"[LLM-EXTRACT] Raw response: {content[:150]}...")
-        
-        extracted = json.loads(content)
-        print(f"[LLM-EXTRACT] SUCCESS: sektor={extracted.get('sektor')}, modal={extracted.get('modal')}")
+        extracted = _parse_json_response(
+            content, "gemini", ExtractedVariables, EXTRACTION_REQUIRED_FIELDS,
+            lambda missing: _gemini_complete(None, _continuation_prompt(prompt, missing), 0.1, 1024)
+        )
+        if extracted is None:
+            return None
+        log.info("extract.done", provider="gemini", sektor=extracted.get('sektor'), modal=extracted.get('modal'))
         return extracted
         
     except Exception as e:
-        print(f"[LLM-EXTRACT] ERROR: {e}")
+        log.error("extract.failed", provider="gemini", error=str(e))
         return None
 
 
+def extract_batch_with_llm(descriptions: List[str], provider: str) -> Optional[List[Optional[Dict[str, Any]]]]:
+    """
+    Extract several descriptions with one provider call. Returns one entry per
+    description, None where that item is missing or fails validation (the caller
+    extracts those individually); None when the call itself failed.
+    """
+    settings = get_settings()
+    prompt = EXTRACTION_BATCH_PROMPT.format(count=len(descriptions)) + "\n\n".join(
+        f"[{i}] {description}" for i, description in enumerate(descriptions, 1)
+    )
+    
+    try:
+        log.info("extract.batch_call", provider=provider, size=len(descriptions))
+        if provider == "gemini":
+            if _load_genai() is None or not settings.gemini_api_key:
+                return None
+            content = _gemini_complete(
+                None, f"{EXTRACTION_SYSTEM_INSTRUCTION}\n\n{prompt}", 0.1, min(1024 * len(descriptions), 8192)
+            )
+        else:
+            if _load_groq() is None or not settings.groq_api_key:
+                return None
+            content = _groq_complete(EXTRACTION_SYSTEM_INSTRUCTION, prompt, 0.1, 500 * len(descriptions))
+        log.debug("extract.batch_response", provider=provider, content=content)
+    except Exception as e:
+        log.error("extract.batch_failed", provider=provider, error=str(e))
+        return None
+    
+    # A truncated batch still yields its complete items
+    items = (repair_json(content) or {}).get("results")
+    if not isinstance(items, list):
+        log.error("extract.batch_unparsed", provider=provider, size=len(descriptions))
+        return None
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(descriptions)
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        index = item.pop("id", position + 1)
+        if not isinstance(index, int) or not 1 <= index <= len(descriptions):
+            continue
+        if not invalid_fields(item, ExtractedVariables, EXTRACTION_REQUIRED_FIELDS):
+            results[index - 1] = item
+    log.info("extract.batch_done", provider=provider, size=len(descriptions),
+             parsed=sum(result is not None for result in results))
+    return results
+
+
 def summarize_quantum_results(
     variables: Dict[str, Any],
     quantum_result: Dict[str, Any],
     risk_categories: Dict[str, List[str]],
-    provider: str = None
+    provider: str = None,
+    tier: str = "deep"
 ) -> Optional[Dict[str, Any]]:
     """
     Generate LLM summary of quantum simulation results.
     Multi-provider version. This is called AFTER Qiskit simulation.
     Args:
         provider: Override provider ("groq" or "gemini"). If None, uses config.
+        tier: "brief" | "standard" | "deep" (prompt, token budget and required fields)
     """
     settings = get_settings()
+    # "local" only replaces extraction; summaries still need a real LLM
+    if provider == "local":
+        provider = None
     selected_provider = (provider or settings.llm_provider).lower()
     
-    print(f"[LLM-SUMMARY] Provider: {selected_provider.upper()}")
+    spec = SUMMARY_TIERS[tier]
     
     # Build the formatted prompt first
     metadata = quantum_result.get("metadata", {})
     rotation_angles = metadata.get("rotation_angles", {})
     
-    prompt = QUANTUM_SUMMARY_PROMPT.format(
+    prompt = spec["prompt"].format(
         sektor=variables.get('sektor', 'Unknown'),
         lokasi=variables.get('lokasi', 'Indonesia'),
         modal=variables.get('modal', 0),
@@ -306,89 +467,227 @@ def summarize_quantum_results(
         low_risks=', '.join(risk_categories.get('Low', [])) or 'None'
     )
     
+    start = time.perf_counter()
     if selected_provider == "gemini":
-        return _summarize_with_gemini(prompt)
+        summary = _summarize_with_gemini(prompt, spec["fields"], spec["max_tokens"]["gemini"])
     else:
-        return _summarize_with_groq(prompt)
+        summary = _summarize_with_groq(prompt, spec["fields"], spec["max_tokens"]["groq"])
+    
+    if summary is not None:
+        missing = [field for field in spec["fields"] if not summary.get(field)]
+        if missing:
+            log.error("summary.incomplete", provider=selected_provider, tier=tier, missing=missing)
+            return None
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        summary_latency.record(tier, elapsed_ms)
+        log.info("summary.done", provider=selected_provider, tier=tier, elapsed_ms=round(elapsed_ms, 1))
+    return summary
+
+
+def _summary_system_instruction(fields: List[str]) -> str:
+    return (
+        "Kamu adalah Dr. Amelia Chen, Quantum Risk Analyst expert. "
+        f"WAJIB generate JSON dengan {len(fields)} field: {', '.join(fields)}. "
+        "TIDAK BOLEH skip field apapun. Gunakan bahasa Indonesia profesional."
+    )
 
 
-def _summarize_with_groq(prompt: str) -> Optional[Dict[str, Any]]:
+class SummaryLatency:
+    """Recent successful summary latencies per tier (this worker process)"""
+
+    def __init__(self, window: int = 500):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._counts: Counter = Counter()
+
+    def record(self, tier: str, elapsed_ms: float):
+        with self._lock:
+            self._samples[tier].append(elapsed_ms)
+            self._counts[tier] += 1
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result = {}
+            for tier, samples in self._samples.items():
+                ordered = sorted(samples)
+                result[tier] = {
+                    "count": self._counts[tier],
+                    "mean_ms": round(sum(ordered) / len(ordered), 1),
+                    "p50_ms": round(ordered[len(ordered) // 2], 1),
+                    "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+                }
+            return result
+
+
+summary_latency = SummaryLatency()
+
+
+def _summarize_with_groq(prompt: str, fields: List[str], max_tokens: int) -> Optional[Dict[str, Any]]:
     """Summarize using Groq API"""
     settings = get_settings()
     
-    if not GROQ_AVAILABLE or not settings.groq_api_key:
+    if _load_groq() is None or not settings.groq_api_key:
         return None
     
     try:
-        print(f"[LLM-SUMMARY] Calling Groq ({settings.groq_model})...")
-        client = Groq(api_key=settings.groq_api_key)
+        log.info("summary.call", provider="groq", model=settings.groq_model)
+        content = _groq_complete(_summary_system_instruction(fields), prompt, 0.3, max_tokens)
+        log.debug("summary.response", provider="groq", content=content)
         
-        completion = client.chat.completions.create(
-            model=settings.groq_model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Kamu adalah Dr. Amelia Chen, Quantum Risk Analyst expert. WAJIB generate JSON dengan 5 field: executive_summary, probability_explanation, risk_breakdown, key_insight, action_items. TIDAK BOLEH skip field apapun. Gunakan bahasa Indonesia profesional."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.3,
-            max_completion_tokens=1500,
-            response_format={"type": "json_object"}
+        summary = _parse_json_response(
+            content, "groq", QuantumSummary, fields,
+            lambda missing: _groq_complete(
+                _summary_system_instruction(missing), _continuation_prompt(prompt, missing), 0.3, max_tokens
+            ),
+            # Every field of the tier is shown; an empty one is as lost as a truncated one
+            require_complete=True
         )
-        
-        content = completion.choices[0].message.content
-        print(f"[LLM-SUMMARY] Raw response: {content[:200]}...")
-        
-        summary = json.loads(content)
-        print(f"[LLM-SUMMARY] Parsed fields: {list(summary.keys())}")
-        print(f"[LLM-SUMMARY] SUCCESS!")
+        if summary is None:
+            return None
+        log.info("summary.parsed", provider="groq", fields=list(summary.keys()))
         return summary
         
     except Exception as e:
-        print(f"[LLM-SUMMARY] ERROR: {e}")
+        log.error("summary.failed", provider="groq", error=str(e))
         return None
 
 
-def _summarize_with_gemini(prompt: str) -> Optional[Dict[str, Any]]:
+def _summarize_with_gemini(prompt: str, fields: List[str], max_tokens: int) -> Optional[Dict[str, Any]]:
     """Summarize using Google Gemini API"""
     settings = get_settings()
     
-    if not GEMINI_AVAILABLE or not settings.gemini_api_key:
-        print("[LLM-SUMMARY] ERROR: Gemini not available or API key not set")
+    if _load_genai() is None or not settings.gemini_api_key:
+        log.error("summary.unavailable", provider="gemini", reason="Gemini not available or API key not set")
         return None
     
     try:
-        # Force use gemini-2.0-flash (2.5-flash thinking model truncates JSON)
-        model_name = "gemini-2.5-flash-lite"
-        print(f"[LLM-SUMMARY] Calling Gemini ({model_name})...")
+        log.info("summary.call", provider="gemini", model=GEMINI_MODEL_NAME)
+        content = _gemini_complete(_summary_system_instruction(fields), prompt, 0.3, max_tokens)
+        log.debug("summary.response", provider="gemini", length=len(content), content=content)
         
-        genai.configure(api_key=settings.gemini_api_key)
-        model = genai.GenerativeModel(
-            model_name=model_name,
-            generation_config={
-                "temperature": 0.3,
-                "max_output_tokens": 4096,
-                "response_mime_type": "application/json"
-            },
-            system_instruction="Kamu adalah Dr. Amelia Chen, Quantum Risk Analyst expert. WAJIB generate JSON dengan 5 field: executive_summary, probability_explanation, risk_breakdown, key_insight, action_items. TIDAK BOLEH skip field apapun. Gunakan bahasa Indonesia profesional."
+        summary = _parse_json_response(
+            content, "gemini", QuantumSummary, fields,
+            lambda missing: _gemini_complete(
+                _summary_system_instruction(missing), _continuation_prompt(prompt, missing), 0.3, max_tokens
+            ),
+            # Every field of the tier is shown; an empty one is as lost as a truncated one
+            require_complete=True
         )
-        
-        response = model.generate_content(prompt)
-        content = response.text
-        print(f"[LLM-SUMMARY] Raw response length: {len(content)} chars")
-        print(f"[LLM-SUMMARY] Raw response (first 500): {content[:500]}...")
-        print(f"[LLM-SUMMARY] Raw response (last 200): ...{content[-200:]}")
-        
-        summary = json.loads(content)
-        print(f"[LLM-SUMMARY] Parsed fields: {list(summary.keys())}")
-        print(f"[LLM-SUMMARY] SUCCESS!")
+        if summary is None:
+            return None
+        log.info("summary.parsed", provider="gemini", fields=list(summary.keys()))
         return summary
         
     except Exception as e:
-        print(f"[LLM-SUMMARY] ERROR: {e}")
+        log.error("summary.failed", provider="gemini", error=str(e))
+        return None
+
+
+# ============== RAW CALLS & TRUNCATION RECOVERY ==============
+def _groq_complete(system: str, prompt: str, temperature: float, max_tokens: int) -> str:
+    """One Groq chat completion in JSON mode; returns the raw message text"""
+    settings = get_settings()
+    completion = _get_groq_client(settings.groq_api_key).chat.completions.create(
+        model=settings.groq_model,
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=temperature,
+        max_completion_tokens=max_tokens,
+        response_format={"type": "json_object"},
+        timeout=time_left(settings.llm_timeout_seconds)
+    )
+    return completion.choices[0].message.content
+
+
+def _gemini_complete(system: Optional[str], prompt: str, temperature: float, max_tokens: int) -> str:
+    """One Gemini generation in JSON mode; returns the raw response text"""
+    settings = get_settings()
+    model = _get_genai(settings.gemini_api_key).GenerativeModel(
+        model_name=GEMINI_MODEL_NAME,
+        generation_config={
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+            "response_mime_type": "application/json"
+        },
+        system_instruction=system
+    )
+    response = model.generate_content(prompt, request_options={"timeout": time_left(settings.llm_timeout_seconds)})
+    return response.text
+
+
+def _continuation_prompt(prompt: str, missing: List[str]) -> str:
+    return prompt + CONTINUATION_INSTRUCTION.format(fields=", ".join(missing))
+
+
+_recovery_lock = threading.Lock()
+_recovery_counts: Counter = Counter()
+
+
+def _count_recovery(outcome: str):
+    with _recovery_lock:
+        _recovery_counts[outcome] += 1
+
+
+def json_recovery_stats() -> Dict[str, int]:
+    """How often truncated or incomplete LLM output was repaired, continued, or still given up on"""
+    with _recovery_lock:
+        return {outcome: _recovery_counts[outcome] for outcome in ("repaired", "continued", "failed")}
+
+
+def _parse_json_response(
+    content: str,
+    provider: str,
+    model: type,
+    required: List[str],
+    continue_with: Callable[[List[str]], str],
+    require_complete: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    json.loads for well-formed output. Truncated output keeps every complete field;
+    required fields that were lost (or fail `model` validation) are asked for once
+    with continue_with(missing), a call that generates only those fields.
+    With require_complete, well-formed output whose required fields are absent or
+    empty is continued the same way. None when required fields are still missing.
+    """
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        data = None
+
+    if data is not None:
+        if not require_complete or not isinstance(data, dict):
+            return data
+        # Well-formed: keep the model's own value types, only fill what is not there
+        check = _empty_fields
+        missing = check(data, model, required)
+        if not missing:
+            return data
+        log.warning("json.incomplete", provider=provider, kept=list(data), missing=missing)
+    else:
+        data = repair_json(content) or {}
+        check = invalid_fields
+        missing = check(data, model, required)
+        log.warning("json.truncated", provider=provider, length=len(content), kept=list(data), missing=missing)
+        if not missing:
+            _count_recovery("repaired")
+            return data
+
+    continuation = repair_json(continue_with(missing)) or {}
+    for name in missing:
+        if not check(continuation, model, [name]):
+            data[name] = continuation[name]
+    still_missing = check(data, model, required)
+    if still_missing:
+        _count_recovery("failed")
+        log.error("json.unrecoverable", provider=provider, missing=still_missing)
         return None
+    _count_recovery("continued")
+    log.info("json.continued", provider=provider, fields=missing)
+    return data
+
 
+def _empty_fields(data: Dict[str, Any], model: type, required: List[str]) -> List[str]:
+    """Required fields that are absent or empty (same signature as invalid_fields)"""
+    return [name for name in required if data.get(name) in (None, "", [], {})]
@@ -0,0 +1,400 @@
+"""
+Distilled Local Extractor
+A CPU-only student of the LLM extractor, trained from logged
+(description, LLM extraction) pairs:
+
+- multinomial Naive Bayes classifiers for sektor and the categorical optional
+  fields (label set = values the LLM produced often enough)
+- linear taggers that pick the number span holding modal / tahun / team_size
+  out of all number candidates in the text
+- a location gazetteer learned from the LLM's lokasi labels
+
+Extraction takes well under a millisecond. Used as model_provider "local".
+
+Train + report (run from backend/):
+    python -m app.services.local_extractor extraction_log.jsonl --out local_extractor.json
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.schemas import ExtractedVariables
+from app.services.structured_log import get_logger
+from app.config import get_settings
+
+log = get_logger("local_extractor")
+
+CLASSIFIED_FIELDS = ["sektor", "target_market", "competitors", "business_model"]
+TAGGED_FIELDS = ["modal", "tahun", "team_size"]
+NONE_LABEL = "__none__"
+OTHER_LABEL = "__other__"
+
+TOKEN_RE = re.compile(r"[a-z0-9&]+")
+NUMBER_RE = re.compile(r"(\d+(?:[.,]\d+)*)\s*(triliun|miliar|milyar|juta|jt|ribu|rb|m|k)?\b", re.IGNORECASE)
+MULTIPLIERS = {
+    "triliun": 1e12, "miliar": 1e9, "milyar": 1e9, "m": 1e9,
+    "juta": 1e6, "jt": 1e6, "ribu": 1e3, "rb": 1e3, "k": 1e3,
+}
+
+_log_lock = threading.Lock()
+
+
+# ==================== LOGGING ====================
+
+def log_extraction(description: str, variables: ExtractedVariables, provider: str):
+    """Append one (description, LLM extraction) pair to EXTRACTION_LOG_PATH, if configured"""
+    path = get_settings().extraction_log_path
+    if not path:
+        return
+    line = json.dumps({
+        "description": description,
+        "extraction": variables.model_dump(),
+        "provider": provider,
+        "ts": time.time(),
+    }, ensure_ascii=False)
+    try:
+        with _log_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        log.warning("extraction_log.write_failed", path=path, error=str(e))
+
+
+def read_log(path: str) -> List[Dict[str, Any]]:
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn line from a crashed writer
+            if record.get("description") and record.get("extraction"):
+                records.append(record)
+    return records
+
+
+# ==================== FEATURES ====================
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def _parse_number(digits: str, unit: Optional[str]) -> Optional[float]:
+    if unit:
+        # "1,5 miliar" / "1.5 miliar": separator is a decimal point
+        parts = re.split(r"[.,]", digits)
+        text = parts[0] if len(parts) == 1 else "".join(parts[:-1]) + "." + parts[-1]
+    elif re.fullmatch(r"\d{1,3}(?:[.,]\d{3})+", digits):
+        # "1.500.000": thousands separators
+        text = re.sub(r"[.,]", "", digits)
+    else:
+        text = digits.replace(",", ".")
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    return value * MULTIPLIERS.get((unit or "").lower(), 1)
+
+
+def number_candidates(text: str) -> List[Tuple[float, List[str]]]:
+    """Every number in the text with the features the taggers score it by"""
+    candidates = []
+    for match in NUMBER_RE.finditer(text):
+        value = _parse_number(match.group(1), match.group(2))
+        if value is None or value <= 0:
+            continue
+        unit = (match.group(2) or "").lower()
+        before = tokenize(text[max(0, match.start() - 40):match.start()])[-3:]
+        after = tokenize(text[match.end():match.end() + 30])[:2]
+        features = ["bias", f"unit={unit}", f"mag={int(math.log10(value))}"]
+        if 1990 <= value <= 2100 and not unit:
+            features.append("year_like")
+        features += [f"b{len(before) - i}={tok}" for i, tok in enumerate(before)]
+        features += [f"b={tok}" for tok in before]
+        features += [f"a{i + 1}={tok}" for i, tok in enumerate(after)]
+        candidates.append((value, features))
+    return candidates
+
+
+def _normalize_label(value: Any) -> str:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return NONE_LABEL
+    return re.sub(r"\s+", " ", str(value)).strip().lower()
+
+
+def _tag_matches(field: str, value: float, label: Any) -> bool:
+    if label is None:
+        return False
+    if field == "modal":
+        return abs(value - label) <= 0.01 * max(label, 1)
+    return int(value) == int(label) and value == int(value)
+
+
+# ==================== TRAINING ====================
+
+def _train_classifier(texts: List[List[str]], raw_labels: List[Any], min_count: int) -> Dict[str, Any]:
+    labels = [_normalize_label(label) for label in raw_labels]
+    # Predictions use the LLM's most common spelling of each class ("F&B", not "f&b")
+    spellings: Dict[str, Counter] = defaultdict(Counter)
+    for label, raw in zip(labels, raw_labels):
+        spellings[label][str(raw).strip()] += 1
+    counts = Counter(labels)
+    labels = [label if counts[label] >= min_count or label == NONE_LABEL else OTHER_LABEL for label in labels]
+    classes = sorted(set(labels))
+    vocab = {tok: i for i, tok in enumerate(sorted({tok for tokens in texts for tok in tokens}))}
+
+    token_counts = np.ones((len(classes), len(vocab)))  # Laplace smoothing
+    class_counts = np.zeros(len(classes))
+    for tokens, label in zip(texts, labels):
+        c = classes.index(label)
+        class_counts[c] += 1
+        for tok in tokens:
+            token_counts[c, vocab[tok]] += 1
+
+    log_prob = np.log(token_counts / token_counts.sum(axis=1, keepdims=True))
+    return {
+        "classes": classes,
+        "display": {
+            label: spellings[label].most_common(1)[0][0]
+            for label in classes if label not in (NONE_LABEL, OTHER_LABEL)
+        },
+        "vocab": vocab,
+        "log_prior": np.log(class_counts / class_counts.sum()).round(5).tolist(),
+        "log_prob": log_prob.round(5).tolist(),
+    }
+
+
+def _train_tagger(examples: List[Tuple[List[str], bool]], epochs: int = 8, lr: float = 0.2,
+                  l2: float = 1e-4, seed: int = 0) -> Dict[str, float]:
+    """Logistic regression over sparse binary features (SGD)"""
+    weights: Dict[str, float] = defaultdict(float)
+    rng = random.Random(seed)
+    examples = list(examples)
+    for _ in range(epochs):
+        rng.shuffle(examples)
+        for features, positive in examples:
+            z = sum(weights[f] for f in features)
+            p = 1 / (1 + math.exp(-max(min(z, 30), -30)))
+            gradient = p - positive
+            for f in features:
+                weights[f] -= lr * (gradient + l2 * weights[f])
+    return {f: round(w, 5) for f, w in weights.items() if abs(w) > 1e-4}
+
+
+def train(records: List[Dict[str, Any]], min_count: int = 3) -> Dict[str, Any]:
+    texts = [tokenize(r["description"]) for r in records]
+    extractions = [r["extraction"] for r in records]
+
+    classifiers = {
+        field: _train_classifier(texts, [e.get(field) for e in extractions], min_count)
+        for field in CLASSIFIED_FIELDS
+    }
+
+    taggers = {}
+    for field in TAGGED_FIELDS:
+        examples = []
+        for record, extraction in zip(records, extractions):
+            for value, features in number_candidates(record["description"]):
+                examples.append((features, _tag_matches(field, value, extraction.get(field))))
+        taggers[field] = _train_tagger(examples)
+
+    # Gazetteer: LLM location labels that literally occur in their description
+    locations: Counter = Counter()
+    canonical: Dict[str, Counter] = defaultdict(Counter)
+    for record, extraction in zip(records, extractions):
+        lokasi = (extraction.get("lokasi") or "").strip()
+        if lokasi and lokasi.lower() in record["description"].lower():
+            locations[lokasi.lower()] += 1
+            canonical[lokasi.lower()][lokasi] += 1
+    gazetteer = {
+        key: canonical[key].most_common(1)[0][0]
+        for key, count in locations.items() if count >= max(1, min_count - 1)
+    }
+
+    params = {"classifiers": classifiers, "taggers": taggers, "locations": gazetteer}
+    params["model_id"] = hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    return params
+
+
+# ==================== INFERENCE ====================
+
+class LocalExtractor:
+    """Loaded model; extract() has the same contract as the LLM extractor"""
+
+    def __init__(self, params: Dict[str, Any]):
+        self.model_id = params["model_id"]
+        self.report = params.get("report")
+        self._classifiers = {
+            field: (
+                [spec["display"].get(label, label) for label in spec["classes"]],
+                spec["vocab"],
+                np.array(spec["log_prior"]),
+                np.array(spec["log_prob"]),
+            )
+            for field, spec in params["classifiers"].items()
+        }
+        self._taggers = params["taggers"]
+        # Longest first, so "jakarta selatan" wins over "jakarta"
+        self._locations = sorted(params["locations"].items(), key=lambda item: -len(item[0]))
+
+    @classmethod
+    def load(cls, path: str) -> "LocalExtractor":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _classify(self, field: str, tokens: List[str]) -> Optional[str]:
+        classes, vocab, log_prior, log_prob = self._classifiers[field]
+        indices = [vocab[tok] for tok in tokens if tok in vocab]
+        scores = log_prior + log_prob[:, indices].sum(axis=1)
+        label = classes[int(scores.argmax())]
+        return None if label in (NONE_LABEL, OTHER_LABEL) else label
+
+    def _tag(self, field: str, candidates: List[Tuple[float, List[str]]]) -> Optional[float]:
+        weights = self._taggers[field]
+        best, best_score = None, 0.0  # Only accept candidates with p > 0.5
+        for value, features in candidates:
+            score = sum(weights.get(f, 0.0) for f in features)
+            if score > best_score:
+                best, best_score = value, score
+        return best
+
+    def extract(self, description: str) -> ExtractedVariables:
+        # Regex extractor supplies the defaults when the tagger finds nothing
+        from app.services.ai_extractor import extract_modal, extract_tahun
+
+        tokens = tokenize(description)
+        candidates = number_candidates(description)
+        lowered = description.lower()
+
+        sektor = self._classify("sektor", tokens)
+        modal = self._tag("modal", candidates)
+        tahun = self._tag("tahun", candidates)
+        team_size = self._tag("team_size", candidates)
+        lokasi = next((name for key, name in self._locations if key in lowered), "Indonesia")
+
+        return ExtractedVariables(
+            modal=modal or extract_modal(description),
+            sektor=sektor or "Lainnya",
+            lokasi=lokasi,
+            tahun=int(tahun) if tahun else extract_tahun(description),
+            target_market=self._classify("target_market", tokens),
+            competitors=self._classify("competitors", tokens),
+            team_size=int(team_size) if team_size else None,
+            business_model=self._classify("business_model", tokens),
+        )
+
+
+_model: Optional[LocalExtractor] = None
+_model_lock = threading.Lock()
+_next_load_attempt = 0.0
+LOAD_RETRY_SECONDS = 30.0
+
+
+def get_local_extractor() -> Optional[LocalExtractor]:
+    """
+    Process-wide model from LOCAL_EXTRACTOR_PATH, or None if there is no loadable
+    one yet. Only a successful load is kept: a missing or broken file is tried
+    again after LOAD_RETRY_SECONDS, so a model trained or fixed later is picked
+    up without restarting the worker.
+    """
+    global _model, _next_load_attempt
+    if _model is not None:
+        return _model
+    with _model_lock:
+        if _model is None and time.monotonic() >= _next_load_attempt:
+            path = get_settings().local_extractor_path
+            try:
+                _model = LocalExtractor.load(path)
+                log.info("local_model.loaded", path=path, model_id=_model.model_id)
+            except FileNotFoundError:
+                log.warning("local_model.missing", path=path, hint="train one from the extraction log")
+            except (OSError, ValueError, KeyError, TypeError, IndexError) as e:
+                log.error("local_model.invalid", path=path, error=str(e))
+            if _model is None:
+                _next_load_attempt = time.monotonic() + LOAD_RETRY_SECONDS
+    return _model
+
+
+def local_extractor_id() -> Optional[str]:
+    extractor = get_local_extractor()
+    return extractor.model_id if extractor else None
+
+
+# ==================== EVALUATION ====================
+
+def _field_correct(field: str, predicted: ExtractedVariables, label: Dict[str, Any]) -> bool:
+    value = getattr(predicted, field)
+    if field == "modal":
+        return abs(value - label["modal"]) <= 0.01 * max(label["modal"], 1)
+    if field in ("tahun", "team_size"):
+        return value == label.get(field)
+    return _normalize_label(value) == _normalize_label(label.get(field))
+
+
+def accuracy_report(extract, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-field agreement of `extract(description)` with held-out LLM labels"""
+    fields = ["sektor", "lokasi", "modal", "tahun", "team_size", "target_market", "competitors", "business_model"]
+    correct: Counter = Counter()
+    total = 0
+    elapsed = 0.0
+    for record in records:
+        start = time.perf_counter()
+        predicted = extract(record["description"])
+        elapsed += time.perf_counter() - start
+        total += 1
+        for field in fields:
+            correct[field] += _field_correct(field, predicted, record["extraction"])
+    return {
+        "examples": total,
+        "accuracy": {field: round(correct[field] / total, 4) if total else None for field in fields},
+        "mean_latency_us": round(elapsed / total * 1e6, 1) if total else None,
+    }
+
+
+def split_holdout(records: List[Dict[str, Any]], fraction: float) -> Tuple[List, List]:
+    """Deterministic split by description hash, so retraining keeps the same held-out set"""
+    train_set, holdout = [], []
+    for record in records:
+        digest = int(hashlib.sha256(record["description"].encode("utf-8")).hexdigest()[:8], 16)
+        (holdout if digest / 0xFFFFFFFF < fraction else train_set).append(record)
+    return train_set, holdout
+
+
+def main(argv=None):
+    from app.services.ai_extractor import extract_variables_regex
+
+    parser = argparse.ArgumentParser(description="Train the local extractor from logged LLM extractions")
+    parser.add_argument("log", help="Extraction log (JSONL) written with EXTRACTION_LOG_PATH")
+    parser.add_argument("--out", default=None, help="Model path (default: LOCAL_EXTRACTOR_PATH)")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction held out for the report")
+    parser.add_argument("--min-count", type=int, default=3, help="Minimum occurrences for a class label")
+    args = parser.parse_args(argv)
+
+    records = read_log(args.log)
+    train_set, holdout = split_holdout(records, args.holdout)
+    print(f"[LOCAL-EXTRACT] {len(records)} logged extractions: {len(train_set)} train, {len(holdout)} held out")
+
+    params = train(train_set, min_count=args.min_count)
+    extractor = LocalExtractor(params)
+    params["report"] = {
+        "local": accuracy_report(extractor.extract, holdout),
+        "regex": accuracy_report(extract_variables_regex, holdout),
+        "trained_on": len(train_set),
+    }
+
+    out = args.out or get_settings().local_extractor_path
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(params, f, ensure_ascii=False)
+    print(json.dumps(params["report"], indent=2))
+    print(f"[LOCAL-EXTRACT] Saved model {params['model_id']} to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Memory Diagnostics
+Resident set size plus tracemalloc snapshots, for finding what keeps a worker's
+memory growing. Tracing slows every allocation down, so it only runs when
+MEMORY_TRACING is on (or a benchmark turns it on); RSS is always available.
+"""
+
+import os
+import resource
+import sys
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Optional
+from app.config import get_settings
+
+# Allocation sites inside these files are the tracer's own bookkeeping, not ours
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+_baseline: Optional[tracemalloc.Snapshot] = None
+_baseline_lock = threading.Lock()
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KiB on Linux
+
+
+def start_tracing(frames: Optional[int] = None):
+    """Start tracemalloc (idempotent) and take the baseline later reports compare against"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames or get_settings().memory_trace_frames)
+    reset_baseline()
+
+
+def reset_baseline():
+    global _baseline
+    with _baseline_lock:
+        _baseline = _snapshot()
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES]
+    )
+
+
+def _site(trace: tracemalloc.Traceback, group_by: str) -> str:
+    if group_by == "traceback":
+        # Oldest frame first, allocating frame last (like a Python traceback)
+        return " -> ".join(f"{frame.filename}:{frame.lineno}" for frame in trace)
+    frame = trace[0]
+    return frame.filename if group_by == "filename" else f"{frame.filename}:{frame.lineno}"
+
+
+def top_allocations(limit: int = 20, group_by: str = "lineno") -> List[Dict[str, Any]]:
+    """
+    Allocation sites still holding memory, largest growth since the baseline first.
+    group_by: "lineno" | "filename" | "traceback". Requires tracing to be on.
+    """
+    snapshot = _snapshot()
+    with _baseline_lock:
+        baseline = _baseline
+    stats = snapshot.compare_to(baseline, group_by) if baseline is not None else snapshot.statistics(group_by)
+
+    top = []
+    for stat in stats[:limit]:
+        top.append({
+            "site": _site(stat.traceback, group_by),
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+            "size_diff_kb": round(getattr(stat, "size_diff", stat.size) / 1024, 1),
+            "count_diff": getattr(stat, "count_diff", stat.count),
+        })
+    return top
+
+
+def memory_report(limit: int = 20, group_by: str = "lineno") -> Dict[str, Any]:
+    report: Dict[str, Any] = {"rss_mb": round(rss_bytes() / 2**20, 1), "tracing": tracemalloc.is_tracing()}
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        report.update(
+            traced_mb=round(current / 2**20, 1),
+            traced_peak_mb=round(peak / 2**20, 1),
+            top_allocations=top_allocations(limit, group_by),
+        )
+    return report
@@ -0,0 +1,412 @@
+"""
+Analysis Pipeline
+Extract → Qiskit → Risk Engine → Summarize, shared by every entry point.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Set
+from app.schemas import (
+    AnalyzeRequest, AnalyzeResponse, ExtractedVariables, QuantumSummary, RiskCategories, RiskFactorSpec
+)
+from app.services.ai_extractor import extract_variables, extract_variables_regex
+from app.services.quantum_simulator import run_fast_simulation
+from app.services.simulator_backends import run_quantum_simulation, simulation_cache_key
+from app.services.ensemble import run_ensemble_simulation
+from app.services.local_extractor import local_extractor_id
+from app.services.risk_engine import categorize_risks, generate_heatmap, generate_recommendations
+from app.services.stage_graph import Stage, prune_stages, run_stages
+from app.services.deadline import Deadline, run_within
+from app.services.admission import OverloadedError, llm_slot, simulation_slot
+from app.services.extraction_batcher import llm_batching_enabled
+from app.services.llm_client import GEMINI_MODEL_NAME, SUMMARY_TIERS, summarize_quantum_results
+from app.services.coalescer import normalize_description
+from app.services.result_cache import cached_call, get_summary_cache
+from app.services.structured_log import get_logger
+from app.config import get_settings
+
+log = get_logger("analyze")
+
+# ExtractedVariables fields passed to the LLM summary
+SUMMARY_FIELDS = {"modal", "sektor", "lokasi", "tahun", "target_market", "competitors", "unique_value"}
+
+# Stages each selectable response field needs on top of extract + simulate
+FIELD_STAGES = {
+    "success_probability": (),
+    "extracted_variables": (),
+    "quantum_metadata": (),
+    "risk_categories": ("categorize",),
+    "risk_heatmap": ("heatmap",),
+    # LLM action items replace the risk-engine recommendations whenever a summary exists
+    "recommendations": ("recommend", "summary"),
+    "quantum_summary": ("summary",),
+    "success_distribution": ("ensemble",),
+    "pipeline_trace": (),
+    "degraded_stages": (),
+}
+
+
+def run_analysis(
+    request: AnalyzeRequest,
+    deadline: Optional[Deadline] = None,
+    sequential: bool = False,
+    shed_summary: bool = True
+) -> AnalyzeResponse:
+    """
+    Analisis risiko bisnis menggunakan Quantum-AI hybrid approach.
+
+    FLOW (dependency graph, independent stages run concurrently):
+    1. LLM ekstraksi variabel dari teks (extended fields)
+    2. Qiskit quantum simulation → probability  (ensemble paralel, jika diminta)
+    3. Risk categories → LLM summary dimulai segera; heatmap + rekomendasi paralel
+    4. Return complete response + pipeline_trace (critical path)
+
+    With a deadline, extract / simulate / summary / ensemble fall back to their
+    cheapest result once the budget is spent; they are listed in degraded_stages,
+    as are a summary the LLM failed to produce and a simulation that fell back
+    to another backend or ran at relaxed precision. sequential=True runs every
+    stage in the calling thread (used for profiling). With shed_summary, a summary
+    rejected by admission control becomes the template summary (listed in
+    degraded_stages) instead of failing the request after the simulation ran.
+    """
+    log.info("analyze.start", description=request.description, provider=request.model_provider)
+
+    shed = [] if shed_summary else None
+    results, trace = run_stages(analysis_stages(request, deadline, shed), sequential=sequential)
+    variables = results["extract"]
+    quantum_result = results["simulate"]
+    success_prob = quantum_result['success_probability']
+    # Stages pruned by request.fields leave their response fields empty
+    analysis = {
+        "success_probability": round(success_prob, 4),
+        "risk_heatmap": results.get("heatmap", []),
+        "risk_categories": results.get("categorize", RiskCategories()),
+        "recommendations": results.get("recommend", []),
+    }
+
+    degraded = (deadline.degraded if deadline else []) + (shed or [])
+    if "summary" in results and results["summary"] is None and summary_enabled() and "summary" not in degraded:
+        # The LLM summary failed; the response lacks it just like a timed-out one
+        degraded.append("summary")
+    selection = quantum_result["metadata"].get("backend", {})
+    if ("failed" in selection or "relaxed_from" in selection) and "simulate" not in degraded:
+        # A stand-in backend or relaxed precision: serve it, but never as the stored response
+        degraded.append("simulate")
+    log.info(
+        "analyze.done",
+        sektor=variables.sektor,
+        modal=variables.modal,
+        success_probability=round(success_prob, 4),
+        total_ms=trace["total_ms"],
+        critical_path=trace["critical_path"],
+        degraded=degraded,
+    )
+
+    return build_response(
+        variables, quantum_result, analysis, results.get("summary"), results.get("ensemble"), trace, degraded
+    )
+
+
+def analysis_stages(
+    request: AnalyzeRequest,
+    deadline: Optional[Deadline] = None,
+    shed: Optional[List[str]] = None
+) -> List[Stage]:
+    """
+    The pipeline as a DAG. The summary only needs the risk categories, so it starts
+    while the heatmap and recommendations are still being computed. Only the stages
+    behind request.fields are returned. Stages shed under load are added to `shed`.
+    """
+    stages = [
+        Stage(
+            "extract", (),
+            lambda: run_within(
+                deadline, "extract",
+                lambda: extract_stage(request),
+                lambda: extract_variables_regex(request.description)
+            )
+        ),
+        Stage(
+            "simulate", ("extract",),
+            lambda extract: run_within(
+                deadline, "simulate",
+                lambda: simulate_stage(extract, request.extra_factors, request.simulator_backend, request.precision),
+                lambda: run_fast_simulation(extract)
+            )
+        ),
+        Stage(
+            "categorize", ("extract", "simulate"),
+            lambda extract, simulate: categorize_risks(extract, simulate["success_probability"])
+        ),
+        Stage("heatmap", ("extract", "simulate"), lambda extract, simulate: generate_heatmap(extract, simulate)),
+        Stage(
+            "recommend", ("extract", "simulate", "categorize"),
+            lambda extract, simulate, categorize: generate_recommendations(
+                extract, categorize, simulate["success_probability"]
+            )
+        ),
+        Stage(
+            "summary", ("extract", "simulate", "categorize"),
+            lambda extract, simulate, categorize: run_within(
+                deadline, "summary",
+                lambda: summary_stage(extract, simulate, categorize, request, shed),
+                lambda: template_summary(simulate, categorize, request.summary_tier)
+            ) if summary_enabled() else None
+        ),
+    ]
+    if request.ensemble:
+        # Core-factor ensemble only needs the variables; runs alongside the simulation
+        stages.append(Stage(
+            "ensemble", ("extract",),
+            lambda extract: run_within(deadline, "ensemble", lambda: ensemble_stage(extract), lambda: None)
+        ))
+    return prune_stages(stages, required_stages(request))
+
+
+def required_stages(request: AnalyzeRequest) -> List[str]:
+    """Stages the requested fields depend on (every stage when fields is unset)"""
+    selected = request.fields or FIELD_STAGES
+    return ["extract", "simulate"] + [stage for field in selected for stage in FIELD_STAGES[field]]
+
+
+def response_exclude(request: AnalyzeRequest) -> Optional[Set[str]]:
+    """AnalyzeResponse fields left out of the serialized response (None = keep all)"""
+    if request.fields is None:
+        return None
+    return set(AnalyzeResponse.model_fields) - set(request.fields)
+
+
+def extract_stage(request: AnalyzeRequest) -> ExtractedVariables:
+    """
+    Step 1, cached on the normalized description. Only model extractions are
+    cached: the regex fallback (failed LLM call, no model) is applied outside the
+    cache, so the next request tries the model again.
+    """
+    def extract() -> Optional[ExtractedVariables]:
+        # Batched extraction holds an LLM slot per provider call, not per waiting request
+        if request.model_provider == "local" or not summary_enabled() or llm_batching_enabled():
+            return extract_variables(request.description, provider=request.model_provider, fallback=False)
+        with llm_slot(request.model_provider):
+            return extract_variables(request.description, provider=request.model_provider, fallback=False)
+
+    variables = cached_call(
+        "extract",
+        {
+            "description": normalize_description(request.description),
+            "provider": request.model_provider,
+            "llm": get_settings().use_llm_extraction,
+            "local_model": local_extractor_id() if request.model_provider == "local" else None,
+        },
+        extract,
+        encode=lambda v: v.model_dump(),
+        decode=ExtractedVariables.model_validate,
+    )
+    return variables if variables is not None else extract_variables_regex(request.description)
+
+
+def simulate_stage(
+    variables: ExtractedVariables,
+    extra_factors: Sequence[RiskFactorSpec] = (),
+    backend: Optional[str] = None,
+    precision: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Step 2, cached on the variables + simulator configuration. A run that had to
+    fall back to another backend, or that "auto" ran at relaxed precision under
+    load, is returned but not stored: the key names the requested backend and
+    precision, so later requests must not be served the weaker result.
+    """
+    uncached = []
+
+    def simulate() -> Optional[Dict[str, Any]]:
+        with simulation_slot():
+            result = run_quantum_simulation(variables, extra_factors, backend, precision)
+        selection = result["metadata"]["backend"]
+        if "failed" in selection or "relaxed_from" in selection:
+            uncached.append(result)
+            return None
+        return result
+
+    result = cached_call("simulate", simulation_cache_key(variables, extra_factors, backend, precision), simulate)
+    return uncached[0] if uncached else result
+
+
+def summary_stage(
+    variables: ExtractedVariables,
+    quantum_result: Dict[str, Any],
+    risk_categories: RiskCategories,
+    request: AnalyzeRequest,
+    shed: Optional[List[str]] = None
+) -> Optional[QuantumSummary]:
+    """
+    Step 3b. Extraction and simulation have already run when the summary asks for
+    an LLM slot, so with `shed` a rejection answers with the template summary
+    rather than a late 503 (queued jobs pass shed=None and retry instead).
+    """
+    try:
+        return summarize_analysis(
+            variables, quantum_result, risk_categories, request.model_provider, request.summary_tier
+        )
+    except OverloadedError as e:
+        if shed is None:
+            raise
+        log.warning("stage.shed", stage="summary", llm_stage=e.stage, retry_after=e.retry_after)
+        shed.append("summary")
+        return template_summary(quantum_result, risk_categories, request.summary_tier)
+
+
+def ensemble_stage(extract: ExtractedVariables) -> Dict[str, Any]:
+    return cached_call(
+        "ensemble",
+        {"variables": extract.model_dump(), "samples": get_settings().ensemble_samples},
+        lambda: run_ensemble_simulation(extract),
+    )
+
+
+def build_response(
+    variables: ExtractedVariables,
+    quantum_result: Dict[str, Any],
+    analysis: Dict[str, Any],
+    quantum_summary: Optional[QuantumSummary],
+    success_distribution: Optional[Dict[str, Any]] = None,
+    pipeline_trace: Optional[Dict[str, Any]] = None,
+    degraded_stages: Sequence[str] = ()
+) -> AnalyzeResponse:
+    # Use LLM action items as recommendations if available
+    recommendations = (
+        quantum_summary.action_items
+        if quantum_summary and quantum_summary.action_items
+        else analysis["recommendations"]
+    )
+
+    return AnalyzeResponse(
+        success_probability=analysis["success_probability"],
+        risk_heatmap=analysis["risk_heatmap"],
+        risk_categories=analysis["risk_categories"],
+        recommendations=recommendations,
+        extracted_variables=variables,
+        quantum_summary=quantum_summary,
+        ai_insights=None,  # Replaced by quantum_summary
+        quantum_metadata=quantum_result["metadata"],
+        success_distribution=success_distribution,
+        pipeline_trace=pipeline_trace,
+        degraded_stages=list(degraded_stages)
+    )
+
+
+def summary_enabled() -> bool:
+    settings = get_settings()
+    return bool(settings.use_llm_extraction and (settings.groq_api_key or settings.gemini_api_key))
+
+
+def summarize_analysis(
+    variables: ExtractedVariables,
+    quantum_result: Dict[str, Any],
+    risk_categories: RiskCategories,
+    provider: Optional[str] = None,
+    tier: str = "deep"
+) -> Optional[QuantumSummary]:
+    """LLM explanation of the quantum result (None without an LLM provider or on failure)"""
+    if not summary_enabled():
+        return None
+    if provider == "local":
+        provider = None  # Local extraction; the summary comes from the configured LLM
+
+    # Convert variables to dict for LLM
+    var_dict = variables.model_dump(include=SUMMARY_FIELDS)
+
+    # Convert risk categories to dict
+    risk_dict = {
+        "High": risk_categories.High,
+        "Medium": risk_categories.Medium,
+        "Low": risk_categories.Low
+    }
+
+    # The summary is written for the quantized probability, so every request in the
+    # same bucket can share it without the text contradicting its own key
+    settings = get_settings()
+    step = settings.summary_probability_step
+    probability = round(round(quantum_result["success_probability"] / step) * step, 6)
+    summary_input = {**quantum_result, "success_probability": probability}
+
+    def summarize() -> Optional[Dict[str, Any]]:
+        with llm_slot(provider):
+            return summarize_quantum_results(var_dict, summary_input, risk_dict, provider=provider, tier=tier)
+
+    summary_data = cached_call(
+        "summary",
+        {
+            "variables": var_dict,
+            "success_probability": probability,
+            "rotation_angles": quantum_result["metadata"].get("rotation_angles"),
+            "risks": risk_dict,
+            "provider": provider or settings.llm_provider,
+            "models": [settings.groq_model, GEMINI_MODEL_NAME],
+            "tier": tier,
+        },
+        summarize,
+        store=get_summary_cache,
+    )
+    if not summary_data:
+        return None
+
+    # Helper to safely convert any value to string
+    def safe_str(val, default=""):
+        if val is None:
+            return default
+        if isinstance(val, dict):
+            # Convert dict to readable string
+            return '; '.join(f"{k}: {v}" for k, v in val.items())
+        if isinstance(val, list):
+            return ', '.join(str(v) for v in val)
+        return str(val)
+
+    # Ensure action_items is a list
+    action_items = summary_data.get("action_items", [])
+    if isinstance(action_items, str):
+        action_items = [action_items]
+    elif not isinstance(action_items, list):
+        action_items = []
+
+    quantum_summary = QuantumSummary(
+        executive_summary=safe_str(summary_data.get("executive_summary")),
+        probability_explanation=safe_str(summary_data.get("probability_explanation")),
+        risk_breakdown=safe_str(summary_data.get("risk_breakdown")),
+        key_insight=safe_str(summary_data.get("key_insight")),
+        action_items=action_items
+    )
+    return quantum_summary
+
+
+def template_summary(
+    quantum_result: Dict[str, Any],
+    risk_categories: RiskCategories,
+    tier: str = "deep"
+) -> QuantumSummary:
+    """Summary assembled without an LLM, for requests whose deadline ran out"""
+    probability = quantum_result["success_probability"]
+    if probability > 0.75:
+        verdict = "GO"
+    elif probability >= 0.5:
+        verdict = "CONDITIONAL"
+    else:
+        verdict = "NO-GO"
+
+    def listed(risks: List[str]) -> str:
+        return ", ".join(risks) if risks else "-"
+
+    fields = {
+        "executive_summary": (
+            f"Verdict: {verdict}. Probabilitas keberhasilan hasil simulasi quantum {probability:.1%} "
+            f"dengan {len(risk_categories.High)} risiko tinggi."
+        ),
+        "probability_explanation": (
+            f"Probabilitas {probability:.1%} dihitung dari "
+            f"{quantum_result['metadata'].get('n_qubits', 8)} qubit faktor risiko "
+            f"({quantum_result['metadata'].get('simulator', 'qiskit')})."
+        ),
+        "risk_breakdown": (
+            f"**HIGH**: {listed(risk_categories.High)} | **MEDIUM**: {listed(risk_categories.Medium)} "
+            f"| **LOW**: {listed(risk_categories.Low)}"
+        ),
+    }
+    # Same field set the tier's LLM prompt would have produced; action items come from the risk engine
+    return QuantumSummary(**{name: text for name, text in fields.items() if name in SUMMARY_TIERS[tier]["fields"]})
@@ -0,0 +1,45 @@
+"""
+On-demand Request Profiling
+Runs a single admin-flagged request under cProfile and saves a pstats file.
+Unflagged requests never touch this module beyond one header lookup.
+"""
+
+import cProfile
+import hmac
+import os
+import time
+import uuid
+from typing import Any, Callable, Optional, Tuple
+from app.services.structured_log import get_logger
+from app.config import get_settings
+
+log = get_logger("profiling")
+
+
+def profiling_authorized(token: Optional[str]) -> bool:
+    """True if token matches the configured admin token (profiling is off without one)"""
+    admin_token = get_settings().profiling_admin_token
+    if not admin_token or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), admin_token.encode("utf-8"))
+
+
+def run_profiled(fn: Callable[..., Any], *args) -> Tuple[Any, str]:
+    """
+    Call fn(*args) under cProfile (in the calling thread) and write
+    <profile_dir>/<profile_id>.prof; returns (result, profile_id).
+    Inspect with `python -m pstats` or snakeviz.
+    """
+    profile_dir = get_settings().profile_dir
+    os.makedirs(profile_dir, exist_ok=True)
+    profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(fn, *args)
+    finally:
+        # Failed requests are often the interesting ones; keep their profile too
+        path = os.path.join(profile_dir, f"{profile_id}.prof")
+        profiler.dump_stats(path)
+        log.info("profile.saved", path=path)
+    return result, profile_id
@@ -3,42 +3,107 @@ Quantum Monte Carlo Simulation menggunakan IBM Qiskit
 untuk estimasi probabilitas keberhasilan bisnis.
 """
 
+import hashlib
+import json
+import math
 import numpy as np
-from typing import Dict, Any
-from app.schemas import ExtractedVariables
+from collections import Counter
+from functools import lru_cache
+from statistics import NormalDist
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from app.schemas import ExtractedVariables, RiskFactorSpec
+from app.services.amplitude_estimation import iterative_amplitude_estimation
+from app.services.deadline import check_deadline, deadline_active
+from app.services.features import (
+    BUSINESS_MODEL_CLASSES, COMPETITION_CLASSES, JAKARTA, LOCATION_TIERS, MARKET_CLASSES, SECTORS, TEAM_CLASSES,
+    FeatureVector, encode_features, sector_codes,
+)
+from app.services.structured_log import get_logger
+from app.config import get_settings
 
-# Import Qiskit
-try:
-    from qiskit import QuantumCircuit
-    from qiskit_aer import AerSimulator
-    from qiskit.visualization import plot_histogram
-    QISKIT_AVAILABLE = True
-except ImportError:
-    QISKIT_AVAILABLE = False
-    print("Warning: Qiskit not installed, using mock simulator")
+log = get_logger("quantum")
 
 
-def run_quantum_simulation(variables: ExtractedVariables) -> Dict[str, Any]:
+@lru_cache(maxsize=1)
+def _load_qiskit():
     """
-    Jalankan simulasi quantum untuk menghitung probabilitas risiko.
-    
-    Menggunakan Quantum Circuit dengan:
-    - Hadamard gates untuk superposition
-    - Rotation gates berdasarkan variabel bisnis
-    - Measurement untuk collapse probabilitas
+    Import Qiskit on first use instead of at module import.
+    Returns (QuantumCircuit, AerSimulator), or None if Qiskit is not installed.
     """
-    if QISKIT_AVAILABLE:
-        return _run_qiskit_simulation(variables)
-    else:
-        return _run_mock_simulation(variables)
+    try:
+        from qiskit import QuantumCircuit
+        from qiskit_aer import AerSimulator
+    except ImportError:
+        log.warning("simulator.unavailable", reason="Qiskit not installed, using mock simulator")
+        return None
+    return QuantumCircuit, AerSimulator
+
+
+def qiskit_available() -> bool:
+    return _load_qiskit() is not None
 
 
-def _run_qiskit_simulation(variables: ExtractedVariables) -> Dict[str, Any]:
+# Risk correlations as (control, target) CNOT pairs, applied in order
+ENTANGLEMENT_PAIRS = [
+    # Core business factors (0-3)
+    (0, 1),  # Modal affects sector viability
+    (1, 2),  # Sector affects location choice
+    (2, 3),  # Location affects time/regulatory
+    # Market & Competition layer (4-5)
+    (1, 4),  # Sector constrains target market
+    (4, 5),  # Market size affects competition intensity
+    # Execution layer (6-7)
+    (0, 6),  # Capital affects team size
+    (6, 7),  # Team capability affects business model execution
+    # Cross-layer correlations
+    (5, 7),  # Competition affects model defensibility
+    (3, 4),  # Timing affects market readiness
+]
+
+# RZ phase per qubit
+PHASE_CORRECTIONS = {
+    0: np.pi/4,  # Modal phase
+    1: np.pi/6,  # Sector phase
+    4: np.pi/8,  # Market phase
+    5: np.pi/5,  # Competition phase
+}
+
+
+def wilson_interval(successes: int, trials: int, confidence: float) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion"""
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / trials
+    denom = 1 + z**2 / trials
+    centre = (p + z**2 / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def _is_success_state(state: str) -> bool:
+    """
+    Enhanced success criterion: weighted by qubit importance.
+    Core qubits (0-3) weight = 2x, Extended qubits (4+) weight = 1x
     """
-    Real Qiskit quantum simulation - ENHANCED VERSION.
+    core_zeros = state[-4:].count('0')  # First 4 qubits (right side in Qiskit)
+    ext = state[:-4]                    # Remaining qubits
+    ext_zeros = ext.count('0')
+
+    # Weighted success: need majority 0s in core + decent ext
+    # (ext threshold is half the extended qubits: 2 of 4 in the default circuit)
+    return (core_zeros >= 3) or (core_zeros >= 2 and ext_zeros >= len(ext) / 2)
+
+
+def build_factor_model(
+    variables: ExtractedVariables,
+    extra_factors: Sequence[RiskFactorSpec] = ()
+) -> Tuple[Dict[str, float], List[Tuple[int, int]]]:
+    """
+    Declarative factor list + correlation graph for the risk circuit.
     
-    Circuit Design:
-    - 8 qubits representing comprehensive business risk factors:
+    Factors (one qubit each, in order):
+    - 8 core business risk factors from the extracted variables:
       [0] Modal Risk
       [1] Sector Risk
       [2] Location Risk
@@ -47,85 +112,145 @@ def _run_qiskit_simulation(variables: ExtractedVariables) -> Dict[str, Any]:
       [5] Competition Risk
       [6] Team Risk
       [7] Business Model Risk
-    - Rotation angles based on extracted variables
-    - Multi-layer entanglement to model complex risk correlations
+    - [8+] extra factors from the request, angle = risk * π
+    
+    Returns (rotation angle per factor name, CNOT correlation pairs by qubit index).
+    """
+    rotation_angles = factor_angles(encode_features(variables))
+    for factor in extra_factors:
+        rotation_angles[factor.name] = factor.risk * np.pi
+    
+    index = {name: qubit for qubit, name in enumerate(rotation_angles)}
+    correlations = list(ENTANGLEMENT_PAIRS) + [
+        (index[factor.name], index[target])
+        for factor in extra_factors
+        for target in factor.correlates_with
+    ]
+    return rotation_angles, correlations
+
+
+def build_circuit(
+    rotation_angles: Dict[str, float],
+    correlations: Sequence[Tuple[int, int]],
+    measure: bool = True
+):
     """
-    n_qubits = 8
-    shots = 1024
+    Build the risk circuit from a factor model; without measurement it is the
+    state-preparation operator A used by amplitude estimation.
+    """
+    QuantumCircuit, _ = _load_qiskit()
+    n_qubits = len(rotation_angles)
     
     # Create quantum circuit
-    qc = QuantumCircuit(n_qubits, n_qubits)
-    
-    # ========== CALCULATE ROTATION ANGLES ==========
-    theta_modal = calculate_modal_angle(variables.modal)
-    theta_sektor = calculate_sektor_angle(variables.sektor)
-    theta_lokasi = calculate_lokasi_angle(variables.lokasi)
-    theta_tahun = calculate_tahun_angle(variables.tahun)
-    theta_market = calculate_market_angle(variables.target_market)
-    theta_competition = calculate_competition_angle(variables.competitors)
-    theta_team = calculate_team_angle(variables.team_size)
-    theta_model = calculate_business_model_angle(variables.business_model)
+    qc = QuantumCircuit(n_qubits, n_qubits) if measure else QuantumCircuit(n_qubits)
     
     # ========== LAYER 1: SUPERPOSITION ==========
     for i in range(n_qubits):
         qc.h(i)
     
     # ========== LAYER 2: PARAMETER ENCODING ==========
-    qc.ry(theta_modal, 0)        # Modal risk
-    qc.ry(theta_sektor, 1)       # Sector risk
-    qc.ry(theta_lokasi, 2)       # Location risk
-    qc.ry(theta_tahun, 3)        # Time risk
-    qc.ry(theta_market, 4)       # Market risk
-    qc.ry(theta_competition, 5)  # Competition risk
-    qc.ry(theta_team, 6)         # Team risk
-    qc.ry(theta_model, 7)        # Business model risk
+    for qubit, theta in enumerate(rotation_angles.values()):
+        qc.ry(theta, qubit)
     
     # ========== LAYER 3: ENTANGLEMENT (Risk Correlations) ==========
-    # Core business factors (0-3)
-    qc.cx(0, 1)  # Modal affects sector viability
-    qc.cx(1, 2)  # Sector affects location choice
-    qc.cx(2, 3)  # Location affects time/regulatory
-    
-    # Market & Competition layer (4-5)
-    qc.cx(1, 4)  # Sector constrains target market
-    qc.cx(4, 5)  # Market size affects competition intensity
-    
-    # Execution layer (6-7)
-    qc.cx(0, 6)  # Capital affects team size
-    qc.cx(6, 7)  # Team capability affects business model execution
-    
-    # Cross-layer correlations
-    qc.cx(5, 7)  # Competition affects model defensibility
-    qc.cx(3, 4)  # Timing affects market readiness
+    for control, target in correlations:
+        qc.cx(control, target)
     
     # ========== LAYER 4: PHASE CORRECTION ==========
     # Add RZ gates for fine-tuning based on risk categories
-    qc.rz(np.pi/4, 0)   # Modal phase
-    qc.rz(np.pi/6, 1)   # Sector phase
-    qc.rz(np.pi/8, 4)   # Market phase
-    qc.rz(np.pi/5, 5)   # Competition phase
+    for qubit, phase in PHASE_CORRECTIONS.items():
+        qc.rz(phase, qubit)
     
     # ========== LAYER 5: MEASUREMENT ==========
-    qc.measure(range(n_qubits), range(n_qubits))
+    if measure:
+        qc.measure(range(n_qubits), range(n_qubits))
+    
+    return qc
+
+
+def _build_risk_circuit(
+    variables: ExtractedVariables,
+    measure: bool = True,
+    extra_factors: Sequence[RiskFactorSpec] = ()
+):
+    """Returns (circuit, rotation_angles) for the variables plus any extra factors"""
+    rotation_angles, correlations = build_factor_model(variables, extra_factors)
+    return build_circuit(rotation_angles, correlations, measure), rotation_angles
+
+
+def _simulation_method(n_qubits: int) -> str:
+    """
+    Statevector memory grows as 2^n; past the threshold use Aer's matrix-product-state
+    method, whose cost follows the entanglement of the (sparse) correlation graph instead.
+    """
+    if n_qubits > get_settings().mps_qubit_threshold:
+        return "matrix_product_state"
+    return "automatic"
+
+
+def _route_linear(qc):
+    """
+    Map the circuit onto a line of qubits so every CX acts on neighbours. MPS bond
+    dimensions grow with the distance a CX spans, so extra factors correlated with
+    one hub factor are otherwise rejected for memory; routing places them next to it.
+    Measurements keep their classical bits, so counts are unchanged.
+    """
+    from qiskit import transpile
+    from qiskit.transpiler import CouplingMap
+    return transpile(qc, coupling_map=CouplingMap.from_line(qc.num_qubits), optimization_level=1, seed_transpiler=0)
+
+
+def _run_qiskit_simulation(
+    variables: ExtractedVariables,
+    extra_factors: Sequence[RiskFactorSpec] = (),
+    ci_width: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Real Qiskit quantum simulation - shot-based estimate of the success probability.
+    ci_width: sample adaptively until the Wilson interval is this narrow (default: SHOT_MODE)
+    """
+    _, AerSimulator = _load_qiskit()
+    settings = get_settings()
+    shot_mode = "adaptive" if ci_width is not None else settings.shot_mode
+    ci_width = ci_width or settings.adaptive_ci_width
+    qc, rotation_angles = _build_risk_circuit(variables, extra_factors=extra_factors)
+    n_qubits = qc.num_qubits
+    method = _simulation_method(n_qubits)
+    run_qc = _route_linear(qc) if method == "matrix_product_state" else qc
     
     # ========== RUN SIMULATION ==========
-    simulator = AerSimulator()
-    job = simulator.run(qc, shots=shots)
-    result = job.result()
-    counts = result.get_counts(qc)
+    simulator = AerSimulator(method=method)
+    confidence = settings.confidence_level
+    
+    if shot_mode == "adaptive":
+        # Sample in batches until the Wilson interval is narrow enough
+        counts = Counter()
+        shots = 0
+        success_count = 0
+        while True:
+            check_deadline()
+            batch = min(settings.adaptive_shot_batch, settings.adaptive_max_shots - shots)
+            batch_counts = simulator.run(run_qc, shots=batch).result().get_counts(run_qc)
+            counts.update(batch_counts)
+            success_count += sum(c for state, c in batch_counts.items() if _is_success_state(state))
+            shots += batch
+            ci_low, ci_high = wilson_interval(success_count, shots, confidence)
+            if ci_high - ci_low <= ci_width or shots >= settings.adaptive_max_shots:
+                break
+        counts = dict(counts)
+    else:
+        shots = settings.quantum_shots
+        # Under a request deadline, sample in batches so abandoned work stops with it
+        batch = settings.adaptive_shot_batch if deadline_active() else shots
+        counts = Counter()
+        for done in range(0, shots, batch):
+            check_deadline()
+            counts.update(simulator.run(run_qc, shots=min(batch, shots - done)).result().get_counts(run_qc))
+        counts = dict(counts)
+        success_count = sum(c for state, c in counts.items() if _is_success_state(state))
+        ci_low, ci_high = wilson_interval(success_count, shots, confidence)
     
     # ========== CALCULATE SUCCESS PROBABILITY ==========
-    # Enhanced success criterion: weighted by qubit importance
-    # Core qubits (0-3) weight = 2x, Extended qubits (4-7) weight = 1x
-    success_count = 0
-    for state, count in counts.items():
-        core_zeros = state[4:].count('0')  # First 4 qubits (right side in Qiskit)
-        ext_zeros = state[:4].count('0')   # Last 4 qubits
-        
-        # Weighted success: need majority 0s in core + decent ext
-        if (core_zeros >= 3) or (core_zeros >= 2 and ext_zeros >= 2):
-            success_count += count
-    
     success_probability = success_count / shots
     
     # ========== GENERATE DISTRIBUTION ==========
@@ -137,50 +262,156 @@ def _run_qiskit_simulation(variables: ExtractedVariables) -> Dict[str, Any]:
         "probability_distribution": prob_distribution,
         "metadata": {
             "simulator": "qiskit-aer",
+            "simulation_method": method,
+            "estimation": "shots",
             "shots": shots,
+            "shot_mode": shot_mode,
+            "confidence_interval": [round(ci_low, 4), round(ci_high, 4)],
+            "confidence_level": confidence,
             "n_qubits": n_qubits,
             "circuit_depth": qc.depth(),
-            "rotation_angles": {
-                "modal": round(theta_modal, 4),
-                "sektor": round(theta_sektor, 4),
-                "lokasi": round(theta_lokasi, 4),
-                "tahun": round(theta_tahun, 4),
-                "target_market": round(theta_market, 4),
-                "competitors": round(theta_competition, 4),
-                "team_size": round(theta_team, 4),
-                "business_model": round(theta_model, 4)
-            }
+            "rotation_angles": {name: round(theta, 4) for name, theta in rotation_angles.items()}
         }
     }
 
 
+def _run_iae_simulation(variables: ExtractedVariables, epsilon: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Success probability via simulated Iterative Amplitude Estimation.
+    The oracle marks the same success subspace as the shot-based criterion.
+    epsilon: target half-width of the interval (default IAE_EPSILON)
+    """
+    _, AerSimulator = _load_qiskit()
+    settings = get_settings()
+    state_preparation, rotation_angles = _build_risk_circuit(variables, measure=False)
+    
+    iae = iterative_amplitude_estimation(
+        state_preparation,
+        _is_success_state,
+        epsilon=epsilon or settings.iae_epsilon,
+        alpha=1 - settings.confidence_level,
+        shots_per_round=settings.iae_shots_per_round,
+        simulator=AerSimulator(),
+        before_round=check_deadline,
+    )
+    
+    # Distribution plots use the un-amplified (k = 0) rounds
+    counts = iae["k0_counts"]
+    ci_low, ci_high = iae["confidence_interval"]
+    
+    return {
+        "success_probability": iae["estimation"],
+        "raw_counts": counts,
+        "probability_distribution": _counts_to_distribution_8q(counts, sum(counts.values())),
+        "metadata": {
+            "simulator": "qiskit-aer",
+            "simulation_method": "automatic",
+            "estimation": "iae",
+            "shots": iae["shots"],
+            "oracle_queries": iae["oracle_queries"],
+            "state_preparations": iae["state_preparations"],
+            "grover_powers": iae["powers"],
+            "confidence_interval": [round(ci_low, 4), round(ci_high, 4)],
+            "confidence_level": settings.confidence_level,
+            "n_qubits": state_preparation.num_qubits,
+            "circuit_depth": state_preparation.depth(),
+            "rotation_angles": {name: round(theta, 4) for name, theta in rotation_angles.items()}
+        }
+    }
+
+
+_NIBBLE_ONES = np.array([bin(value).count("1") for value in range(16)])
+
+
+@lru_cache(maxsize=8)
+def _success_mask(n_qubits: int) -> np.ndarray:
+    """_is_success_state for every basis state index at once (bit i = qubit i)"""
+    index = np.arange(2 ** n_qubits, dtype=np.int64)
+    core_zeros = 4 - _NIBBLE_ONES[index & 0xF]
+    ext_ones = np.zeros_like(index)
+    rest = index >> 4
+    while rest.any():
+        ext_ones += _NIBBLE_ONES[rest & 0xF]
+        rest >>= 4
+    ext_zeros = (n_qubits - 4) - ext_ones
+    return (core_zeros >= 3) | ((core_zeros >= 2) & (ext_zeros >= (n_qubits - 4) / 2))
+
+
+def _run_statevector_simulation(
+    variables: ExtractedVariables,
+    extra_factors: Sequence[RiskFactorSpec] = ()
+) -> Dict[str, Any]:
+    """
+    Exact success probability from Aer's statevector: no sampling error, and no
+    shot counts to keep. Memory is 2^n amplitudes, so only for narrow circuits.
+    """
+    _, AerSimulator = _load_qiskit()
+    qc, rotation_angles = _build_risk_circuit(variables, measure=False, extra_factors=extra_factors)
+    n_qubits = qc.num_qubits
+    depth = qc.depth()
+    qc.save_statevector()
+    check_deadline()
+
+    statevector = np.asarray(AerSimulator(method="statevector").run(qc).result().get_statevector(qc))
+    probabilities = np.abs(statevector) ** 2
+    success_probability = float(probabilities[_success_mask(n_qubits)].sum())
+    # Same 16 bins as the shot-based distribution: the 4 core qubits
+    distribution = np.bincount(np.arange(len(probabilities)) & 0xF, weights=probabilities, minlength=16)
+
+    return {
+        "success_probability": success_probability,
+        "raw_counts": {},
+        "probability_distribution": distribution.tolist(),
+        "metadata": {
+            "simulator": "qiskit-aer",
+            "simulation_method": "statevector",
+            "estimation": "exact",
+            "confidence_interval": [round(success_probability, 4), round(success_probability, 4)],
+            "n_qubits": n_qubits,
+            "circuit_depth": depth,
+            "rotation_angles": {name: round(theta, 4) for name, theta in rotation_angles.items()}
+        }
+    }
+
+
+def run_fast_simulation(variables: ExtractedVariables) -> Dict[str, Any]:
+    """Cheapest estimate (the mock simulator); used when a request deadline leaves no time for Qiskit"""
+    return _run_mock_simulation(variables)
+
+
+MOCK_BOOST_SECTORS = sector_codes("Teknologi", "F&B")
+
+
 def _run_mock_simulation(variables: ExtractedVariables) -> Dict[str, Any]:
     """Fallback mock simulation if Qiskit not available"""
-    np.random.seed(hash(str(variables)) % 2**32)
+    features = encode_features(variables)
+    # Own generator, seeded from the encoded factors: stable across processes (results
+    # land in the shared cache) and untouched by other threads drawing concurrently
+    rng = np.random.default_rng(int(hashlib.sha256(json.dumps(list(features)).encode("utf-8")).hexdigest()[:8], 16))
     
     # Base probability dengan sedikit randomness
     base_prob = 0.65
     
     # Adjust based on variables
-    if variables.modal > 1_000_000_000:
+    if features.modal > 1_000_000_000:
         base_prob -= 0.1  # Higher capital = higher risk
-    elif variables.modal < 100_000_000:
+    elif features.modal < 100_000_000:
         base_prob -= 0.05
     
-    if variables.sektor in ["Teknologi", "F&B"]:
+    if features.sector in MOCK_BOOST_SECTORS:
         base_prob += 0.05
     
-    if "jakarta" in variables.lokasi.lower():
+    if features.location_tier == JAKARTA:
         base_prob += 0.03
     
     # Add quantum-like noise
-    noise = np.random.normal(0, 0.05)
+    noise = rng.normal(0, 0.05)
     success_probability = np.clip(base_prob + noise, 0.3, 0.95)
     
     return {
         "success_probability": success_probability,
         "raw_counts": {"mock": 1024},
-        "probability_distribution": np.random.rand(16).tolist(),
+        "probability_distribution": rng.random(16).tolist(),
         "metadata": {
             "simulator": "mock",
             "shots": 1024,
@@ -203,155 +434,61 @@ def calculate_modal_angle(modal: float) -> float:
     return np.clip(normalized * np.pi, 0, np.pi)
 
 
-def calculate_sektor_angle(sektor: str) -> float:
-    """Convert sector to rotation angle based on risk profile"""
-    sektor_risk = {
-        "Teknologi": 0.6,    # Moderate-high volatility
-        "F&B": 0.5,          # Moderate risk
-        "Retail": 0.55,      # Moderate risk
-        "Properti": 0.4,     # Lower risk, stable
-        "Kesehatan": 0.35,   # Lower risk
-        "Pendidikan": 0.3,   # Low risk
-        "Manufaktur": 0.45,  # Moderate
-        "Jasa": 0.5,         # Moderate
-        "Pertanian": 0.6,    # Higher volatility
-        "Finansial": 0.55,   # Moderate-high
-        "Lainnya": 0.5
-    }
-    risk_factor = sektor_risk.get(sektor, 0.5)
-    return risk_factor * np.pi
+def _angle_table(classes: Sequence[str], risk: Dict[str, float], default: float = 0.5) -> np.ndarray:
+    """Rotation angle per encoded class (risk × π), indexed by class code"""
+    return np.array([risk.get(name, default) for name in classes]) * np.pi
 
 
-def calculate_lokasi_angle(lokasi: str) -> float:
-    """Convert location to rotation angle based on market potential"""
-    lokasi_lower = lokasi.lower()
-    
-    # Tier 1 cities = lower angle (lower risk, better market)
-    if any(city in lokasi_lower for city in ["jakarta", "surabaya", "bandung"]):
-        return 0.3 * np.pi
-    # Tier 2 cities
-    elif any(city in lokasi_lower for city in ["medan", "semarang", "makassar", "bali"]):
-        return 0.4 * np.pi
-    # Other areas
-    else:
-        return 0.5 * np.pi
+# Sector risk profile
+SECTOR_ANGLES = _angle_table(SECTORS, {
+    "Teknologi": 0.6,    # Moderate-high volatility
+    "F&B": 0.5,          # Moderate risk
+    "Retail": 0.55,      # Moderate risk
+    "Properti": 0.4,     # Lower risk, stable
+    "Kesehatan": 0.35,   # Lower risk
+    "Pendidikan": 0.3,   # Low risk
+    "Manufaktur": 0.45,  # Moderate
+    "Jasa": 0.5,         # Moderate
+    "Pertanian": 0.6,    # Higher volatility
+    "Finansial": 0.55,   # Moderate-high
+})
+# Tier 1 cities = lower angle (lower risk, better market)
+LOCATION_ANGLES = _angle_table(LOCATION_TIERS, {"jakarta": 0.3, "tier1": 0.3, "tier2": 0.4})
+# TAM: B2B enterprise = predictable revenue, mass-market B2C = needs scale
+MARKET_ANGLES = _angle_table(MARKET_CLASSES, {"enterprise": 0.3, "mass": 0.55, "niche": 0.4})
+# Competitive intensity
+COMPETITION_ANGLES = _angle_table(COMPETITION_CLASSES, {"high": 0.65, "low": 0.25, "moderate": 0.45})
+# Execution capability
+TEAM_ANGLES = _angle_table(TEAM_CLASSES, {"optimal": 0.3, "small": 0.55, "large": 0.45})
+# Scalability & defensibility: SaaS/platform recurring revenue < commission < ad-based < asset-heavy
+BUSINESS_MODEL_ANGLES = _angle_table(BUSINESS_MODEL_CLASSES, {
+    "platform": 0.25, "transactional": 0.4, "asset_heavy": 0.6, "ad_based": 0.55,
+})
 
 
-def calculate_tahun_angle(tahun: int) -> float:
-    """Convert year to rotation angle based on economic outlook"""
-    current_year = 2025
-    years_ahead = tahun - current_year
-    
+def calculate_tahun_angle(year_offset: int) -> float:
+    """Convert years ahead of BASE_YEAR to rotation angle based on economic outlook"""
     # Near term = lower risk, far term = higher uncertainty
-    if years_ahead <= 1:
+    if year_offset <= 1:
         return 0.2 * np.pi
-    elif years_ahead <= 3:
+    elif year_offset <= 3:
         return 0.35 * np.pi
     else:
         return 0.5 * np.pi
 
 
-def calculate_market_angle(target_market: str) -> float:
-    """Convert target market to rotation angle based on TAM (Total Addressable Market)"""
-    if not target_market or target_market == "Tidak disebutkan" or target_market is None:
-        return 0.5 * np.pi  # Default: moderate risk
-    
-    market_lower = str(target_market).lower()
-    
-    # B2B Enterprise = lower risk (predictable revenue)
-    if any(keyword in market_lower for keyword in ["enterprise", "b2b", "korporat", "bumn"]):
-        return 0.3 * np.pi
-    # Mass Market B2C = moderate-high risk (need scale)
-    elif any(keyword in market_lower for keyword in ["b2c", "konsumen", "umkm", "retail"]):
-        return 0.55 * np.pi
-    # Niche/Specialized = moderate risk
-    elif any(keyword in market_lower for keyword in ["niche", "spesialis", "premium"]):
-        return 0.4 * np.pi
-    # Default
-    else:
-        return 0.5 * np.pi
-
-
-def calculate_competition_angle(competitors: str) -> float:
-    """Convert competitor info to rotation angle based on competitive intensity"""
-    if not competitors or competitors == "Tidak disebutkan" or competitors is None:
-        return 0.5 * np.pi  # Default: moderate
-    
-    comp_lower = str(competitors).lower()
-    
-    # Count indicators of high competition
-    high_comp_keywords = ["gojek", "grab", "tokopedia", "shopee", "bukalapak", "unicorn", 
-                          "banyak", "ramai", "ketat", "saturated", "crowded"]
-    low_comp_keywords = ["belum ada", "sedikit", "pioneer", "first mover", "blue ocean", "monopoli"]
-    
-    high_count = sum(1 for kw in high_comp_keywords if kw in comp_lower)
-    low_count = sum(1 for kw in low_comp_keywords if kw in comp_lower)
-    
-    # High competition = higher angle (more risk)
-    if high_count > low_count:
-        return 0.65 * np.pi
-    # Low competition = lower angle (less risk)
-    elif low_count > high_count:
-        return 0.25 * np.pi
-    # Moderate
-    else:
-        return 0.45 * np.pi
-
-
-def calculate_team_angle(team_size: str) -> float:
-    """Convert team size to rotation angle based on execution capability"""
-    if not team_size or team_size == "Tidak disebutkan" or team_size is None:
-        return 0.5 * np.pi  # Default
-    
-    team_lower = str(team_size).lower()
-    
-    # Try to extract number
-    import re
-    numbers = re.findall(r'\d+', team_lower)
-    
-    if numbers:
-        size = int(numbers[0])
-        # Optimal team: 20-100 people (lower risk)
-        if 20 <= size <= 100:
-            return 0.3 * np.pi
-        # Small team <20 (higher execution risk)
-        elif size < 20:
-            return 0.55 * np.pi
-        # Large team >100 (coordination risk)
-        else:
-            return 0.45 * np.pi
-    
-    # Keyword-based fallback
-    if any(kw in team_lower for kw in ["besar", "puluhan", "ratusan"]):
-        return 0.4 * np.pi
-    elif any(kw in team_lower for kw in ["kecil", "startup", "lean"]):
-        return 0.55 * np.pi
-    else:
-        return 0.5 * np.pi
-
-
-def calculate_business_model_angle(business_model: str) -> float:
-    """Convert business model to rotation angle based on scalability & defensibility"""
-    if not business_model or business_model == "Tidak disebutkan" or business_model is None:
-        return 0.5 * np.pi  # Default
-    
-    model_lower = str(business_model).lower()
-    
-    # SaaS/Platform = lowest risk (scalable, recurring revenue)
-    if any(kw in model_lower for kw in ["saas", "platform", "marketplace", "subscription"]):
-        return 0.25 * np.pi
-    # Transactional/Commission = moderate risk
-    elif any(kw in model_lower for kw in ["commission", "komisi", "transaction fee", "take rate"]):
-        return 0.4 * np.pi
-    # Traditional/Asset-heavy = higher risk
-    elif any(kw in model_lower for kw in ["asset", "inventory", "offline", "traditional"]):
-        return 0.6 * np.pi
-    # Freemium/Ad-based = moderate-high risk (monetization challenge)
-    elif any(kw in model_lower for kw in ["freemium", "iklan", "ads", "advertising"]):
-        return 0.55 * np.pi
-    # Default
-    else:
-        return 0.5 * np.pi
+def factor_angles(features: FeatureVector) -> Dict[str, float]:
+    """RY angle of each of the 8 core factor qubits"""
+    return {
+        "modal": float(calculate_modal_angle(features.modal)),
+        "sektor": float(SECTOR_ANGLES[features.sector]),
+        "lokasi": float(LOCATION_ANGLES[features.location_tier]),
+        "tahun": calculate_tahun_angle(features.year_offset),
+        "target_market": float(MARKET_ANGLES[features.market]),
+        "competitors": float(COMPETITION_ANGLES[features.competition]),
+        "team_size": float(TEAM_ANGLES[features.team]),
+        "business_model": float(BUSINESS_MODEL_ANGLES[features.business_model]),
+    }
 
 
 def _counts_to_distribution(counts: Dict[str, int], shots: int) -> list:
@@ -372,8 +509,8 @@ def _counts_to_distribution_8q(counts: Dict[str, int], shots: int) -> list:
     distribution = [0.0] * 16
     
     for state, count in counts.items():
-        # Take first 4 bits (representing core business factors)
-        bin_index = int(state[4:], 2) if len(state) >= 8 else int(state, 2)
+        # Take first 4 qubits (rightmost bits, representing core business factors)
+        bin_index = int(state[-4:], 2)
         bin_index = min(bin_index, 15)  # Safety clamp
         distribution[bin_index] += count / shots
     
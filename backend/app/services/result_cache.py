@@ -0,0 +1,208 @@
+"""
+Shared Result Cache
+SQLite-backed LRU cache shared by every worker process on a node.
+Caches extraction results, simulation results and responses; LLM summaries
+live in a second instance of the same cache (get_summary_cache).
+"""
+
+import hashlib
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+from app.services.structured_log import get_logger
+from app.config import get_settings
+
+log = get_logger("cache")
+
+
+def make_key(key_parts: Any) -> str:
+    """Stable hash of JSON-serializable key parts"""
+    canonical = json.dumps(key_parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SharedResultCache:
+    """
+    LRU cache stored in one SQLite file (WAL mode), so a value written by one
+    uvicorn worker is a hit for all of them. Values are stored as JSON.
+
+    Eviction drops least-recently-used entries once either max_entries or
+    max_bytes is exceeded. The limits are checked every EVICT_INTERVAL writes
+    of this process rather than on each one, so the table may briefly hold a
+    few entries more than max_entries. SQLite errors are logged and treated
+    as misses; the cache never fails a request, and a cache whose file cannot
+    be opened stays disabled.
+    """
+
+    EVICT_INTERVAL = 32
+
+    def __init__(self, path: str, max_entries: int, max_bytes: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._hits: Counter = Counter()
+        self._misses: Counter = Counter()
+
+        self._writes = itertools.count(1)
+        self.disabled = False
+
+        try:
+            conn = self._conn()
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+        except sqlite3.Error as e:
+            # Unwritable path, locked or corrupt file: run uncached rather than fail startup
+            log.error("cache.init_failed", path=path, error=str(e))
+            self.disabled = True
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads; keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        if self.disabled:
+            self._misses[namespace] += 1
+            return None
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT value FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if row is None:
+                self._misses[namespace] += 1
+                return None
+            conn.execute(
+                "UPDATE entries SET last_access = ? WHERE namespace = ? AND key = ?",
+                (time.time(), namespace, key)
+            )
+        except sqlite3.Error as e:
+            log.warning("cache.get_failed", namespace=namespace, error=str(e))
+            self._misses[namespace] += 1
+            return None
+        self._hits[namespace] += 1
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        blob = json.dumps(value, separators=(",", ":"), default=str)
+        if self.disabled or len(blob) > self.max_bytes:
+            return
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, blob, len(blob), time.time())
+            )
+            if next(self._writes) % self.EVICT_INTERVAL == 0:
+                self._evict(conn)
+        except sqlite3.Error as e:
+            log.warning("cache.set_failed", namespace=namespace, error=str(e))
+
+    def _evict(self, conn: sqlite3.Connection):
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        victims = []
+        for rowid, size in conn.execute("SELECT rowid, size FROM entries ORDER BY last_access ASC"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((rowid,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE rowid = ?", victims)
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            entries, size = self._conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+        namespaces = set(self._hits) | set(self._misses)
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            # Hits/misses are counted per worker process
+            "namespaces": {
+                ns: {"hits": self._hits[ns], "misses": self._misses[ns]} for ns in sorted(namespaces)
+            },
+        }
+
+
+@lru_cache()
+def get_result_cache() -> Optional[SharedResultCache]:
+    """Process-wide cache handle, or None when disabled"""
+    settings = get_settings()
+    if not settings.result_cache_enabled:
+        return None
+    return SharedResultCache(
+        path=settings.result_cache_path,
+        max_entries=settings.result_cache_max_entries,
+        max_bytes=settings.result_cache_max_bytes,
+    )
+
+
+@lru_cache()
+def get_summary_cache() -> Optional[SharedResultCache]:
+    """
+    Separate long-lived store for LLM summaries, so churn in the result cache
+    (responses, simulations) never evicts the most expensive entries
+    """
+    settings = get_settings()
+    if not settings.summary_cache_enabled:
+        return None
+    return SharedResultCache(
+        path=settings.summary_cache_path,
+        max_entries=settings.summary_cache_max_entries,
+        max_bytes=settings.summary_cache_max_bytes,
+    )
+
+
+def cached_call(
+    namespace: str,
+    key_parts: Any,
+    compute: Callable[[], Any],
+    encode: Callable[[Any], Any] = lambda value: value,
+    decode: Callable[[Any], Any] = lambda value: value,
+    store: Callable[[], Optional[SharedResultCache]] = get_result_cache,
+) -> Any:
+    """
+    Return the cached value for key_parts, or compute and store it.
+    None results are never cached, so failed LLM calls are retried next time.
+    """
+    cache = store()
+    if cache is None:
+        return compute()
+
+    key = make_key(key_parts)
+    cached = cache.get(namespace, key)
+    if cached is not None:
+        return decode(cached)
+
+    value = compute()
+    if value is not None:
+        cache.set(namespace, key, encode(value))
+    return value
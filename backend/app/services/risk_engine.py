@@ -6,6 +6,14 @@ Mengolah hasil quantum simulation menjadi insight bisnis.
 import numpy as np
 from typing import Dict, List, Any
 from app.schemas import ExtractedVariables, RiskCategories
+from app.services.features import JAKARTA, SECTORS, FeatureVector, encode_features, sector_codes
+
+# Sector groups used by the factor scores
+HIGH_RISK_SECTORS = sector_codes("Teknologi", "Pertanian", "Finansial")
+HIGH_REGULATION_SECTORS = sector_codes("Finansial", "Kesehatan", "Pertanian")
+HIGH_COMPETITION_SECTORS = sector_codes("F&B", "Retail", "Teknologi")
+TECH_HEAVY_SECTORS = sector_codes("Teknologi", "Finansial")
+TEKNOLOGI = SECTORS.index("Teknologi")
 
 
 def generate_risk_analysis(
@@ -51,26 +59,28 @@ def generate_heatmap(
     Cols: Impact levels (Very Low, Low, Medium, High, Very High)
     """
     prob_dist = quantum_result.get("probability_distribution", [])
+    features = encode_features(variables)
     
     # Base heatmap dengan quantum-influenced values
-    np.random.seed(int(variables.modal) % 1000)
+    # (own generator: stages run concurrently, so the global np.random state is shared)
+    rng = np.random.default_rng(int(features.modal) % 1000)
     
     heatmap = []
     risk_factors = ["Modal", "Sektor", "Lokasi", "Waktu", "Eksternal"]
     
     for i, factor in enumerate(risk_factors):
         row = []
-        base_risk = get_base_risk(factor, variables)
+        base_risk = get_base_risk(factor, features)
         
         for j in range(5):  # 5 impact levels
             # Combine base risk with quantum probability
             if len(prob_dist) > 0:
                 quantum_influence = prob_dist[min(i * 3 + j, len(prob_dist) - 1)]
             else:
-                quantum_influence = np.random.random() * 0.3
+                quantum_influence = rng.random() * 0.3
             
             value = base_risk * (0.7 + quantum_influence * 0.6)
-            value = np.clip(value + np.random.normal(0, 0.05), 0, 1)
+            value = np.clip(value + rng.normal(0, 0.05), 0, 1)
             row.append(round(value, 3))
         
         heatmap.append(row)
@@ -78,30 +88,28 @@ def generate_heatmap(
     return heatmap
 
 
-def get_base_risk(factor: str, variables: ExtractedVariables) -> float:
+def get_base_risk(factor: str, features: FeatureVector) -> float:
     """Get base risk value for each factor"""
     if factor == "Modal":
-        if variables.modal > 1_000_000_000:
+        if features.modal > 1_000_000_000:
             return 0.7  # High risk for large capital
-        elif variables.modal > 500_000_000:
+        elif features.modal > 500_000_000:
             return 0.5
         else:
             return 0.3
     
     elif factor == "Sektor":
-        high_risk_sectors = ["Teknologi", "Pertanian", "Finansial"]
-        if variables.sektor in high_risk_sectors:
+        if features.sector in HIGH_RISK_SECTORS:
             return 0.6
         return 0.4
     
     elif factor == "Lokasi":
-        if "jakarta" in variables.lokasi.lower():
+        if features.location_tier == JAKARTA:
             return 0.3  # Lower risk in Jakarta
         return 0.5
     
     elif factor == "Waktu":
-        years_ahead = variables.tahun - 2025
-        return min(0.3 + years_ahead * 0.1, 0.7)
+        return min(0.3 + features.year_offset * 0.1, 0.7)
     
     else:  # Eksternal
         return 0.5  # Default moderate risk
@@ -115,17 +123,18 @@ def categorize_risks(
     high_risks = []
     medium_risks = []
     low_risks = []
+    features = encode_features(variables)
     
     # Analyze each risk factor
     risk_pool = {
-        "Regulasi": analyze_regulation_risk(variables),
-        "Persaingan": analyze_competition_risk(variables),
-        "Pasar": analyze_market_risk(variables),
-        "Operasional": analyze_operational_risk(variables),
-        "Keuangan": analyze_financial_risk(variables),
-        "SDM": analyze_hr_risk(variables),
-        "Teknologi": analyze_tech_risk(variables),
-        "Ekonomi Makro": analyze_macro_risk(variables),
+        "Regulasi": analyze_regulation_risk(features),
+        "Persaingan": analyze_competition_risk(features),
+        "Pasar": analyze_market_risk(features),
+        "Operasional": analyze_operational_risk(features),
+        "Keuangan": analyze_financial_risk(features),
+        "SDM": analyze_hr_risk(features),
+        "Teknologi": analyze_tech_risk(features),
+        "Ekonomi Makro": analyze_macro_risk(features),
     }
     
     for risk_name, risk_score in risk_pool.items():
@@ -143,65 +152,72 @@ def categorize_risks(
     )
 
 
-def analyze_regulation_risk(variables: ExtractedVariables) -> float:
+def analyze_regulation_risk(features: FeatureVector) -> float:
     """Analyze regulatory risk"""
-    high_reg_sectors = ["Finansial", "Kesehatan", "Pertanian"]
-    if variables.sektor in high_reg_sectors:
+    if features.sector in HIGH_REGULATION_SECTORS:
         return 0.7
     return 0.4
 
 
-def analyze_competition_risk(variables: ExtractedVariables) -> float:
+def analyze_competition_risk(features: FeatureVector) -> float:
     """Analyze competition risk"""
-    high_competition = ["F&B", "Retail", "Teknologi"]
-    if variables.sektor in high_competition:
+    if features.sector in HIGH_COMPETITION_SECTORS:
         return 0.75
-    if "jakarta" in variables.lokasi.lower():
+    if features.location_tier == JAKARTA:
         return 0.65
     return 0.5
 
 
-def analyze_market_risk(variables: ExtractedVariables) -> float:
+def analyze_market_risk(features: FeatureVector) -> float:
     """Analyze market risk"""
-    if variables.tahun > 2027:
+    if features.year_offset > 2:
         return 0.6  # Higher uncertainty for future
     return 0.4
 
 
-def analyze_operational_risk(variables: ExtractedVariables) -> float:
+def analyze_operational_risk(features: FeatureVector) -> float:
     """Analyze operational risk"""
-    if variables.modal > 500_000_000:
+    if features.modal > 500_000_000:
         return 0.55  # Larger operations = more complexity
     return 0.35
 
 
-def analyze_financial_risk(variables: ExtractedVariables) -> float:
+def analyze_financial_risk(features: FeatureVector) -> float:
     """Analyze financial risk"""
-    if variables.modal > 1_000_000_000:
+    if features.modal > 1_000_000_000:
         return 0.65
-    elif variables.modal < 100_000_000:
+    elif features.modal < 100_000_000:
         return 0.5  # Undercapitalized
     return 0.3
 
 
-def analyze_hr_risk(variables: ExtractedVariables) -> float:
+def analyze_hr_risk(features: FeatureVector) -> float:
     """Analyze human resource risk"""
-    if variables.sektor == "Teknologi":
+    if features.sector == TEKNOLOGI:
         return 0.6  # Tech talent is scarce
     return 0.4
 
 
-def analyze_tech_risk(variables: ExtractedVariables) -> float:
+def analyze_tech_risk(features: FeatureVector) -> float:
     """Analyze technology risk"""
-    if variables.sektor in ["Teknologi", "Finansial"]:
+    if features.sector in TECH_HEAVY_SECTORS:
         return 0.5
     return 0.3
 
 
-def analyze_macro_risk(variables: ExtractedVariables) -> float:
+def analyze_macro_risk(features: FeatureVector) -> float:
     """Analyze macroeconomic risk"""
-    years_ahead = variables.tahun - 2025
-    return min(0.4 + years_ahead * 0.08, 0.7)
+    return min(0.4 + features.year_offset * 0.08, 0.7)
+
+
+SECTOR_RECOMMENDATIONS = {
+    "Teknologi": "Fokus pada MVP dan iterasi cepat berdasarkan feedback user",
+    "F&B": "Validasi menu dan lokasi dengan soft opening terlebih dahulu",
+    "Retail": "Pertimbangkan strategi omnichannel (online + offline)",
+    "Properti": "Lakukan due diligence lokasi dan legalitas tanah",
+    "Kesehatan": "Pastikan semua perizinan dan sertifikasi lengkap",
+    "Pendidikan": "Bangun kurikulum yang sesuai kebutuhan pasar kerja",
+}
 
 
 def generate_recommendations(
@@ -211,6 +227,7 @@ def generate_recommendations(
 ) -> List[str]:
     """Generate actionable recommendations"""
     recommendations = []
+    features = encode_features(variables)
     
     # Based on high risks
     if "Regulasi" in risk_categories.High:
@@ -226,25 +243,18 @@ def generate_recommendations(
         recommendations.append("Bangun strategi rekrutmen dan retensi talent yang kuat")
     
     # Based on sector
-    sector_recommendations = {
-        "Teknologi": "Fokus pada MVP dan iterasi cepat berdasarkan feedback user",
-        "F&B": "Validasi menu dan lokasi dengan soft opening terlebih dahulu",
-        "Retail": "Pertimbangkan strategi omnichannel (online + offline)",
-        "Properti": "Lakukan due diligence lokasi dan legalitas tanah",
-        "Kesehatan": "Pastikan semua perizinan dan sertifikasi lengkap",
-        "Pendidikan": "Bangun kurikulum yang sesuai kebutuhan pasar kerja",
-    }
-    if variables.sektor in sector_recommendations:
-        recommendations.append(sector_recommendations[variables.sektor])
+    sector_name = SECTORS[features.sector]
+    if sector_name in SECTOR_RECOMMENDATIONS:
+        recommendations.append(SECTOR_RECOMMENDATIONS[sector_name])
     
     # Based on location
-    if "jakarta" in variables.lokasi.lower():
+    if features.location_tier == JAKARTA:
         recommendations.append("Manfaatkan ekosistem startup dan networking di Jakarta")
     else:
         recommendations.append("Eksplorasi keunggulan biaya operasional di luar kota besar")
     
     # Based on capital
-    if variables.modal > 1_000_000_000:
+    if features.modal > 1_000_000_000:
         recommendations.append("Gunakan financial advisor untuk pengelolaan modal yang optimal")
     else:
         recommendations.append("Mulai dengan lean startup approach untuk efisiensi modal")
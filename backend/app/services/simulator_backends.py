@@ -0,0 +1,344 @@
+"""
+Simulator Backends
+Every way of estimating the success probability of the risk circuit sits behind
+one interface in a registry: Aer shot sampling, exact Aer statevector, iterative
+amplitude estimation and the mock. A request picks one with simulator_backend
+(default SIMULATOR_BACKEND); "auto" picks the cheapest backend that reaches the
+requested precision for this circuit width, relaxing precision when simulation
+slots are saturated. The choice and its estimated cost land in quantum_metadata.
+"""
+
+import math
+import time
+from statistics import NormalDist
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from app.schemas import ExtractedVariables, RiskFactorSpec
+from app.services.admission import get_limiter
+from app.services.deadline import DeadlineExceeded
+from app.services.features import encode_features
+from app.services.quantum_simulator import (
+    PHASE_CORRECTIONS,
+    _run_iae_simulation,
+    _run_mock_simulation,
+    _run_qiskit_simulation,
+    _run_statevector_simulation,
+    build_factor_model,
+    qiskit_available,
+)
+from app.services.structured_log import get_logger
+from app.config import get_settings
+
+log = get_logger("quantum")
+
+# Tried in order when a backend fails at run time (Aer out of memory, ...)
+FALLBACK_ORDER = ("aer_statevector", "aer_iae", "mock")
+
+
+class CircuitShape(NamedTuple):
+    n_qubits: int
+    n_gates: int
+    has_extra_factors: bool
+
+
+def circuit_shape(variables: ExtractedVariables, extra_factors: Sequence[RiskFactorSpec] = ()) -> CircuitShape:
+    """Width and gate count of the risk circuit, without building it"""
+    rotation_angles, correlations = build_factor_model(variables, extra_factors)
+    n_qubits = len(rotation_angles)
+    # H + RY per qubit, one CX per correlation, the RZ phase corrections
+    return CircuitShape(n_qubits, 2 * n_qubits + len(correlations) + len(PHASE_CORRECTIONS), bool(extra_factors))
+
+
+def shots_for_precision(precision: float) -> int:
+    """Shots for a confidence interval of width `precision` in the worst case (p = 0.5)"""
+    z = NormalDist().inv_cdf(0.5 + get_settings().confidence_level / 2)
+    return math.ceil((z / precision) ** 2)
+
+
+class SimulatorBackend:
+    """
+    One way of estimating the success probability. Costs are rough counts of
+    amplitude updates, only meant to rank backends against each other.
+    """
+    name = ""
+
+    def available(self) -> bool:
+        return qiskit_available()
+
+    def supports(self, shape: CircuitShape) -> bool:
+        return True
+
+    def estimate_cost(self, shape: CircuitShape, precision: Optional[float]) -> float:
+        raise NotImplementedError
+
+    def run(
+        self,
+        variables: ExtractedVariables,
+        extra_factors: Sequence[RiskFactorSpec],
+        precision: Optional[float],
+    ) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class AerShotsBackend(SimulatorBackend):
+    """Sampled measurements; matrix-product-state past MPS_QUBIT_THRESHOLD"""
+    name = "aer_shots"
+
+    def estimate_cost(self, shape, precision):
+        settings = get_settings()
+        shots = shots_for_precision(precision) if precision else settings.quantum_shots
+        if shape.n_qubits > settings.mps_qubit_threshold:
+            # MPS: linear in width, bond dimension kept small by the sparse correlation graph
+            preparation = shape.n_gates * 16 ** 2
+        else:
+            preparation = shape.n_gates * 2 ** shape.n_qubits
+        return preparation + shots * shape.n_qubits
+
+    def run(self, variables, extra_factors, precision):
+        return _run_qiskit_simulation(variables, extra_factors, ci_width=precision)
+
+
+class AerStatevectorBackend(SimulatorBackend):
+    """Exact probability from the full statevector; 2^n memory"""
+    name = "aer_statevector"
+
+    def supports(self, shape):
+        return shape.n_qubits <= get_settings().statevector_max_qubits
+
+    def estimate_cost(self, shape, precision):
+        # One pass over the amplitudes per gate, plus the success-mask reduction
+        return (shape.n_gates + 1) * 2 ** shape.n_qubits
+
+    def run(self, variables, extra_factors, precision):
+        return _run_statevector_simulation(variables, extra_factors)
+
+
+class AerIaeBackend(SimulatorBackend):
+    """Iterative amplitude estimation; its oracle is a dense 2^n diagonal, so core circuit only"""
+    name = "aer_iae"
+
+    def supports(self, shape):
+        return not shape.has_extra_factors
+
+    def estimate_cost(self, shape, precision):
+        settings = get_settings()
+        epsilon = precision / 2 if precision else settings.iae_epsilon
+        # Grover applications grow as 1/ε · log(1/α); each one is A, A† and the oracle
+        queries = math.log(2 / (1 - settings.confidence_level)) / epsilon
+        return queries * (2 * shape.n_gates + 1) * 2 ** shape.n_qubits
+
+    def run(self, variables, extra_factors, precision):
+        return _run_iae_simulation(variables, epsilon=precision / 2 if precision else None)
+
+
+class MockBackend(SimulatorBackend):
+    """Heuristic estimate, no circuit; never picked by "auto" while Qiskit is available"""
+    name = "mock"
+
+    def available(self):
+        return True
+
+    def estimate_cost(self, shape, precision):
+        return 1.0
+
+    def run(self, variables, extra_factors, precision):
+        return _run_mock_simulation(variables)
+
+
+_backends: Dict[str, SimulatorBackend] = {}
+
+
+def register_backend(backend: SimulatorBackend):
+    """Add (or replace) a backend; it becomes selectable by name and a candidate for "auto\""""
+    _backends[backend.name] = backend
+
+
+def get_backend(name: str) -> SimulatorBackend:
+    try:
+        return _backends[name]
+    except KeyError:
+        raise ValueError(f"Unknown simulator backend: {name}") from None
+
+
+def backend_names() -> List[str]:
+    return sorted(_backends)
+
+
+for _backend in (AerShotsBackend(), AerStatevectorBackend(), AerIaeBackend(), MockBackend()):
+    register_backend(_backend)
+
+
+def configured_backend() -> str:
+    """Backend for requests that do not choose one"""
+    settings = get_settings()
+    # ESTIMATION_MODE=iae predates SIMULATOR_BACKEND and still selects IAE
+    if settings.simulator_backend == "aer_shots" and settings.estimation_mode == "iae":
+        return "aer_iae"
+    return settings.simulator_backend
+
+
+def simulation_load() -> Tuple[float, bool]:
+    """
+    (slots in use or waited for per slot, saturated). Saturated means callers are
+    queueing for a slot; the caller's own slot is already counted as active.
+    """
+    stats = get_limiter("simulate").stats()
+    return (stats["active"] + stats["waiting"]) / stats["limit"], stats["waiting"] > 0
+
+
+def select_backend(
+    requested: Optional[str],
+    shape: CircuitShape,
+    precision: Optional[float],
+) -> Tuple[SimulatorBackend, Optional[float], Dict[str, Any]]:
+    """
+    Resolve the backend for one simulation: (backend, precision to run at, selection
+    record). USE_MOCK_SIMULATOR overrides everything; a backend that is unavailable
+    or cannot take this circuit falls back to shots (or the mock without Qiskit).
+    """
+    settings = get_settings()
+    requested = requested or configured_backend()
+    record: Dict[str, Any] = {"requested": requested}
+
+    if settings.use_mock_simulator:
+        record["reason"] = "USE_MOCK_SIMULATOR"
+        return _backends["mock"], precision, record
+
+    if requested == "auto":
+        precision = precision or settings.adaptive_ci_width
+        load, saturated = simulation_load()
+        record["load"] = round(load, 2)
+        if saturated:
+            # Saturated: trade precision for throughput before requests get shed
+            record["relaxed_from"] = precision
+            precision = min(0.5, precision * 2)
+        candidates = [
+            backend for backend in _backends.values()
+            if backend.name != "mock" and backend.available() and backend.supports(shape)
+        ]
+        if candidates:
+            record["reason"] = "lowest estimated cost"
+            return min(candidates, key=lambda b: b.estimate_cost(shape, precision)), precision, record
+        record["reason"] = "qiskit unavailable"
+        return _backends["mock"], precision, record
+
+    backend = get_backend(requested)
+    if not backend.available():
+        record["reason"] = "qiskit unavailable"
+        return _backends["mock"], precision, record
+    if not backend.supports(shape):
+        record["reason"] = f"{requested} cannot run {shape.n_qubits} qubits" + (
+            " with extra factors" if shape.has_extra_factors else ""
+        )
+        return _backends["aer_shots"], precision, record
+    record["reason"] = "requested"
+    return backend, precision, record
+
+
+def run_quantum_simulation(
+    variables: ExtractedVariables,
+    extra_factors: Sequence[RiskFactorSpec] = (),
+    backend: Optional[str] = None,
+    precision: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Jalankan simulasi quantum untuk menghitung probabilitas risiko.
+
+    Menggunakan Quantum Circuit dengan:
+    - Hadamard gates untuk superposition
+    - Rotation gates berdasarkan variabel bisnis (+ faktor tambahan)
+    - Measurement untuk collapse probabilitas
+
+    backend: nama backend atau "auto" (default SIMULATOR_BACKEND);
+    precision: lebar confidence interval yang diinginkan.
+    """
+    shape = circuit_shape(variables, extra_factors)
+    chosen, run_precision, record = select_backend(backend, shape, precision)
+
+    start = time.perf_counter()
+    try:
+        result = chosen.run(variables, extra_factors, run_precision)
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        # Aer can still reject a circuit at run time; answer from the next backend instead of failing
+        log.warning("simulator.failed", backend=chosen.name, n_qubits=shape.n_qubits, error=str(e))
+        record["failed"] = {"backend": chosen.name, "error": str(e)[:200]}
+        chosen, result = _run_fallback(chosen, shape, variables, extra_factors, run_precision)
+    result["metadata"]["backend"] = {
+        "name": chosen.name,
+        **record,
+        "precision": run_precision,
+        "estimated_cost": round(chosen.estimate_cost(shape, run_precision)),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+    return result
+
+
+def _run_fallback(
+    failed: SimulatorBackend,
+    shape: CircuitShape,
+    variables: ExtractedVariables,
+    extra_factors: Sequence[RiskFactorSpec],
+    precision: Optional[float],
+) -> Tuple[SimulatorBackend, Dict[str, Any]]:
+    """First backend in FALLBACK_ORDER that can take the circuit and runs; the mock always does"""
+    for name in FALLBACK_ORDER:
+        backend = _backends[name]
+        if backend is failed or not backend.available() or not backend.supports(shape):
+            continue
+        try:
+            return backend, backend.run(variables, extra_factors, precision)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            log.warning("simulator.failed", backend=name, n_qubits=shape.n_qubits, error=str(e))
+    mock = _backends["mock"]
+    return mock, mock.run(variables, extra_factors, precision)
+
+
+def simulator_config() -> Dict[str, Any]:
+    """Simulator configuration that affects results (backend, estimation and shot settings)"""
+    settings = get_settings()
+    config = {
+        "mps_qubit_threshold": settings.mps_qubit_threshold,
+        "statevector_max_qubits": settings.statevector_max_qubits,
+        "simulator": "qiskit-aer" if qiskit_available() and not settings.use_mock_simulator else "mock",
+        "backend": configured_backend(),
+        "estimation": settings.estimation_mode,
+        "shot_mode": settings.shot_mode,
+    }
+    # "auto", a per-request simulator_backend and the fallback chain can all pick
+    # aer_iae whatever ESTIMATION_MODE says, so its parameters are always keyed
+    config.update(
+        iae_epsilon=settings.iae_epsilon,
+        iae_shots_per_round=settings.iae_shots_per_round,
+        confidence=settings.confidence_level,
+    )
+    if settings.shot_mode == "adaptive":
+        config.update(
+            batch=settings.adaptive_shot_batch,
+            max_shots=settings.adaptive_max_shots,
+            ci_width=settings.adaptive_ci_width,
+        )
+    else:
+        config["shots"] = settings.quantum_shots
+    return config
+
+
+def simulation_cache_key(
+    variables: ExtractedVariables,
+    extra_factors: Sequence[RiskFactorSpec] = (),
+    backend: Optional[str] = None,
+    precision: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Everything that determines a simulation result: the encoded factors (fields the
+    circuit does not read, like timeline, leave it unchanged) + simulator configuration
+    """
+    return {
+        "features": list(encode_features(variables)),
+        "extra_factors": [factor.model_dump() for factor in extra_factors],
+        "requested_backend": backend,
+        "precision": precision,
+        **simulator_config(),
+    }
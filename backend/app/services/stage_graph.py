@@ -0,0 +1,199 @@
+"""
+Dependency-aware Stage Scheduler
+Runs pipeline stages as a small DAG: every stage starts the moment all of its
+dependencies have finished, independent stages run concurrently on a shared
+thread pool, and each run reports its critical path.
+"""
+
+import contextvars
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+from app.config import get_settings
+
+
+class Stage(NamedTuple):
+    """A pipeline stage; fn receives the results of `deps` as keyword arguments"""
+    name: str
+    deps: Tuple[str, ...]
+    fn: Callable[..., Any]
+
+
+class StageExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor that counts work still waiting for a thread, so admission
+    control can see (and bound) the backlog behind the stage limiters
+    """
+
+    def __init__(self, max_workers: int):
+        super().__init__(max_workers=max_workers, thread_name_prefix="stage")
+        self.workers = max_workers
+        self._count_lock = threading.Lock()
+        self._queued = 0
+        self._mean_run = 1.0  # Seconds; EWMA of how long a stage holds its thread
+
+    def submit(self, fn: Callable[..., Any], /, *args, **kwargs) -> Future:
+        with self._count_lock:
+            self._queued += 1
+
+        def run() -> Any:
+            with self._count_lock:
+                self._queued -= 1
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._count_lock:
+                    self._mean_run = 0.8 * self._mean_run + 0.2 * (time.perf_counter() - start)
+
+        def forget_cancelled(future: Future):
+            # Cancelled while queued: run() never starts, so it never leaves the count
+            if future.cancelled():
+                with self._count_lock:
+                    self._queued -= 1
+
+        future = super().submit(run)
+        future.add_done_callback(forget_cancelled)
+        return future
+
+    def backlog(self) -> Tuple[int, float]:
+        """(stages waiting for a thread, seconds for that backlog to drain)"""
+        with self._count_lock:
+            return self._queued, self._mean_run * self._queued / self.workers
+
+
+@lru_cache()
+def get_stage_executor() -> StageExecutor:
+    # Separate from the request threadpool: request threads block on these futures
+    return StageExecutor(get_settings().stage_workers)
+
+
+def critical_path(stages: Sequence[Stage], timings: Dict[str, Dict[str, float]]) -> List[str]:
+    """
+    Chain of stages that bounded the run: start from the stage that finished
+    last and repeatedly step to the dependency that finished last.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    current = max(timings, key=lambda name: timings[name]["end_ms"])
+    path = [current]
+    while by_name[current].deps:
+        current = max(by_name[current].deps, key=lambda name: timings[name]["end_ms"])
+        path.append(current)
+    return path[::-1]
+
+
+def prune_stages(stages: Sequence[Stage], targets: Iterable[str]) -> List[Stage]:
+    """The stages needed to produce `targets` (plus their transitive dependencies), in order"""
+    by_name = {stage.name: stage for stage in stages}
+    needed = set()
+    pending = [name for name in targets if name in by_name]
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(by_name[name].deps)
+    return [stage for stage in stages if stage.name in needed]
+
+
+def run_stages(stages: Sequence[Stage], sequential: bool = False) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Execute the DAG and return (results by stage name, trace).
+    The trace holds per-stage start/end offsets, the total and the critical path.
+    The first stage error cancels whatever has not started yet and is re-raised.
+    sequential=True runs every stage in the calling thread, in dependency order,
+    so a profiler attached to that thread sees the stage work.
+    """
+    executor = get_stage_executor()
+    start = time.perf_counter()
+    results: Dict[str, Any] = {}
+    timings: Dict[str, Dict[str, float]] = {}
+    remaining = {stage.name: stage for stage in stages}
+    running: Dict[Future, str] = {}
+
+    def timed(stage: Stage, kwargs: Dict[str, Any]) -> Any:
+        stage_start = time.perf_counter()
+        try:
+            return stage.fn(**kwargs)
+        finally:
+            timings[stage.name] = {
+                "start_ms": round((stage_start - start) * 1000, 2),
+                "end_ms": round((time.perf_counter() - start) * 1000, 2),
+            }
+
+    def start_ready() -> bool:
+        started = False
+        for name, stage in list(remaining.items()):
+            if all(dep in results for dep in stage.deps):
+                kwargs = {dep: results[dep] for dep in stage.deps}
+                del remaining[name]
+                started = True
+                if sequential:
+                    results[name] = timed(stage, kwargs)
+                else:
+                    # Stage threads log under the caller's request id
+                    running[executor.submit(contextvars.copy_context().run, timed, stage, kwargs)] = name
+        return started
+
+    while start_ready() and sequential:
+        pass
+    while running:
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = running.pop(future)
+            try:
+                results[name] = future.result()
+            except Exception:
+                for pending in running:
+                    pending.cancel()
+                raise
+        start_ready()
+
+    if remaining:
+        raise ValueError(f"Unsatisfiable stage dependencies: {sorted(remaining)}")
+
+    trace = {
+        "total_ms": round((time.perf_counter() - start) * 1000, 2),
+        "critical_path": critical_path(stages, timings),
+        "stages": timings,
+    }
+    stage_stats.record(trace)
+    return results, trace
+
+
+class StageStats:
+    """Process-wide aggregate of stage durations and critical-path membership"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs = 0
+        self._on_critical_path: Counter = Counter()
+        self._total_ms: Counter = Counter()
+        self._counts: Counter = Counter()
+
+    def record(self, trace: Dict[str, Any]):
+        with self._lock:
+            self._runs += 1
+            self._on_critical_path.update(trace["critical_path"])
+            for name, timing in trace["stages"].items():
+                self._total_ms[name] += timing["end_ms"] - timing["start_ms"]
+                self._counts[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "runs": self._runs,
+                "stages": {
+                    name: {
+                        "mean_ms": round(self._total_ms[name] / self._counts[name], 2),
+                        # Fraction of runs in which this stage bounded latency
+                        "critical_share": round(self._on_critical_path[name] / self._runs, 3),
+                    }
+                    for name in sorted(self._counts)
+                },
+            }
+
+
+stage_stats = StageStats()
@@ -0,0 +1,178 @@
+"""
+Structured Logging
+Request code only builds a LogRecord and drops it on a bounded in-memory queue;
+a background listener thread formats (JSON or text), truncates payloads and
+writes to stdout. Every record carries the request id from a context variable,
+and INFO/DEBUG lines are sampled per request, so a sampled request keeps all of
+its lines and logging cost stays flat as concurrency grows.
+"""
+
+import json
+import logging
+import queue
+import sys
+import time
+import uuid
+import zlib
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+from app.config import get_settings
+
+# Set per HTTP request / job / live revision; copied into stage threads with the context
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+_listener: Optional[QueueListener] = None
+_handler: Optional["DroppingQueueHandler"] = None
+
+
+class StructuredLogger:
+    """logger.info("event.name", key=value, ...) → one record with structured fields"""
+
+    def __init__(self, name: str):
+        self._logger = logging.getLogger(f"qrisq.{name}")
+
+    def _log(self, level: int, event: str, fields: Dict[str, Any], exc_info: bool = False):
+        if self._logger.isEnabledFor(level):
+            self._logger.log(
+                level, event, exc_info=exc_info,
+                extra={"fields": fields, "request_id": request_id_var.get()},
+            )
+
+    def debug(self, event: str, **fields):
+        self._log(logging.DEBUG, event, fields)
+
+    def info(self, event: str, **fields):
+        self._log(logging.INFO, event, fields)
+
+    def warning(self, event: str, **fields):
+        self._log(logging.WARNING, event, fields)
+
+    def error(self, event: str, exc_info: bool = False, **fields):
+        self._log(logging.ERROR, event, fields, exc_info)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    return StructuredLogger(name)
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+class RequestSampler(logging.Filter):
+    """Keep every WARNING+; keep INFO/DEBUG for a stable fraction of request ids"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.threshold = int(max(0.0, min(rate, 1.0)) * 0xFFFFFFFF)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.threshold >= 0xFFFFFFFF:
+            return True
+        request_id = getattr(record, "request_id", "-")
+        return zlib.crc32(request_id.encode("utf-8")) <= self.threshold
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Never blocks the caller: when the queue is full the record is dropped and counted.
+    Formatting is left to the listener thread (records never leave the process).
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _truncate(value: Any, limit: int) -> Any:
+    if isinstance(value, str) and len(value) > limit:
+        return f"{value[:limit]}…(+{len(value) - limit} chars)"
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    def __init__(self, payload_max_chars: int):
+        super().__init__()
+        self.payload_max_chars = payload_max_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "event": record.getMessage(),
+        }
+        for key, value in getattr(record, "fields", {}).items():
+            entry[key] = _truncate(value, self.payload_max_chars)
+        if record.exc_info:
+            entry["exc"] = _truncate(self.formatException(record.exc_info), self.payload_max_chars * 10)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(JsonFormatter):
+    """Human-readable variant for local development"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = " ".join(
+            f"{key}={_truncate(value, self.payload_max_chars)!r}"
+            for key, value in getattr(record, "fields", {}).items()
+        )
+        line = (
+            f"{time.strftime('%H:%M:%S', time.localtime(record.created))} {record.levelname:<7} "
+            f"[{getattr(record, 'request_id', '-')}] {record.name.removeprefix('qrisq.')} "
+            f"{record.getMessage()} {fields}"
+        ).rstrip()
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def configure_logging():
+    """Attach the queue handler to the "qrisq" logger and start the listener thread (idempotent)"""
+    global _listener, _handler
+    if _listener is not None:
+        return
+    settings = get_settings()
+
+    output = logging.StreamHandler(sys.stdout)
+    formatter_cls = TextFormatter if settings.log_format == "text" else JsonFormatter
+    output.setFormatter(formatter_cls(settings.log_payload_max_chars))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+    _handler = DroppingQueueHandler(log_queue)
+    _handler.addFilter(RequestSampler(settings.log_sample_rate))
+
+    logger = logging.getLogger("qrisq")
+    logger.setLevel(settings.log_level.upper())
+    logger.addHandler(_handler)
+    logger.propagate = False
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener"""
+    global _listener, _handler
+    if _listener is None:
+        return
+    _listener.stop()
+    logging.getLogger("qrisq").removeHandler(_handler)
+    _listener = _handler = None
+
+
+def logging_stats() -> Dict[str, int]:
+    if _handler is None:
+        return {"queued": 0, "dropped": 0}
+    return {"queued": _handler.queue.qsize(), "dropped": _handler.dropped}
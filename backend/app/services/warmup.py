@@ -0,0 +1,46 @@
+"""
+Startup Warmup
+Import Qiskit, run one circuit and open LLM connections before /health reports ready.
+"""
+
+import time
+from typing import Dict, Any
+from app.schemas import ExtractedVariables
+from app.services.simulator_backends import run_quantum_simulation
+from app.services.llm_client import warmup_providers
+from app.services.structured_log import get_logger
+
+log = get_logger("warmup")
+
+# "cold" until run_warmup() starts, then "warming" → "ready"
+_state: Dict[str, Any] = {"state": "cold"}
+
+
+def warmup_state() -> Dict[str, Any]:
+    return dict(_state)
+
+
+def run_warmup() -> Dict[str, Any]:
+    """Blocking warmup; failures are logged and never keep the worker from becoming ready"""
+    _state.update(state="warming")
+    start = time.perf_counter()
+    steps: Dict[str, Any] = {}
+
+    step_start = time.perf_counter()
+    try:
+        run_quantum_simulation(ExtractedVariables())
+    except Exception as e:
+        log.warning("warmup.quantum_failed", error=str(e))
+    steps["quantum_ms"] = round((time.perf_counter() - step_start) * 1000, 1)
+
+    step_start = time.perf_counter()
+    steps["providers"] = warmup_providers()
+    steps["providers_ms"] = round((time.perf_counter() - step_start) * 1000, 1)
+
+    _state.update(
+        state="ready",
+        duration_ms=round((time.perf_counter() - start) * 1000, 1),
+        steps=steps
+    )
+    log.info("warmup.ready", duration_ms=_state["duration_ms"], **steps)
+    return warmup_state()
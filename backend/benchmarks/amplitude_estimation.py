@@ -0,0 +1,86 @@
+"""
+Amplitude Estimation Benchmark
+Compares shot-based estimation (adaptive Wilson-interval mode) with simulated
+Iterative Amplitude Estimation at the same precision.
+
+For each target epsilon, IAE runs first; the shot-based mode is then asked for
+an interval of the same width. Reported per mode: interval width, circuit
+evaluations of A (shots, or Σ shots·(2k+1) for IAE) and wall time.
+
+Run from backend/:
+    python -m benchmarks.amplitude_estimation --repeats 3
+"""
+
+import argparse
+import statistics
+import time
+from app.schemas import ExtractedVariables
+from app.services.simulator_backends import run_quantum_simulation
+from app.config import get_settings
+
+SCENARIOS = {
+    "default": ExtractedVariables(),
+    "fnb-jakarta": ExtractedVariables(
+        modal=500_000_000, sektor="F&B", lokasi="Jakarta Selatan", tahun=2026,
+        target_market="mahasiswa", business_model="offline"
+    ),
+    "saas-b2b": ExtractedVariables(
+        modal=2_000_000_000, sektor="Teknologi", lokasi="Bandung", tahun=2027,
+        target_market="B2B enterprise", competitors="belum ada", team_size=30, business_model="SaaS"
+    ),
+}
+
+
+def run(mode: str, variables: ExtractedVariables, **overrides) -> dict:
+    settings = get_settings()
+    settings.estimation_mode = mode
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+
+    start = time.perf_counter()
+    result = run_quantum_simulation(variables)
+    elapsed = time.perf_counter() - start
+
+    metadata = result["metadata"]
+    low, high = metadata["confidence_interval"]
+    return {
+        "p": result["success_probability"],
+        "width": high - low,
+        "evaluations": metadata.get("state_preparations", metadata["shots"]),
+        "ms": elapsed * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--epsilons", type=float, nargs="+", default=[0.02, 0.01, 0.005])
+    parser.add_argument("--max-shots", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    # Exclude one-time Qiskit import/initialisation from the timings
+    run("shots", ExtractedVariables(), shot_mode="fixed")
+    run("iae", ExtractedVariables(), iae_epsilon=0.05)
+
+    print(f"{'scenario':<12} {'eps':>6} | {'mode':<6} {'p':>7} {'width':>7} {'A-evals':>9} {'ms':>8}")
+    for name, variables in SCENARIOS.items():
+        for eps in args.epsilons:
+            iae = [run("iae", variables, iae_epsilon=eps) for _ in range(args.repeats)]
+            width = statistics.median(r["width"] for r in iae)
+            shots = [
+                run("shots", variables, shot_mode="adaptive", adaptive_ci_width=width,
+                    adaptive_max_shots=args.max_shots, adaptive_shot_batch=1024)
+                for _ in range(args.repeats)
+            ]
+            for mode, results in (("iae", iae), ("shots", shots)):
+                print(
+                    f"{name:<12} {eps:>6} | {mode:<6} "
+                    f"{statistics.median(r['p'] for r in results):>7.4f} "
+                    f"{statistics.median(r['width'] for r in results):>7.4f} "
+                    f"{statistics.median(r['evaluations'] for r in results):>9.0f} "
+                    f"{statistics.median(r['ms'] for r in results):>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Cold-Start Benchmark
+Measures, in fresh interpreter processes:
+- import time of app.main (what every uvicorn worker pays on boot)
+- time-to-first-response of POST /api/analyze, with and without startup warmup
+
+Run from backend/:
+    python -m benchmarks.cold_start --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+DESCRIPTION = "Investasi 500 juta untuk membuka cafe kopi modern di Jakarta Selatan tahun 2026, target mahasiswa"
+
+# Executed in a child process so every run starts with empty module caches
+CHILD_SCRIPT = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app.main
+t_import = time.perf_counter() - t0
+heavy = [m for m in ("qiskit", "qiskit_aer", "matplotlib", "groq", "google.generativeai") if m in sys.modules]
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    t_ready = None
+    if app.main.settings.warmup_on_startup:
+        while client.get("/health").status_code != 200:
+            time.sleep(0.01)
+        t_ready = time.perf_counter() - t0
+    t1 = time.perf_counter()
+    r = client.post("/api/analyze", json={"description": sys.argv[1]})
+    t_first = time.perf_counter() - t1
+    t2 = time.perf_counter()
+    client.post("/api/analyze", json={"description": sys.argv[1] + " lagi"})
+    t_second = time.perf_counter() - t2
+print("RESULT " + json.dumps({
+    "status": r.status_code,
+    "import_ms": t_import * 1000,
+    "ready_ms": t_ready * 1000 if t_ready is not None else None,
+    "first_response_ms": t_first * 1000,
+    "second_response_ms": t_second * 1000,
+    "heavy_modules_after_import": heavy,
+}))
+"""
+
+
+def run_child(warmup: bool) -> dict:
+    env = dict(os.environ)
+    # Keep the benchmark offline and deterministic: regex extraction, no LLM summary
+    env["USE_LLM_EXTRACTION"] = "false"
+    env["WARMUP_ON_STARTUP"] = "true" if warmup else "false"
+    # A warm shared cache would turn the first request into a lookup, not a cold run
+    env["RESULT_CACHE_ENABLED"] = "false"
+    env["SUMMARY_CACHE_ENABLED"] = "false"
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, DESCRIPTION],
+        capture_output=True, text=True, env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[len("RESULT "):])
+    raise RuntimeError(f"benchmark child failed:\n{proc.stderr[-2000:]}")
+
+
+def summarize(label: str, results: list):
+    print(f"\n== {label} ({len(results)} runs) ==")
+    for key in ("import_ms", "ready_ms", "first_response_ms", "second_response_ms"):
+        values = [r[key] for r in results if r[key] is not None]
+        if values:
+            print(f"  {key:<20} median {statistics.median(values):8.1f}   min {min(values):8.1f}   max {max(values):8.1f}")
+    print(f"  heavy modules loaded by import: {results[0]['heavy_modules_after_import'] or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for warmup in (False, True):
+        results = [run_child(warmup) for _ in range(args.runs)]
+        summarize("warmup on startup" if warmup else "no warmup", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Memory Soak Benchmark
+Drives the full analysis pipeline (LLM extraction → simulation → risk engine →
+LLM summary → JSON response) for thousands of varied requests in one process,
+with the provider SDKs replaced by an offline stub. Reports RSS and
+tracemalloc-traced memory every --sample-every requests, the growth rate after
+warmup, and the allocation sites that grew the most since warmup.
+
+Caches are off by default so every request takes the full path; --caches keeps
+them on to include their growth.
+
+Run from backend/:
+    python -m benchmarks.memory_soak --requests 5000 --concurrency 4
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+SECTORS = ["cafe kopi", "aplikasi SaaS", "toko retail", "klinik kesehatan", "kursus online", "pabrik tekstil"]
+CITIES = ["Jakarta Selatan", "Bandung", "Surabaya", "Medan", "Makassar", "Yogyakarta"]
+
+
+def configure_env(caches: bool):
+    # Must run before app modules read their settings
+    os.environ.update({
+        "USE_LLM_EXTRACTION": "true",
+        "LLM_PROVIDER": "groq",
+        "GROQ_API_KEY": "soak-stub",
+        "RESULT_CACHE_ENABLED": "true" if caches else "false",
+        "SUMMARY_CACHE_ENABLED": "true" if caches else "false",
+        "LOG_LEVEL": "WARNING",
+    })
+
+
+class _StubCompletions:
+    """Offline stand-in for groq.Groq().chat.completions"""
+
+    def create(self, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        if "Teks untuk dianalisis" in prompt:
+            rng = random.Random(prompt)
+            payload = {
+                "modal": rng.choice([50, 250, 500, 2_000]) * 1_000_000,
+                "sektor": rng.choice(["F&B", "Teknologi", "Retail", "Kesehatan", "Pendidikan"]),
+                "lokasi": rng.choice(CITIES), "tahun": rng.choice([2025, 2026, 2027]),
+                "target_market": "mahasiswa dan pekerja", "competitors": "banyak pemain lokal",
+                "unique_value": "harga terjangkau", "timeline": "6 bulan", "team_size": rng.randint(3, 80),
+                "business_model": rng.choice(["B2C", "SaaS", "offline"]),
+            }
+        else:
+            payload = {
+                "executive_summary": "CONDITIONAL GO. " * 20,
+                "probability_explanation": "Qubit modal dominan. " * 20,
+                "risk_breakdown": "**HIGH**: persaingan | **MEDIUM**: regulasi | **LOW**: lokasi. " * 10,
+                "key_insight": "Superposisi seperti mencoba semua skenario sekaligus.",
+                "action_items": [f"[HIGH] Action {i} - Impact: 5%" for i in range(5)],
+            }
+        message = type("Message", (), {"content": json.dumps(payload)})
+        return type("Completion", (), {"choices": [type("Choice", (), {"message": message})]})
+
+
+class _StubGroq:
+    def __init__(self, api_key: str):
+        self.chat = type("Chat", (), {"completions": _StubCompletions()})()
+
+
+def description(i: int) -> str:
+    rng = random.Random(i)
+    return (f"Investasi {rng.randint(50, 5000)} juta untuk {rng.choice(SECTORS)} di {rng.choice(CITIES)} "
+            f"tahun {rng.choice([2025, 2026, 2027])}, proposal #{i}")
+
+
+def fit_slope(points):
+    """Least-squares slope of (x, y) points"""
+    n = len(points)
+    if n < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x if var_x else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200, help="Requests before the baseline is taken")
+    parser.add_argument("--sample-every", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--ensemble", action="store_true", help="Also run the uncertainty ensemble")
+    parser.add_argument("--caches", action="store_true", help="Keep the result/summary caches on")
+    parser.add_argument("--no-trace", action="store_true", help="RSS only (tracemalloc inflates RSS and time)")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    configure_env(args.caches)
+    from app.schemas import AnalyzeRequest
+    from app.services import llm_client
+    from app.services.memory_debug import reset_baseline, rss_bytes, start_tracing, top_allocations
+    from app.services.pipeline import run_analysis
+
+    llm_client._load_groq = lambda: _StubGroq
+
+    def one(i: int):
+        request = AnalyzeRequest(description=description(i), ensemble=args.ensemble)
+        run_analysis(request).model_dump_json()
+
+    def drive(start: int, count: int):
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(one, range(start, start + count)))
+
+    if not args.no_trace:
+        start_tracing(frames=10)
+    drive(0, args.warmup)
+    gc.collect()
+    if not args.no_trace:
+        reset_baseline()
+
+    print(f"{'requests':>9} {'rss_mb':>8} {'traced_mb':>10} {'gc_objects':>11} {'req/s':>7}")
+    samples = []
+    done = 0
+    while done < args.requests:
+        batch = min(args.sample_every, args.requests - done)
+        started = time.perf_counter()
+        drive(args.warmup + done, batch)
+        elapsed = time.perf_counter() - started
+        done += batch
+        gc.collect()
+        rss_mb = rss_bytes() / 2**20
+        traced_mb = tracemalloc.get_traced_memory()[0] / 2**20 if tracemalloc.is_tracing() else float("nan")
+        samples.append((done, rss_mb, traced_mb))
+        print(f"{done:>9} {rss_mb:>8.1f} {traced_mb:>10.1f} {len(gc.get_objects()):>11} {batch / elapsed:>7.0f}")
+
+    rss_slope = fit_slope([(n, rss) for n, rss, _ in samples]) * 1000
+    print(f"\nRSS growth after warmup: {rss_slope:+.2f} MB per 1000 requests")
+    if not args.no_trace:
+        traced_slope = fit_slope([(n, traced) for n, _, traced in samples]) * 1000
+        print(f"Traced growth after warmup: {traced_slope:+.2f} MB per 1000 requests")
+        print(f"\nTop {args.top} allocation sites by growth since warmup:")
+        for stat in top_allocations(args.top):
+            print(f"  {stat['size_diff_kb']:>+10.1f} KB {stat['count_diff']:>+8} objs  {stat['site']}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
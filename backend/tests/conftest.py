@@ -0,0 +1,54 @@
+"""
+Shared fixtures. Settings are read lazily, but some modules build process-wide
+objects from them on first use, so the suite starts from an offline
+configuration: no LLM provider, no cache files written into the source tree.
+"""
+
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="qrisq-tests-")
+os.environ.update({
+    "USE_LLM_EXTRACTION": "false",
+    "GROQ_API_KEY": "",
+    "GEMINI_API_KEY": "",
+    "RESULT_CACHE_ENABLED": "false",
+    "SUMMARY_CACHE_ENABLED": "false",
+    "RESULT_CACHE_PATH": os.path.join(_tmp, "result_cache.db"),
+    "SUMMARY_CACHE_PATH": os.path.join(_tmp, "summary_cache.db"),
+    "PROFILE_DIR": os.path.join(_tmp, "profiles"),
+    "LOG_LEVEL": "ERROR",
+})
+
+import pytest
+from app.config import get_settings
+from app.services import admission, result_cache, stage_graph
+
+DESCRIPTION = "Investasi 500 juta untuk cafe kopi di Bandung tahun 2026 dengan target mahasiswa"
+
+
+def _reset_process_state():
+    get_settings.cache_clear()
+    result_cache.get_result_cache.cache_clear()
+    result_cache.get_summary_cache.cache_clear()
+    stage_graph.get_stage_executor.cache_clear()
+    with admission._limiters_lock:
+        admission._limiters.clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    _reset_process_state()
+    yield
+    _reset_process_state()
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """settings(SIMULATION_CONCURRENCY=1, ...) overrides settings for one test"""
+    def apply(**values):
+        for name, value in values.items():
+            monkeypatch.setenv(name, str(value))
+        _reset_process_state()
+        return get_settings()
+    return apply
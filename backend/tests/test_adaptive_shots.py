@@ -0,0 +1,29 @@
+import pytest
+from app.schemas import ExtractedVariables
+from app.services.quantum_simulator import _run_qiskit_simulation, wilson_interval
+
+VARIABLES = ExtractedVariables(modal=500_000_000, sektor="F&B", lokasi="Bandung", tahun=2026)
+
+
+def test_wilson_interval_matches_the_closed_form():
+    low, high = wilson_interval(50, 100, 0.95)
+    assert low == pytest.approx(0.4038, abs=1e-4)
+    assert high == pytest.approx(0.5962, abs=1e-4)
+    assert wilson_interval(0, 0, 0.95) == (0.0, 1.0)
+    assert wilson_interval(0, 20, 0.95)[0] == pytest.approx(0.0)
+
+
+def test_sampling_stops_once_the_interval_is_narrow_enough(settings):
+    settings(ADAPTIVE_SHOT_BATCH=128, ADAPTIVE_MAX_SHOTS=65536)
+    result = _run_qiskit_simulation(VARIABLES, ci_width=0.1)
+    shots = result["metadata"]["shots"]
+    assert shots % 128 == 0 and shots < 65536
+
+    low, high = wilson_interval(round(result["success_probability"] * shots), shots, 0.95)
+    assert high - low <= 0.1
+
+
+def test_sampling_is_capped_at_max_shots(settings):
+    settings(ADAPTIVE_SHOT_BATCH=128, ADAPTIVE_MAX_SHOTS=256)
+    metadata = _run_qiskit_simulation(VARIABLES, ci_width=0.001)["metadata"]
+    assert metadata["shots"] == 256
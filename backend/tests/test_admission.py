@@ -0,0 +1,73 @@
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.schemas import AnalyzeRequest
+from app.services import pipeline
+from app.services.admission import OverloadedError, get_limiter
+from app.services.ai_extractor import extract_variables_regex
+from app.services.stage_graph import get_stage_executor
+from tests.conftest import DESCRIPTION
+
+
+def test_saturated_simulation_is_shed_up_front(settings):
+    settings(SIMULATION_CONCURRENCY=1, ADMISSION_MAX_QUEUE=0)
+    with get_limiter("simulate").slot():
+        response = TestClient(app).post("/api/analyze", json={"description": DESCRIPTION})
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) >= 1
+    assert get_limiter("simulate").stats()["rejected"] == 1
+
+
+def test_stage_backlog_is_shed_up_front(settings):
+    settings(STAGE_WORKERS=1, STAGE_MAX_QUEUE=1, SIMULATOR_BACKEND="mock")
+    executor = get_stage_executor()
+    release = threading.Event()
+    running = executor.submit(release.wait)
+    queued = executor.submit(lambda: None)
+    try:
+        assert executor.backlog()[0] == 1
+        response = TestClient(app).post("/api/analyze", json={"description": DESCRIPTION})
+        assert response.status_code == 503
+        assert "stages" in response.json()["detail"]
+    finally:
+        release.set()
+        running.result()
+        queued.result()
+    assert executor.backlog()[0] == 0
+    assert TestClient(app).post("/api/analyze", json={"description": DESCRIPTION}).status_code == 200
+
+
+def test_cancelled_stage_work_leaves_the_backlog(settings):
+    settings(STAGE_WORKERS=1)
+    executor = get_stage_executor()
+    release = threading.Event()
+    running = executor.submit(release.wait)
+    queued = executor.submit(lambda: None)
+    assert queued.cancel()
+    release.set()
+    running.result()
+    assert executor.backlog()[0] == 0
+
+
+@pytest.fixture
+def llm_saturated(settings, monkeypatch):
+    settings(
+        USE_LLM_EXTRACTION="true", GROQ_API_KEY="test", LLM_PROVIDER="groq",
+        LLM_CONCURRENCY_PER_PROVIDER=1, ADMISSION_MAX_QUEUE=0, SIMULATOR_BACKEND="mock",
+    )
+    monkeypatch.setattr(pipeline, "extract_variables", lambda description, **kwargs: extract_variables_regex(description))
+    with get_limiter("llm:groq").slot():
+        yield
+
+
+def test_summary_rejected_late_falls_back_to_the_template(llm_saturated):
+    # "local" extraction needs no LLM slot, so only the summary meets the full limiter
+    response = pipeline.run_analysis(AnalyzeRequest(description=DESCRIPTION, model_provider="local"))
+    assert response.degraded_stages == ["summary"]
+    assert response.quantum_summary.executive_summary.startswith("Verdict:")
+
+
+def test_jobs_do_not_shed_the_summary(llm_saturated):
+    with pytest.raises(OverloadedError):
+        pipeline.run_analysis(AnalyzeRequest(description=DESCRIPTION, model_provider="local"), shed_summary=False)
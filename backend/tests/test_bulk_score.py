@@ -0,0 +1,65 @@
+import json
+from app import bulk_score
+from tests.conftest import DESCRIPTION
+
+
+def score(tmp_path, lines, *extra):
+    source = tmp_path / "proposals.jsonl"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    output = tmp_path / "scores.jsonl"
+    assert bulk_score.main([str(source), str(output), "--workers", "1", "--regex-only", "--no-summary", *extra]) == 0
+    return output
+
+
+def rows(output):
+    return [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+
+
+def test_malformed_rows_are_reported_not_fatal(settings, tmp_path):
+    settings(SIMULATOR_BACKEND="mock")
+    output = score(tmp_path, [
+        json.dumps({"description": DESCRIPTION}),
+        '{"description": "truncated',
+        "[1, 2]",
+        json.dumps({"description": 42}),
+        json.dumps({"description": DESCRIPTION}),
+    ])
+    results = rows(output)
+    assert [row["row"] for row in results] == [0, 1, 2, 3, 4]
+    assert "success_probability" in results[0] and "success_probability" in results[4]
+    assert results[1]["error"].startswith("invalid JSON")
+    assert results[2]["error"] == "expected a JSON object, got list"
+    assert results[3]["error"] == "'description' is not a string"
+
+    checkpoint = json.loads((tmp_path / "scores.jsonl.checkpoint").read_text())
+    assert checkpoint["rows_done"] == 5
+
+
+def test_new_run_appends_to_an_existing_output(settings, tmp_path):
+    settings(SIMULATOR_BACKEND="mock")
+    previous = '{"row": 0, "id": "earlier run"}\n'
+    (tmp_path / "scores.jsonl").write_text(previous, encoding="utf-8")
+
+    output = score(tmp_path, [json.dumps({"description": DESCRIPTION})])
+    assert output.read_text(encoding="utf-8").startswith(previous)
+    assert len(rows(output)) == 2
+    checkpoint = json.loads((tmp_path / "scores.jsonl.checkpoint").read_text())
+    assert checkpoint["start_bytes"] == len(previous)
+
+
+def test_resume_drops_rows_after_the_checkpoint(settings, tmp_path):
+    settings(SIMULATOR_BACKEND="mock")
+    lines = [json.dumps({"description": DESCRIPTION, "n": n}) for n in range(3)]
+    output = score(tmp_path, lines, "--checkpoint-every", "1")
+    first_row = output.read_text(encoding="utf-8").splitlines(keepends=True)[0]
+
+    # Crash after row 0 was checkpointed but with row 1 half written
+    checkpoint_path = tmp_path / "scores.jsonl.checkpoint"
+    checkpoint = json.loads(checkpoint_path.read_text())
+    checkpoint.update(rows_done=1, output_bytes=len(first_row.encode("utf-8")))
+    checkpoint_path.write_text(json.dumps(checkpoint))
+    with open(output, "a", encoding="utf-8") as f:
+        f.write('{"row": 1, "partial')
+
+    score(tmp_path, lines)
+    assert [row["row"] for row in rows(output)] == [0, 1, 2]
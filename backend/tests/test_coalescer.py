@@ -0,0 +1,43 @@
+import asyncio
+from app.schemas import AnalyzeRequest
+from app.services.coalescer import Singleflight, coalesce_key
+from tests.conftest import DESCRIPTION
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    flight = Singleflight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == [1] * 5
+    assert flight.stats() == {"executed": 1, "merged": 4, "in_flight": 0}
+
+
+def test_one_caller_cancelling_does_not_cancel_the_others():
+    flight = Singleflight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "done"
+
+
+def test_coalesce_key_ignores_whitespace_and_case_only():
+    base = coalesce_key(AnalyzeRequest(description=DESCRIPTION))
+    assert coalesce_key(AnalyzeRequest(description="  " + DESCRIPTION.upper().replace(" ", "\n "))) == base
+    assert coalesce_key(AnalyzeRequest(description=DESCRIPTION, summary_tier="brief")) != base
@@ -0,0 +1,74 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import pipeline
+from app.services.admission import get_limiter, simulation_slot
+from app.services.deadline import Deadline, DeadlineExceeded, check_deadline, request_budget_ms, run_within, time_left
+from tests.conftest import DESCRIPTION
+
+
+def test_stage_past_its_deadline_uses_the_fallback():
+    deadline = Deadline(50)
+    assert run_within(deadline, "simulate", lambda: time.sleep(1) or "slow", lambda: "cheap") == "cheap"
+    assert deadline.degraded == ["simulate"]
+    assert run_within(deadline, "summary", lambda: "unreached", lambda: "template") == "template"
+    assert deadline.degraded == ["simulate", "summary"]
+
+
+def test_stage_work_sees_the_remaining_budget():
+    deadline = Deadline(10_000)
+    budget = run_within(deadline, "summary", lambda: time_left(30.0), lambda: None)
+    assert 0 < budget <= 10.0
+    assert time_left(30.0) == 30.0  # No deadline outside the stage
+    assert not deadline.degraded
+
+
+def test_abandoned_work_releases_its_slot(settings):
+    settings(SIMULATION_CONCURRENCY=1)
+    stopped = []
+
+    def simulate():
+        with simulation_slot():
+            try:
+                while True:
+                    check_deadline()
+                    time.sleep(0.01)
+            except DeadlineExceeded:
+                stopped.append(True)
+                raise
+
+    assert run_within(Deadline(50), "simulate", simulate, lambda: "mock") == "mock"
+    time.sleep(0.1)
+    assert stopped
+    assert get_limiter("simulate").stats()["active"] == 0
+
+
+def test_request_budget_is_capped_by_the_server(settings):
+    settings(REQUEST_DEADLINE_MS=2000)
+    assert request_budget_ms(None) == 2000
+    assert request_budget_ms("500") == 500
+    assert request_budget_ms("9000") == 2000
+    with pytest.raises(ValueError):
+        request_budget_ms("0")
+
+
+def test_late_simulation_degrades_the_response(settings, monkeypatch):
+    settings(SIMULATOR_BACKEND="mock")
+    simulate = pipeline.simulate_stage
+    monkeypatch.setattr(pipeline, "simulate_stage", lambda *args: time.sleep(0.5) or simulate(*args))
+
+    response = TestClient(app).post(
+        "/api/analyze", json={"description": DESCRIPTION}, headers={"X-Deadline-Ms": "200"}
+    )
+    assert response.status_code == 200
+    assert "simulate" in response.json()["degraded_stages"]
+    assert response.headers["cache-control"] == "no-store"
+    assert "etag" not in response.headers
+
+
+def test_malformed_deadline_header_is_rejected():
+    response = TestClient(app).post(
+        "/api/analyze", json={"description": DESCRIPTION}, headers={"X-Deadline-Ms": "soon"}
+    )
+    assert response.status_code == 400
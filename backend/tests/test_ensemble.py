@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from app.schemas import ExtractedVariables
+from app.services.ensemble import _sample_angles, batched_success_probabilities, run_ensemble_simulation
+from app.services.quantum_simulator import _run_statevector_simulation
+
+# Every field the ensemble could sample is given, so all samples equal the point estimate
+CERTAIN = ExtractedVariables(
+    modal=500_000_000, sektor="F&B", lokasi="Bandung", tahun=2026,
+    target_market="mahasiswa", competitors="banyak cafe", team_size=6, business_model="B2C",
+)
+
+
+def test_batched_statevector_matches_aer():
+    angles = _sample_angles(CERTAIN, 4, np.random.default_rng(0))
+    exact = _run_statevector_simulation(CERTAIN)["success_probability"]
+    assert batched_success_probabilities(angles) == pytest.approx([exact] * 4, abs=1e-9)
+
+
+def test_ensemble_without_uncertainty_collapses_to_the_point_estimate():
+    result = run_ensemble_simulation(CERTAIN)
+    assert result["uncertain_fields"] == []
+    assert result["std"] == 0.0
+    assert result["mean"] == pytest.approx(_run_statevector_simulation(CERTAIN)["success_probability"], abs=1e-4)
+
+
+def test_ensemble_is_deterministic_per_input(settings):
+    settings(ENSEMBLE_LATENCY_BUDGET_MS=60_000)  # Same sample count on a slow machine
+    uncertain = CERTAIN.model_copy(update={"modal_min": 100_000_000, "modal_max": 1_000_000_000, "target_market": None})
+    first, second = run_ensemble_simulation(uncertain), run_ensemble_simulation(uncertain)
+    assert first["std"] > 0
+    assert {k: v for k, v in first.items() if k != "elapsed_ms"} == {k: v for k, v in second.items() if k != "elapsed_ms"}
@@ -0,0 +1,53 @@
+import threading
+import time
+from app.services import extraction_batcher as batching
+from app.services.extraction_batcher import ExtractionBatcher
+
+
+def test_follower_falls_back_when_the_batch_call_hangs(settings, monkeypatch):
+    settings(LLM_BATCH_WINDOW_MS=50, LLM_TIMEOUT_SECONDS=0.2)
+    release = threading.Event()
+
+    def hanging_batch(descriptions, provider):
+        release.wait(5)
+        return None
+
+    monkeypatch.setattr(batching, "extract_batch_with_llm", hanging_batch)
+    monkeypatch.setattr(batching, "extract_with_llm", lambda description, provider: {"sektor": description})
+
+    batcher = ExtractionBatcher()
+    leader = threading.Thread(target=batcher.extract, args=("leader", "groq"))
+    leader.start()
+    time.sleep(0.01)
+    try:
+        started = time.monotonic()
+        assert batcher.extract("follower", "groq") == {"sektor": "follower"}
+        assert time.monotonic() - started < 1.0
+        assert batcher.stats()["fallbacks"] == 1
+    finally:
+        release.set()
+        leader.join()
+
+
+def test_batch_results_are_shared_out(settings, monkeypatch):
+    settings(LLM_BATCH_WINDOW_MS=200, LLM_BATCH_MAX_SIZE=2)
+    calls = []
+
+    def batch(descriptions, provider):
+        calls.append(descriptions)
+        return [{"sektor": description} for description in descriptions]
+
+    monkeypatch.setattr(batching, "extract_batch_with_llm", batch)
+    batcher = ExtractionBatcher()
+    results = {}
+    threads = [
+        threading.Thread(target=lambda d=d: results.__setitem__(d, batcher.extract(d, "groq")))
+        for d in ("a", "b")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == {"a": {"sektor": "a"}, "b": {"sektor": "b"}}
@@ -0,0 +1,70 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import pipeline
+from tests.conftest import DESCRIPTION
+
+
+@pytest.fixture
+def client(settings, tmp_path):
+    settings(RESULT_CACHE_ENABLED="true", RESULT_CACHE_PATH=tmp_path / "cache.db", SIMULATOR_BACKEND="mock")
+    return TestClient(app)
+
+
+@pytest.fixture
+def pipeline_runs(monkeypatch):
+    runs = []
+    run_analysis = pipeline.run_analysis
+
+    def counted(*args, **kwargs):
+        runs.append(1)
+        return run_analysis(*args, **kwargs)
+
+    monkeypatch.setattr("app.services.http_cache.run_analysis", counted)
+    return runs
+
+
+def with_backend_record(monkeypatch, **record):
+    """Make every simulation report `record` in quantum_metadata.backend"""
+    simulate = pipeline.run_quantum_simulation
+
+    def patched(*args, **kwargs):
+        result = simulate(*args, **kwargs)
+        result["metadata"]["backend"].update(record)
+        return result
+
+    monkeypatch.setattr(pipeline, "run_quantum_simulation", patched)
+
+
+def test_full_response_is_stored_and_revalidated(client, pipeline_runs):
+    first = client.post("/api/analyze", json={"description": DESCRIPTION})
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    second = client.post("/api/analyze", json={"description": DESCRIPTION})
+    assert second.headers["etag"] == etag
+    assert second.json()["pipeline_trace"] is None  # Served from the cache
+    assert client.post(
+        "/api/analyze", json={"description": DESCRIPTION}, headers={"If-None-Match": etag}
+    ).status_code == 304
+    assert len(pipeline_runs) == 1
+
+
+def test_fallback_simulation_is_not_stored(client, pipeline_runs, monkeypatch):
+    with_backend_record(monkeypatch, failed="aer_shots: out of memory")
+    for _ in range(2):
+        response = client.post("/api/analyze", json={"description": DESCRIPTION})
+        assert response.status_code == 200
+        assert "simulate" in response.json()["degraded_stages"]
+        assert response.headers["cache-control"] == "no-store"
+        assert "etag" not in response.headers
+    assert len(pipeline_runs) == 2
+
+
+def test_relaxed_precision_response_is_not_stored(client, pipeline_runs, monkeypatch):
+    with_backend_record(monkeypatch, relaxed_from=0.06)
+    for _ in range(2):
+        response = client.post("/api/analyze", json={"description": DESCRIPTION, "simulator_backend": "auto"})
+        assert "simulate" in response.json()["degraded_stages"]
+        assert "etag" not in response.headers
+    assert len(pipeline_runs) == 2
@@ -0,0 +1,68 @@
+import json
+import sqlite3
+import time
+from app.schemas import JobRequest
+from app.services.job_queue import JobQueue, SqliteJobStore, create_job_store
+from tests.conftest import DESCRIPTION
+
+
+def _job(job_id, priority=0):
+    return {"job_id": job_id, "status": "queued", "priority": priority, "request": "{}", "created_at": time.time()}
+
+
+def test_running_job_is_not_reclaimed_while_its_lease_is_renewed(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    owner = SqliteJobStore(path, lease_seconds=0.3)
+    owner.add(_job("a"))
+    assert owner.claim_next()["job_id"] == "a"
+
+    other = SqliteJobStore(path, lease_seconds=0.3)
+    time.sleep(0.2)
+    owner.renew_leases(["a"])
+    time.sleep(0.2)
+    assert other.claim_next() is None
+
+
+def test_expired_lease_is_reclaimed_by_another_store(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    crashed = SqliteJobStore(path, lease_seconds=0.1)
+    crashed.add(_job("a"))
+    crashed.claim_next()
+
+    time.sleep(0.15)
+    job = SqliteJobStore(path, lease_seconds=0.1).claim_next()
+    assert job["job_id"] == "a" and job["status"] == "running"
+
+
+def test_store_created_before_leases_is_migrated(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE jobs (seq INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT UNIQUE NOT NULL, "
+        "status TEXT NOT NULL, priority INTEGER NOT NULL, request TEXT NOT NULL, result TEXT, "
+        "error TEXT, created_at REAL NOT NULL, finished_at REAL)"
+    )
+    conn.execute("INSERT INTO jobs (job_id, status, priority, request, created_at) VALUES ('old', 'running', 0, '{}', 1)")
+    conn.commit()
+    conn.close()
+
+    store = SqliteJobStore(path, lease_seconds=0.1)
+    assert store.claim_next() is None  # Gets one lease to finish in
+    time.sleep(0.15)
+    assert store.claim_next()["job_id"] == "old"
+
+
+def test_job_result_honours_fields():
+    queue = JobQueue(create_job_store("memory", ""), workers=1, max_depth=10, result_ttl=60)
+    queue.start()
+    try:
+        job = queue.submit(JobRequest(description=DESCRIPTION, fields=["success_probability", "risk_categories"]))
+        deadline = time.time() + 30
+        while queue.get(job["job_id"])["status"] not in ("done", "failed") and time.time() < deadline:
+            time.sleep(0.05)
+        finished = queue.get(job["job_id"])
+    finally:
+        queue.stop()
+
+    assert finished["status"] == "done"
+    assert set(json.loads(finished["result"])) == {"success_probability", "risk_categories"}
@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from tests.conftest import DESCRIPTION
+
+
+def connect(settings):
+    settings(LIVE_DEBOUNCE_MS=50, SIMULATOR_BACKEND="mock")
+    return TestClient(app).websocket_connect("/api/analyze/live")
+
+
+def test_only_the_latest_edit_is_analyzed(settings):
+    with connect(settings) as ws:
+        ws.send_json({"description": DESCRIPTION})
+        ws.send_json({"description": DESCRIPTION + " dan delivery online"})
+        reply = ws.receive_json()
+        assert reply["revision"] == 2
+        assert reply["stages"]["extract"] == "computed"
+
+
+def test_malformed_frames_keep_the_session_open(settings):
+    with connect(settings) as ws:
+        ws.send_text('{"description": "truncated')
+        assert ws.receive_json()["type"] == "error"
+        ws.send_json({"description": DESCRIPTION, "extra_factors": [
+            {"name": "fx", "risk": 0.5}, {"name": "fx", "risk": 0.2},
+        ]})
+        assert ws.receive_json()["type"] == "error"
+
+        ws.send_json({"description": DESCRIPTION})
+        reply = ws.receive_json()
+        assert reply["type"] == "result" and reply["revision"] == 1
@@ -0,0 +1,73 @@
+import json
+from app.schemas import ExtractedVariables, QuantumSummary
+from app.services import llm_client
+from app.services.json_repair import repair_json
+from app.services.llm_client import SUMMARY_TIERS, _parse_json_response
+
+FIELDS = SUMMARY_TIERS["standard"]["fields"]
+COMPLETE = {
+    "executive_summary": "Layak dengan syarat.",
+    "probability_explanation": "Modal cukup.",
+    "risk_breakdown": "Kompetisi tinggi.",
+    "action_items": ["Validasi pasar"],
+}
+
+
+def continuation(reply):
+    calls = []
+
+    def continue_with(missing):
+        calls.append(missing)
+        return json.dumps({name: reply[name] for name in missing if name in reply})
+
+    return calls, continue_with
+
+
+def test_truncated_output_keeps_complete_fields():
+    content = '{"modal": 500000000, "sektor": "F&B", "lokasi": "Bandung", "tahun": 2026, "target_market": "mahasi'
+    assert repair_json(content)["lokasi"] == "Bandung"
+    calls, continue_with = continuation({})
+    data = _parse_json_response(content, "groq", ExtractedVariables, ["modal", "sektor", "lokasi", "tahun"], continue_with)
+    assert data["tahun"] == 2026 and not calls
+
+
+def test_truncated_output_continues_only_lost_fields():
+    content = json.dumps(COMPLETE)[:60]
+    calls, continue_with = continuation(COMPLETE)
+    data = _parse_json_response(content, "groq", QuantumSummary, FIELDS, continue_with)
+    assert data == COMPLETE
+    assert "executive_summary" not in calls[0]
+
+
+def test_empty_summary_fields_are_continued():
+    calls, continue_with = continuation(COMPLETE)
+    content = json.dumps({**COMPLETE, "risk_breakdown": "", "action_items": []})
+    data = _parse_json_response(content, "groq", QuantumSummary, FIELDS, continue_with, require_complete=True)
+    assert calls == [["risk_breakdown", "action_items"]]
+    assert data == COMPLETE
+
+
+def test_missing_summary_field_fails_when_continuation_fails():
+    _, continue_with = continuation({})
+    content = json.dumps({name: value for name, value in COMPLETE.items() if name != "risk_breakdown"})
+    assert _parse_json_response(content, "groq", QuantumSummary, FIELDS, continue_with, require_complete=True) is None
+
+
+def test_well_formed_extraction_is_taken_as_is():
+    calls, continue_with = continuation({})
+    content = json.dumps({"modal": 500000000, "sektor": "F&B", "lokasi": None, "tahun": 2026})
+    assert _parse_json_response(content, "groq", ExtractedVariables, ["lokasi"], continue_with)["lokasi"] is None
+    assert not calls
+
+
+def test_summary_with_an_empty_field_is_completed(monkeypatch):
+    replies = iter([json.dumps({**COMPLETE, "probability_explanation": ""}), json.dumps(COMPLETE)])
+    monkeypatch.setattr(llm_client, "_load_groq", lambda: object())
+    monkeypatch.setattr(llm_client, "_groq_complete", lambda *args: next(replies))
+    monkeypatch.setattr(llm_client.get_settings(), "groq_api_key", "test")
+
+    summary = llm_client.summarize_quantum_results(
+        {"sektor": "F&B"}, {"success_probability": 0.6, "metadata": {}}, {"High": []},
+        provider="groq", tier="standard",
+    )
+    assert summary == COMPLETE
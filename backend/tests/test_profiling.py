@@ -0,0 +1,43 @@
+import os
+import pstats
+import threading
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.stage_graph import Stage, run_stages
+from tests.conftest import DESCRIPTION
+
+
+def test_profile_includes_stage_work(settings, tmp_path):
+    settings(PROFILING_ADMIN_TOKEN="secret", PROFILE_DIR=tmp_path, SIMULATOR_BACKEND="mock")
+    response = TestClient(app).post("/api/analyze", json={"description": DESCRIPTION}, headers={"X-Profile": "secret"})
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-store"
+
+    path = os.path.join(tmp_path, response.headers["x-profile-id"] + ".prof")
+    profiled = {name for _, _, name in pstats.Stats(path).stats}
+    assert {"categorize_risks", "generate_heatmap", "generate_recommendations"} <= profiled
+
+
+def test_profile_requires_the_admin_token(settings, tmp_path):
+    settings(PROFILING_ADMIN_TOKEN="secret", PROFILE_DIR=tmp_path / "profiles", SIMULATOR_BACKEND="mock")
+    response = TestClient(app).post("/api/analyze", json={"description": DESCRIPTION}, headers={"X-Profile": "wrong"})
+    assert response.status_code == 403
+    assert not os.path.exists(tmp_path / "profiles")
+
+
+def test_sequential_stages_run_in_the_calling_thread():
+    threads = {}
+
+    def record(name):
+        threads[name] = threading.get_ident()
+        return name
+
+    stages = [
+        Stage("b", ("a",), lambda a: record("b")),  # Listed before its dependency
+        Stage("a", (), lambda: record("a")),
+        Stage("c", ("a", "b"), lambda a, b: record("c")),
+    ]
+    results, trace = run_stages(stages, sequential=True)
+    assert results == {"a": "a", "b": "b", "c": "c"}
+    assert set(threads.values()) == {threading.get_ident()}
+    assert set(trace["stages"]) == {"a", "b", "c"}
@@ -0,0 +1,44 @@
+from app.services.result_cache import SharedResultCache, cached_call
+
+
+def test_unopenable_cache_is_a_noop(tmp_path):
+    cache = SharedResultCache(str(tmp_path / "missing" / "cache.db"), max_entries=10, max_bytes=10_000)
+    assert cache.disabled
+    cache.set("ns", "k", {"a": 1})
+    assert cache.get("ns", "k") is None
+    assert cached_call("ns", ["k"], lambda: 42, store=lambda: cache) == 42
+
+
+def test_eviction_drops_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(SharedResultCache, "EVICT_INTERVAL", 1)
+    cache = SharedResultCache(str(tmp_path / "cache.db"), max_entries=2, max_bytes=10_000)
+    cache.set("ns", "a", 1)
+    cache.set("ns", "b", 2)
+    assert cache.get("ns", "a") == 1  # b is now least recently used
+    cache.set("ns", "c", 3)
+    assert cache.get("ns", "b") is None
+    assert cache.get("ns", "a") == 1 and cache.get("ns", "c") == 3
+
+
+def test_eviction_runs_every_interval(tmp_path, monkeypatch):
+    monkeypatch.setattr(SharedResultCache, "EVICT_INTERVAL", 4)
+    cache = SharedResultCache(str(tmp_path / "cache.db"), max_entries=2, max_bytes=10_000)
+    for i in range(3):
+        cache.set("ns", str(i), i)
+    assert cache.stats()["entries"] == 3
+    cache.set("ns", "3", 3)
+    assert cache.stats()["entries"] == 2
+
+
+def test_cached_call_does_not_store_none(tmp_path):
+    cache = SharedResultCache(str(tmp_path / "cache.db"), max_entries=10, max_bytes=10_000)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return None if len(calls) == 1 else "ok"
+
+    assert cached_call("ns", ["k"], compute, store=lambda: cache) is None
+    assert cached_call("ns", ["k"], compute, store=lambda: cache) == "ok"
+    assert cached_call("ns", ["k"], compute, store=lambda: cache) == "ok"
+    assert len(calls) == 2
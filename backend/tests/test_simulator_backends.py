@@ -0,0 +1,38 @@
+import pytest
+from app.schemas import ExtractedVariables
+from app.services import pipeline, simulator_backends
+from app.services.result_cache import get_result_cache
+from app.services.simulator_backends import circuit_shape, select_backend, simulator_config
+
+VARIABLES = ExtractedVariables(modal=500_000_000, sektor="F&B", lokasi="Bandung", tahun=2026)
+
+
+@pytest.fixture
+def saturated(monkeypatch):
+    monkeypatch.setattr(simulator_backends, "simulation_load", lambda: (2.0, True))
+
+
+def test_auto_relaxes_precision_when_saturated(settings, saturated):
+    settings(ADAPTIVE_CI_WIDTH=0.06)
+    _, precision, record = select_backend("auto", circuit_shape(VARIABLES), None)
+    assert record["relaxed_from"] == 0.06
+    assert precision == pytest.approx(0.12)
+
+
+def test_relaxed_simulation_is_not_cached(settings, tmp_path, saturated):
+    settings(RESULT_CACHE_ENABLED="true", RESULT_CACHE_PATH=tmp_path / "cache.db")
+    result = pipeline.simulate_stage(VARIABLES, backend="auto")
+    assert "relaxed_from" in result["metadata"]["backend"]
+    assert get_result_cache().stats()["entries"] == 0
+
+
+def test_simulation_at_requested_precision_is_cached(settings, tmp_path):
+    settings(RESULT_CACHE_ENABLED="true", RESULT_CACHE_PATH=tmp_path / "cache.db")
+    pipeline.simulate_stage(VARIABLES, backend="auto")
+    assert get_result_cache().stats()["entries"] == 1
+
+
+def test_iae_parameters_are_keyed_outside_iae_mode(settings):
+    # "auto" can pick aer_iae even when ESTIMATION_MODE=shots
+    settings(ESTIMATION_MODE="shots", IAE_EPSILON=0.05)
+    assert simulator_config()["iae_epsilon"] == 0.05